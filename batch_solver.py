@@ -0,0 +1,184 @@
+from __future__ import annotations
+"""
+Solves a whole directory (or glob) of maze files in parallel.
+
+Each maze is loaded with `Maze.load_maze_from_file`, searched with `Maze.find_way_out` and
+has its treasures collected along the way out with `Maze.take_treasures`. The work is spread
+over a process pool and one JSON object per maze is written as soon as it is ready, in the
+same order as the sorted maze files.
+
+Every maze gets its own RandomGen seed worked out from the batch seed and the maze name,
+so a maze's treasures do not depend on which worker solved it or which other mazes were
+in the batch.
+
+The connected component check of `Maze.can_exit` is off by default. Each maze is searched
+once, so labelling every cell first only pays off when a maze has no way out and the search
+would otherwise cover a large region. With --components it is run before every search.
+
+Usage:
+    python batch_solver.py mazes/task3 --capacity 100 --seed 1008
+    python batch_solver.py "mazes/task3/*.txt" --workers 4 --strategy a_star --output results.jsonl
+    python batch_solver.py mazes/generated --components
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Iterator, List, TextIO
+
+from maze import Maze, MazeCell, Position
+from pathfinding import SearchStrategy
+from random_gen import RandomGen
+from treasure import Treasure
+
+MAZE_DIR: str = "mazes"
+
+
+def find_maze_files(pattern: str) -> List[str]:
+    """
+    Every .txt file under pattern if it is a directory, otherwise every file matching the glob,
+    as names relative to the mazes directory ready for `Maze.load_maze_from_file`.
+
+    Complexity:
+        Best Case Complexity: O(F log F) where F is the number of files found.
+        Worst Case Complexity: O(F log F)
+    """
+    if os.path.isdir(pattern):
+        pattern = os.path.join(pattern, "**", "*.txt")
+    paths: List[str] = [path for path in glob.glob(pattern, recursive=True) if os.path.isfile(path)]
+    return sorted(os.path.relpath(path, MAZE_DIR).replace(os.sep, "/") for path in paths)
+
+
+def task_seed(seed: int, maze_name: str) -> int:
+    """
+    The RandomGen seed for one maze of a batch, depends only on the batch seed and the maze name.
+
+    Complexity:
+        Best Case Complexity: O(M) where M is the length of the maze name.
+        Worst Case Complexity: O(M)
+    """
+    return zlib.crc32(f"{seed}:{maze_name}".encode())
+
+
+def solve_maze(maze_name: str, seed: int, backpack_capacity: int, strategy: SearchStrategy,
+               compact: bool, include_path: bool, use_components: bool = False) -> dict:
+    """
+    Loads, solves and collects the treasures of one maze. Runs inside a worker process,
+    so an invalid maze is reported in the result instead of being raised.
+
+    Args:
+        maze_name(str): The maze to solve, relative to the mazes directory.
+        seed(int): The RandomGen seed to set before loading, see `task_seed`.
+        backpack_capacity(int): Capacity handed to `Maze.take_treasures`.
+        strategy(SearchStrategy): Strategy handed to `Maze.find_way_out`.
+        compact(bool): Load the maze onto a `CompactGrid`.
+        include_path(bool): Add every position of the path to the result.
+        use_components(bool): Handed to `Maze.find_way_out`, rule the maze out with `Maze.can_exit` before searching.
+
+    Returns:
+        dict: The JSON ready result for the maze.
+
+    Complexity:
+        Best Case Complexity: O(load_maze_from_file + find_way_out + take_treasures)
+        Worst Case Complexity: O(load_maze_from_file + find_way_out + take_treasures)
+    """
+    result: dict = {"maze": maze_name, "seed": seed}
+    RandomGen.set_seed(seed)
+    try:
+        maze: Maze = Maze.load_maze_from_file(maze_name, compact=compact)
+    except ValueError as e:
+        result["error"] = str(e)
+        return result
+
+    with maze:
+        path: List[Position] | None = maze.find_way_out(strategy, use_components)
+        result["nodes_expanded"] = maze.nodes_expanded
+        result["path_length"] = None if path is None else len(path)
+        if include_path:
+            result["path"] = None if path is None else [[position.row, position.col] for position in path]
+        treasures: List[Treasure] | None = None
+        if path is not None:
+            cells: List[MazeCell] = [maze.grid[position.row][position.col] for position in path]
+            treasures = maze.take_treasures(cells, backpack_capacity)
+    treasures = treasures or []
+    result["treasures"] = [[treasure.value, treasure.weight] for treasure in treasures]
+    result["total_value"] = sum(treasure.value for treasure in treasures)
+    result["total_weight"] = sum(treasure.weight for treasure in treasures)
+    return result
+
+
+def solve_mazes(maze_names: List[str], backpack_capacity: int, seed: int = 0, workers: int | None = None,
+                strategy: SearchStrategy = SearchStrategy.BFS, compact: bool = False,
+                include_path: bool = False, use_components: bool = False) -> Iterator[dict]:
+    """
+    Solves every maze in a process pool, yielding each result as soon as it and every
+    maze before it are done.
+
+    Args:
+        maze_names(List[str]): The mazes to solve, relative to the mazes directory.
+        backpack_capacity(int): Capacity handed to `Maze.take_treasures`.
+        seed(int): The batch seed each maze's seed is worked out from.
+        workers(int | None): Number of worker processes, defaults to the number of CPUs.
+        strategy(SearchStrategy): Strategy handed to `Maze.find_way_out`.
+        compact(bool): Load the mazes onto a `CompactGrid`.
+        include_path(bool): Add every position of the path to each result.
+        use_components(bool): Rule each maze out with `Maze.can_exit` before searching it.
+
+    Complexity:
+        Best Case Complexity: O(sum of solve_maze over the mazes / workers)
+        Worst Case Complexity: O(sum of solve_maze over the mazes)
+    """
+    seeds: List[int] = [task_seed(seed, maze_name) for maze_name in maze_names]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(solve_maze, maze_names, seeds, repeat(backpack_capacity), repeat(strategy),
+                                repeat(compact), repeat(include_path), repeat(use_components))
+
+
+def write_results(results: Iterator[dict], out: TextIO) -> int:
+    """
+    Writes one JSON object per line, flushing after each so results stream out.
+
+    Complexity:
+        Best Case Complexity: O(R) where R is the total size of the results.
+        Worst Case Complexity: O(R)
+    """
+    count: int = 0
+    for result in results:
+        out.write(json.dumps(result) + "\n")
+        out.flush()
+        count += 1
+    return count
+
+
+def main(argv: List[str] | None = None) -> None:
+    p = argparse.ArgumentParser(description="Solve every maze in a directory or glob in parallel.")
+    p.add_argument("mazes", help="A directory (searched recursively for .txt files) or a glob of maze files.")
+    p.add_argument("--capacity", type=int, default=100, help="Backpack capacity for take_treasures.")
+    p.add_argument("--seed", type=int, default=0, help="Batch seed, each maze's RandomGen seed is derived from it.")
+    p.add_argument("--workers", type=int, default=None, help="Worker processes, defaults to the number of CPUs.")
+    p.add_argument("--strategy", choices=[strategy.value for strategy in SearchStrategy],
+                   default=SearchStrategy.BFS.value, help="find_way_out search strategy.")
+    p.add_argument("--compact", action="store_true", help="Load mazes onto a CompactGrid.")
+    p.add_argument("--include-path", action="store_true", help="Include every position of the path in the output.")
+    p.add_argument("--components", action="store_true",
+                   help="Check the start and exits share a connected component before each search.")
+    p.add_argument("--output", default=None, help="Write the JSON lines here instead of stdout.")
+    args = p.parse_args(argv)
+
+    maze_names: List[str] = find_maze_files(args.mazes)
+    results: Iterator[dict] = solve_mazes(maze_names, args.capacity, args.seed, args.workers,
+                                          SearchStrategy(args.strategy), args.compact, args.include_path,
+                                          args.components)
+    if args.output is None:
+        write_results(results, sys.stdout)
+    else:
+        with open(args.output, 'w') as out:
+            write_results(results, out)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+from __future__ import annotations
+"""
+Compares many start to exit queries on one large maze, moving the start position
+between calls to `Maze.find_way_out`. The first HIERARCHICAL query pays for the clusters
+it goes through and the first DISTANCE_FIELD query for the whole distance field, so both
+are timed over the full run of queries.
+
+Run from the repository root:
+    python -m benchmarks.bench_hierarchical
+"""
+import time
+from typing import List
+
+from benchmarks.generators import open_room, perfect_maze, write_maze
+from config import Tiles
+from maze import Maze, Position
+from pathfinding import SearchStrategy
+from random_gen import RandomGen
+
+QUERIES: int = 100
+
+
+def random_starts(maze: Maze, count: int, seed: int = 7) -> List[Position]:
+    """
+    count random empty cells, all of them able to reach an exit.
+    """
+    RandomGen.set_seed(seed)
+    starts: List[Position] = []
+    while len(starts) < count:
+        position: Position = Position(RandomGen.randint(1, maze.rows - 2), RandomGen.randint(1, maze.cols - 2))
+        if maze.grid[position.row][position.col].tile == " " and maze.can_exit(position):
+            starts.append(position)
+    return starts
+
+
+def run_queries(maze_name: str, starts: List[Position], strategy: SearchStrategy) -> tuple[float, List[int]]:
+    """
+    Searches from every start in turn on one freshly loaded maze.
+    Returns the total seconds and the length of every path.
+    """
+    maze: Maze = Maze.load_maze_from_file(maze_name, compact=True)
+    maze.set_tile(maze.start_position, Tiles.EMPTY.value)
+    lengths: List[int] = []
+    start: float = time.perf_counter()
+    for position in starts:
+        maze.start_position = position
+        lengths.append(len(maze.find_way_out(strategy)))
+    return time.perf_counter() - start, lengths
+
+
+if __name__ == "__main__":
+    mazes: List[str] = [
+        write_maze("perfect_601_4_exits.txt", perfect_maze(601, 601, exits=4)),
+        write_maze("open_1001_4_exits.txt", open_room(1001, 1001, exits=4, wall_chance=0.2)),
+    ]
+    print(f"{'maze':32} {'strategy':16} {'total s':>9} {'mean ms':>9} {'extra steps':>12}")
+    for maze_name in mazes:
+        starts: List[Position] = random_starts(Maze.load_maze_from_file(maze_name, compact=True), QUERIES)
+        shortest: List[int] = []
+        for strategy in [SearchStrategy.A_STAR, SearchStrategy.DISTANCE_FIELD, SearchStrategy.HIERARCHICAL]:
+            seconds, lengths = run_queries(maze_name, starts, strategy)
+            shortest = shortest or lengths
+            extra: float = (sum(lengths) - sum(shortest)) / sum(shortest) * 100
+            print(f"{maze_name:32} {strategy.value:16} {seconds:9.2f} {seconds / QUERIES * 1000:9.2f} {extra:11.2f}%")
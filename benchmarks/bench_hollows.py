@@ -0,0 +1,111 @@
+from __future__ import annotations
+"""
+Compares `SpookyHollow`, which finds the best treasure that fits with a RatioTree keyed by weight,
+against the previous approach of a BetterBST keyed by ratio scanned from the highest ratio down.
+Also compares `MysticalHollow` in lazy deletion mode against the eager mode that pushes every
+treasure too heavy for a query straight back into its heap.
+
+Run from the repository root:
+    python -m benchmarks.bench_hollows
+"""
+import time
+from typing import Callable, List
+
+from betterbst import BetterBST
+from data_structures.linked_stack import LinkedStack
+from data_structures.node import TreeNode
+from hollows import Hollow, MysticalHollow, SpookyHollow
+from random_gen import RandomGen
+from treasure import Treasure
+
+TREASURES: int = 10 ** 5
+QUERIES: int = 10 ** 4
+# The scan visits most of the hollow on every query of the second workload, so it gets fewer
+SLOW_QUERIES: int = 200
+# The eager mystical hollow pops and pushes back most of the heap on every query
+MYSTICAL_QUERIES: int = 50
+
+
+class ScanSpookyHollow(SpookyHollow):
+    """
+    The ratio keyed tree SpookyHollow used before, O(n) per query when the best ratios are all too heavy.
+    """
+
+    def restructure_hollow(self) -> None:
+        self.treasures = BetterBST([(treasure.value / treasure.weight, treasure) for treasure in self.treasures])
+
+    def get_optimal_treasure(self, backpack_capacity: int) -> Treasure | None:
+        stack: LinkedStack[TreeNode] = LinkedStack()
+        current: TreeNode | None = self.treasures.root
+        while current is not None or not stack.is_empty():
+            while current is not None:
+                stack.push(current)
+                current = current.right
+            current = stack.pop()
+            if current.item.weight <= backpack_capacity:
+                optimal: Treasure = current.item
+                del self.treasures[current.key]
+                return optimal
+            current = current.left
+        return None
+
+
+def make_treasures(value_of: Callable[[int], int], seed: int = 21) -> List[Treasure]:
+    """
+    TREASURES treasures with the weights 1 to TREASURES and unique ratios, the ratio keyed tree needs unique keys.
+    """
+    RandomGen.set_seed(seed)
+    treasures: List[Treasure] = []
+    ratios: set[float] = set()
+    for weight in range(1, TREASURES + 1):
+        value: int = value_of(weight)
+        while value / weight in ratios:
+            value += 1
+        ratios.add(value / weight)
+        treasures.append(Treasure(value, weight))
+    return treasures
+
+
+def run(make_hollow: Callable[[], Hollow], treasures: List[Treasure], capacities: List[int]) -> tuple[float, float, int]:
+    """
+    Returns the seconds to build the hollow, the seconds for every query and the total value taken.
+    """
+    def treasure_gen(_): return list(treasures)
+    Hollow.gen_treasures = treasure_gen
+    start: float = time.perf_counter()
+    hollow: Hollow = make_hollow()
+    built: float = time.perf_counter() - start
+    taken: int = 0
+    start = time.perf_counter()
+    for backpack_capacity in capacities:
+        treasure: Treasure | None = hollow.get_optimal_treasure(backpack_capacity)
+        taken += treasure.value if treasure is not None else 0
+    return built, time.perf_counter() - start, taken
+
+
+if __name__ == "__main__":
+    RandomGen.set_seed(5)
+    random_values: List[Treasure] = make_treasures(lambda _: RandomGen.randint(1, TREASURES))
+    growing_ratios: List[Treasure] = make_treasures(lambda weight: weight * weight)
+    spooky: dict[str, Callable[[], Hollow]] = {"scan spooky": ScanSpookyHollow, "spooky": SpookyHollow}
+    mystical: dict[str, Callable[[], Hollow]] = {"eager mystical": MysticalHollow,
+                                                 "lazy mystical": lambda: MysticalHollow(lazy=True)}
+    workloads: List[tuple[str, List[Treasure], List[int], dict[str, Callable[[], Hollow]]]] = [
+        ("random values, any capacity", random_values,
+         [RandomGen.randint(1, TREASURES) for _ in range(QUERIES)], spooky),
+        ("ratio grows with weight", growing_ratios,
+         [RandomGen.randint(1, TREASURES // 10) for _ in range(SLOW_QUERIES)], spooky),
+        # A backpack filling up asks for less and less
+        ("shrinking capacity", growing_ratios,
+         list(range(TREASURES // 10, 0, -TREASURES // 10 // MYSTICAL_QUERIES)), mystical),
+        ("random small capacities", growing_ratios,
+         [RandomGen.randint(1, TREASURES // 10) for _ in range(MYSTICAL_QUERIES)], mystical),
+    ]
+    print(f"{'workload':30} {'hollow':16} {'build s':>8} {'queries s':>10} {'us/query':>10}")
+    for name, treasures, capacities, hollows in workloads:
+        values: List[int] = []
+        for hollow_name, make_hollow in hollows.items():
+            built, seconds, taken = run(make_hollow, treasures, capacities)
+            values.append(taken)
+            print(f"{name:30} {hollow_name:16} {built:8.2f} {seconds:10.3f} {seconds / len(capacities) * 10 ** 6:10.1f}")
+        assert values[0] == values[1], "Both hollows should hand out the same treasures"
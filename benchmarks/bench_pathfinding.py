@@ -0,0 +1,103 @@
+from __future__ import annotations
+"""
+Compares the `Maze.find_way_out` search strategies.
+
+Run from the repository root:
+    python -m benchmarks.bench_pathfinding
+"""
+import glob
+import time
+from typing import List
+
+from benchmarks.generators import open_room, perfect_maze, serpentine, write_maze
+from maze import Maze
+from pathfinding import SearchStrategy
+
+REPEATS: int = 3
+
+
+def task3_mazes() -> List[str]:
+    names: List[str] = []
+    for path in sorted(glob.glob("mazes/task3/*.txt")):
+        name: str = path[len("mazes/"):]
+        try:
+            Maze.validate_maze_file(name)
+        except ValueError:
+            continue
+        names.append(name)
+    return names
+
+
+def generated_mazes() -> List[str]:
+    return [
+        write_maze("perfect_401_1_exit.txt", perfect_maze(401, 401, exits=1)),
+        write_maze("perfect_401_40_exits.txt", perfect_maze(401, 401, exits=40)),
+        write_maze("open_601_1_exit.txt", open_room(601, 601, exits=1)),
+        write_maze("open_601_60_exits.txt", open_room(601, 601, exits=60)),
+        write_maze("serpentine_317.txt", serpentine(317, 317)),
+    ]
+
+
+def open_rooms() -> List[str]:
+    """
+    Open rooms of growing size, empty and with scattered walls, where jump point search skips the most.
+    """
+    return [write_maze(f"open_{size}_{round(wall_chance * 100)}pct_walls.txt", open_room(size, size, wall_chance=wall_chance))
+            for size in (101, 301, 601) for wall_chance in (0, 0.05, 0.2)]
+
+
+def count_visited(maze: Maze) -> int:
+    return sum(cell.visited for row in maze.grid for cell in row)
+
+
+def best_time(maze: Maze, strategy: SearchStrategy) -> float:
+    best: float = float('inf')
+    for _ in range(REPEATS):
+        start: float = time.perf_counter()
+        maze.find_way_out(strategy)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def check_empty_room(size: int = 601) -> None:
+    """
+    Jump point search has to be no slower than A* on an empty room, where every vertical run
+    looks along a whole row at each step.
+    """
+    maze: Maze = Maze.load_maze_from_file(write_maze(f"open_{size}_0pct_walls.txt", open_room(size, size, wall_chance=0)),
+                                          compact=True)
+    a_star: float = best_time(maze, SearchStrategy.A_STAR)
+    jump_point: float = best_time(maze, SearchStrategy.JUMP_POINT)
+    print(f"empty {size}x{size} room: a_star {a_star * 1000:.2f} ms, jump_point {jump_point * 1000:.2f} ms")
+    assert jump_point <= a_star, "Jump point search should be no slower than A* on an empty room"
+
+
+def run(strategies: List[SearchStrategy], maze_names: List[str], adjacency: bool = False) -> None:
+    print(f"{'maze':36} {'strategy':20} {'best ms':>10} {'path':>7} {'visited':>9} {'expanded':>9}"
+          + (" (with adjacency index)" if adjacency else ""))
+    for maze_name in maze_names:
+        maze: Maze = Maze.load_maze_from_file(maze_name, compact=True)
+        if adjacency:
+            maze.build_adjacency_index()
+        for strategy in strategies:
+            best: float = float('inf')
+            path = None
+            for _ in range(REPEATS):
+                start: float = time.perf_counter()
+                path = maze.find_way_out(strategy)
+                best = min(best, time.perf_counter() - start)
+            length: str = "-" if path is None else str(len(path))
+            print(f"{maze_name:36} {strategy.value:20} {best * 1000:10.2f} {length:>7} {count_visited(maze):9} {maze.nodes_expanded:9}")
+
+
+if __name__ == "__main__":
+    all_strategies: List[SearchStrategy] = [SearchStrategy.BFS, SearchStrategy.BIDIRECTIONAL_BFS, SearchStrategy.A_STAR,
+                                            SearchStrategy.DFS, SearchStrategy.DISTANCE_FIELD, SearchStrategy.JUMP_POINT]
+    all_mazes: List[str] = task3_mazes() + generated_mazes()
+    run(all_strategies, all_mazes)
+    print()
+    run(all_strategies, all_mazes, adjacency=True)
+    print()
+    run([SearchStrategy.BFS, SearchStrategy.A_STAR, SearchStrategy.JUMP_POINT], open_rooms())
+    print()
+    check_empty_room()
@@ -0,0 +1,78 @@
+from __future__ import annotations
+"""
+Compares repairing the way out with `Maze.set_wall` / `Maze.clear_wall` against working
+it out from scratch with `Maze.set_tile` followed by `Maze.find_way_out` after each wall change.
+
+Run from the repository root:
+    python -m benchmarks.bench_replanning
+"""
+import time
+from typing import Callable, List
+
+from benchmarks.generators import open_room, perfect_maze, write_maze
+from config import Tiles
+from maze import Maze, Position
+from pathfinding import SearchStrategy
+from random_gen import RandomGen
+
+EDITS: int = 60
+
+
+def wall_changes(maze: Maze, count: int, seed: int = 12) -> List[Position]:
+    """
+    count random cells to toggle, never the start or an exit.
+    """
+    RandomGen.set_seed(seed)
+    changes: List[Position] = []
+    while len(changes) < count:
+        position: Position = Position(RandomGen.randint(1, maze.rows - 2), RandomGen.randint(1, maze.cols - 2))
+        if maze.grid[position.row][position.col].tile in (Tiles.WALL.value, " "):
+            changes.append(position)
+    return changes
+
+
+def replay(maze_name: str, changes: List[Position], edit: Callable[[Maze, Position, str], List[Position] | None]) -> tuple[float, List[int]]:
+    """
+    Applies every change in turn, toggling wall and empty, and times the edits.
+    Returns the total seconds and the path length after each change.
+    """
+    maze: Maze = Maze.load_maze_from_file(maze_name, compact=True)
+    maze.find_way_out(SearchStrategy.DISTANCE_FIELD)
+    lengths: List[int] = []
+    total: float = 0
+    for position in changes:
+        tile: str = " " if maze.grid[position.row][position.col].tile == Tiles.WALL.value else Tiles.WALL.value
+        start: float = time.perf_counter()
+        path: List[Position] | None = edit(maze, position, tile)
+        total += time.perf_counter() - start
+        lengths.append(-1 if path is None else len(path))
+    return total, lengths
+
+
+def repair(maze: Maze, position: Position, tile: str) -> List[Position] | None:
+    return maze.set_wall(position) if tile == Tiles.WALL.value else maze.clear_wall(position, tile)
+
+
+def recompute(strategy: SearchStrategy) -> Callable[[Maze, Position, str], List[Position] | None]:
+    def edit(maze: Maze, position: Position, tile: str) -> List[Position] | None:
+        maze.set_tile(position, tile)
+        return maze.find_way_out(strategy)
+    return edit
+
+
+if __name__ == "__main__":
+    mazes: List[str] = [
+        write_maze("perfect_401_1_exit.txt", perfect_maze(401, 401, exits=1)),
+        write_maze("perfect_401_40_exits.txt", perfect_maze(401, 401, exits=40)),
+        write_maze("open_601_1_exit.txt", open_room(601, 601, exits=1)),
+        write_maze("open_601_60_exits.txt", open_room(601, 601, exits=60)),
+    ]
+    print(f"{'maze':36} {'edit':28} {'mean ms':>10}")
+    for maze_name in mazes:
+        changes: List[Position] = wall_changes(Maze.load_maze_from_file(maze_name, compact=True), EDITS)
+        repaired, expected = replay(maze_name, changes, repair)
+        print(f"{maze_name:36} {'set_wall / clear_wall':28} {repaired / EDITS * 1000:10.2f}")
+        for strategy in [SearchStrategy.DISTANCE_FIELD, SearchStrategy.BFS, SearchStrategy.BIDIRECTIONAL_BFS]:
+            seconds, lengths = replay(maze_name, changes, recompute(strategy))
+            assert lengths == expected, f"{strategy.value} disagrees on {maze_name}"
+            print(f"{maze_name:36} {'set_tile + ' + strategy.value:28} {seconds / EDITS * 1000:10.2f}")
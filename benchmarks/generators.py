@@ -0,0 +1,147 @@
+from __future__ import annotations
+"""
+Seeded maze generators for the benchmarks. Every generator returns the rows of a maze
+in the text format of `config.Tiles` and `write_maze` saves them under mazes/generated
+so they can be loaded with `Maze.load_maze_from_file`.
+"""
+import os
+from typing import List
+
+from config import Tiles
+from random_gen import RandomGen
+
+GENERATED_DIR: str = "generated"
+
+
+def _place_exits(grid: List[List[str]], exits: int) -> None:
+    """
+    Turns border walls that touch an open cell into exits, picked at random.
+
+    Complexity:
+        Best Case Complexity: O(R + C) where R and C are the number of rows and columns.
+        Worst Case Complexity: O(R + C)
+    """
+    rows: int = len(grid)
+    cols: int = len(grid[0])
+    candidates: List[tuple[int, int]] = []
+    for col in range(1, cols - 1):
+        if grid[1][col] != Tiles.WALL.value:
+            candidates.append((0, col))
+        if grid[rows - 2][col] != Tiles.WALL.value:
+            candidates.append((rows - 1, col))
+    for row in range(1, rows - 1):
+        if grid[row][1] != Tiles.WALL.value:
+            candidates.append((row, 0))
+        if grid[row][cols - 2] != Tiles.WALL.value:
+            candidates.append((row, cols - 1))
+    RandomGen.random_shuffle(candidates)
+    for row, col in candidates[:exits]:
+        grid[row][col] = Tiles.EXIT.value
+
+
+def _place_tiles(grid: List[List[str]], tile: str, count: int) -> None:
+    """
+    Puts count copies of tile on random empty cells.
+
+    Complexity:
+        Best Case Complexity: O(count) when empty cells are found straight away.
+        Worst Case Complexity: Unbounded, the grid is expected to be mostly empty.
+    """
+    rows: int = len(grid)
+    cols: int = len(grid[0])
+    while count > 0:
+        row: int = RandomGen.randint(1, rows - 2)
+        col: int = RandomGen.randint(1, cols - 2)
+        if grid[row][col] == Tiles.EMPTY.value:
+            grid[row][col] = tile
+            count -= 1
+
+
+def _finish(grid: List[List[str]], exits: int, hollows: int) -> List[str]:
+    grid[1][1] = Tiles.START_POSITION.value
+    _place_exits(grid, exits)
+    _place_tiles(grid, Tiles.SPOOKY_HOLLOW.value, (hollows + 1) // 2)
+    _place_tiles(grid, Tiles.MYSTICAL_HOLLOW.value, hollows // 2)
+    return ["".join(row) for row in grid]
+
+
+def perfect_maze(rows: int, cols: int, exits: int = 1, hollows: int = 2, seed: int = 1008) -> List[str]:
+    """
+    A maze of one cell wide corridors with exactly one route between any two cells,
+    carved with an iterative recursive-backtracker. rows and cols should be odd.
+
+    Complexity:
+        Best Case Complexity: O(R * C)
+        Worst Case Complexity: O(R * C)
+    """
+    RandomGen.set_seed(seed)
+    grid: List[List[str]] = [[Tiles.WALL.value] * cols for _ in range(rows)]
+    grid[1][1] = Tiles.EMPTY.value
+    stack: List[tuple[int, int]] = [(1, 1)]
+    while stack:
+        row, col = stack[-1]
+        options: List[tuple[int, int]] = [(row + dr, col + dc) for dr, dc in ((-2, 0), (2, 0), (0, -2), (0, 2))
+                                          if 0 < row + dr < rows - 1 and 0 < col + dc < cols - 1
+                                          and grid[row + dr][col + dc] == Tiles.WALL.value]
+        if not options:
+            stack.pop()
+            continue
+        next_row, next_col = RandomGen.random_choice(options)
+        grid[(row + next_row) // 2][(col + next_col) // 2] = Tiles.EMPTY.value
+        grid[next_row][next_col] = Tiles.EMPTY.value
+        stack.append((next_row, next_col))
+    return _finish(grid, exits, hollows)
+
+
+def open_room(rows: int, cols: int, exits: int = 1, hollows: int = 2, wall_chance: float = 0.05, seed: int = 1008) -> List[str]:
+    """
+    A large room with walls scattered over wall_chance of its cells.
+
+    Complexity:
+        Best Case Complexity: O(R * C)
+        Worst Case Complexity: O(R * C)
+    """
+    RandomGen.set_seed(seed)
+    grid: List[List[str]] = [[Tiles.WALL.value] * cols]
+    for _ in range(rows - 2):
+        grid.append([Tiles.WALL.value] + [Tiles.WALL.value if RandomGen.random_chance(wall_chance) else Tiles.EMPTY.value
+                                          for _ in range(cols - 2)] + [Tiles.WALL.value])
+    grid.append([Tiles.WALL.value] * cols)
+    grid[1][2] = grid[2][1] = Tiles.EMPTY.value
+    return _finish(grid, exits, hollows)
+
+
+def serpentine(rows: int, cols: int, hollows: int = 2, seed: int = 1008) -> List[str]:
+    """
+    One corridor that snakes back and forth across the whole maze, from the start
+    in the top left corner to a single exit at the far end. rows should be odd.
+
+    Complexity:
+        Best Case Complexity: O(R * C)
+        Worst Case Complexity: O(R * C)
+    """
+    RandomGen.set_seed(seed)
+    grid: List[List[str]] = [[Tiles.WALL.value] * cols for _ in range(rows)]
+    for row in range(1, rows - 1, 2):
+        for col in range(1, cols - 1):
+            grid[row][col] = Tiles.EMPTY.value
+        if row + 2 < rows - 1:
+            # Alternate the gap in the dividing wall between the right and left ends
+            grid[row + 1][cols - 2 if row % 4 == 1 else 1] = Tiles.EMPTY.value
+    last_row: int = rows - 2 if (rows - 2) % 2 == 1 else rows - 3
+    grid[last_row][cols - 1 if last_row % 4 == 1 else 0] = Tiles.EXIT.value
+    return _finish(grid, 0, hollows)
+
+
+def write_maze(name: str, rows: List[str]) -> str:
+    """
+    Saves the rows to mazes/generated/name and returns the name to pass to `Maze.load_maze_from_file`.
+
+    Complexity:
+        Best Case Complexity: O(R * C)
+        Worst Case Complexity: O(R * C)
+    """
+    os.makedirs(os.path.join("mazes", GENERATED_DIR), exist_ok=True)
+    with open(os.path.join("mazes", GENERATED_DIR, name), 'w') as f:
+        f.write("\n".join(rows))
+    return f"{GENERATED_DIR}/{name}"
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from typing import List, Tuple, TypeVar
 
+from algorithms.mergesort import mergesort
 from data_structures.bst import BinarySearchTree
 
 K = TypeVar('K')
@@ -25,8 +26,9 @@ class BetterBST(BinarySearchTree[K, I]):
             elements(List[tuple[K, I]]): The elements to be inserted into the tree.
 
         Complexity:
-            Best Case Complexity: TODO
-            Worst Case Complexity: TODO
+            Best Case Complexity: O(n * log(n))
+            Worst Case Complexity: O(n * log(n))
+            where n is the number of elements in the list.
         """
         super().__init__()
         new_elements: List[Tuple[K, I]] = self.__sort_elements(elements)
@@ -45,10 +47,11 @@ class BetterBST(BinarySearchTree[K, I]):
             list(Tuple[K, I]]) - elements after being sorted.
 
         Complexity:
-            Best Case Complexity: TODO
-            Worst Case Complexity: TODO
+            Best Case Complexity: O(n * log(n) * CompK)
+            Worst Case Complexity: O(n * log(n) * CompK)
+            where n is the number of elements and CompK is the cost of comparing two keys.
         """
-        raise NotImplementedError
+        return mergesort(elements, lambda element: element[0])
 
     def __build_balanced_tree(self, elements: List[Tuple[K, I]]) -> None:
         """
@@ -63,15 +66,33 @@ class BetterBST(BinarySearchTree[K, I]):
         Complexity:
             (This is the actual complexity of your code, 
             remember to define all variables used.)
-            Best Case Complexity: TODO
-            Worst Case Complexity: TODO
+            Best Case Complexity: O(n * log(n))
+            Worst Case Complexity: O(n * log(n))
+            where n is the number of elements in the list.
 
         Justification:
-            TODO
+            Every element is inserted once. The median of each range is inserted before either
+            half, so the tree never grows deeper than O(log(n)) and each insert costs O(log(n)).
 
         Complexity requirements for full marks:
             Best Case Complexity: O(n * log(n))
             Worst Case Complexity: O(n * log(n))
             where n is the number of elements in the list.
         """
-        raise NotImplementedError
+        self.__build_balanced_tree_aux(elements, 0, len(elements) - 1)
+
+    def __build_balanced_tree_aux(self, elements: List[Tuple[K, I]], lo: int, hi: int) -> None:
+        """
+        Inserts the median of elements[lo..hi] and then recurses into each half.
+
+        Complexity:
+            Best Case Complexity: O(m * log(n)) where m = hi - lo + 1
+            Worst Case Complexity: O(m * log(n)) where m = hi - lo + 1
+        """
+        if lo > hi:
+            return
+        mid: int = (lo + hi) // 2
+        key, item = elements[mid]
+        self[key] = item
+        self.__build_balanced_tree_aux(elements, lo, mid - 1)
+        self.__build_balanced_tree_aux(elements, mid + 1, hi)
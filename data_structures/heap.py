@@ -4,7 +4,7 @@ from __future__ import annotations
 __author__ = "Brendon Taylor, modified by Jackson Goerner"
 __docformat__ = 'reStructuredText'
 
-from typing import Generic
+from typing import Generic, Iterable, Iterator
 
 from data_structures.referential_array import ArrayR, T
 
@@ -27,6 +27,17 @@ class MaxHeap(Generic[T]):
     def __len__(self) -> int:
         return self.length
 
+    def __iter__(self) -> Iterator[T]:
+        """
+        Iterates over the elements in the order they sit in the heap, not sorted, without removing any.
+
+        Complexity:
+            Best case complexity: O(n) where n is the number of elements in the heap.
+            Worst case complexity: O(n)
+        """
+        for k in range(1, self.length + 1):
+            yield self.the_array[k]
+
     def is_full(self) -> bool:
         return self.length + 1 == len(self.the_array)
 
@@ -64,6 +75,37 @@ class MaxHeap(Generic[T]):
         self.the_array[self.length] = element
         self.rise(self.length)
 
+    def add_all(self, elements: Iterable[T], count: int) -> None:
+        """
+        Adds count elements. Adding them one at a time costs O(k log n), appending them all and then
+        sinking every parent again as heapify does costs O(n), the cheaper of the two is used.
+
+        Args:
+            elements(Iterable[T]): The elements to add.
+            count(int): How many elements there are.
+
+        Raises:
+            IndexError: If the heap does not have room for them.
+
+        Complexity:
+            Best case complexity: O(k) - Few elements that do not rise
+            Worst case complexity: O(min(k * logn, n))
+            k is the number of elements added and n the number of elements in the heap afterwards
+        """
+        if self.length + count >= len(self.the_array):
+            raise IndexError
+
+        total: int = self.length + count
+        if count * total.bit_length() < total:
+            for element in elements:
+                self.add(element)
+            return
+        for element in elements:
+            self.length += 1
+            self.the_array[self.length] = element
+        for k in range(self.length // 2, 0, -1):
+            self.sink(k)
+
     def largest_child(self, k: int) -> int:
         """
         Returns the index of k's child with greatest value.
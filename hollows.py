@@ -10,10 +10,30 @@ And ensure your treasure data structure is not banned.
 from abc import ABC, abstractmethod
 from typing import List
 
+from algorithms.binary_search import binary_search
+from algorithms.mergesort import mergesort
 from config import Tiles
+from data_structures.heap import MaxHeap
+from data_structures.linked_stack import LinkedStack
+from knapsack import KnapsackTable
+from lazy_heap import LazyRatioHeap
+from ratio_tree import RatioTree, RatioTreeNode, ratio
 from treasure import Treasure, generate_treasures
 
 
+def check_ascending(capacities: List[int]) -> None:
+    """
+    Raises ValueError unless capacities are in ascending order, which the batched peeks rely on.
+
+    Complexity:
+        Best Case Complexity: O(1) when the first pair is out of order.
+        Worst Case Complexity: O(q) where q is the number of capacities.
+    """
+    for i in range(1, len(capacities)):
+        if capacities[i - 1] > capacities[i]:
+            raise ValueError(f"Capacities must be sorted, {capacities[i - 1]} comes before {capacities[i]}")
+
+
 class Hollow(ABC):
     """
     DO NOT MODIFY THIS CLASS
@@ -61,6 +81,14 @@ class Hollow(ABC):
 
 class SpookyHollow(Hollow):
 
+    def __init__(self, knapsack: bool = False) -> None:
+        """
+        Args:
+            knapsack(bool): Build the KnapsackTable of the treasures in restructure_hollow.
+        """
+        self.precompute_knapsack: bool = knapsack
+        super().__init__()
+
     def restructure_hollow(self) -> None:
         """
         Re-arranges the treasures in the hollow from a list to a new
@@ -75,15 +103,19 @@ class SpookyHollow(Hollow):
         Complexity:
             (This is the actual complexity of your code, 
             remember to define all variables used.)
-            Best Case Complexity: TODO
-            Worst Case Complexity: TODO
+            Best Case Complexity: O(n log n)
+            Worst Case Complexity: O(n log n)
+            Where n is the number of treasures in the hollow, sorting the treasures by weight and
+            inserting them into a balanced RatioTree both cost O(n log n). Building the knapsack
+            table when asked to adds O(n * W), W being TreasureConfig.MAX_TREASURE_WEIGHT.
 
         Complexity requirements for full marks:
             Best Case Complexity: O(n log n)
             Worst Case Complexity: O(n log n)
             Where n is the number of treasures in the hollow
         """
-        raise NotImplementedError
+        self.knapsack: KnapsackTable | None = KnapsackTable(self.treasures) if self.precompute_knapsack else None
+        self.treasures = RatioTree(self.treasures)
 
     def get_optimal_treasure(self, backpack_capacity: int) -> Treasure | None:
         """
@@ -104,15 +136,114 @@ class SpookyHollow(Hollow):
         Complexity:
             (This is the actual complexity of your code, 
             remember to define all variables used.)
-            Best Case Complexity: TODO
-            Worst Case Complexity: TODO
+            Best Case Complexity: O(log(n))
+            Worst Case Complexity: O(log(n))
+            n is the number of treasures in the hollow. The tree is keyed by weight and built balanced,
+            removing treasures never makes it deeper, and both finding the best treasure that fits
+            and removing it follow one root to leaf path.
 
         Complexity requirements for full marks:
             Best Case Complexity: O(log(n))
             Worst Case Complexity: O(n)
             n is the number of treasures in the hollow 
         """
-        raise NotImplementedError
+        node: RatioTreeNode | None = self.treasures.best_fitting(backpack_capacity)
+        if node is None:
+            return None
+        # Deleting a node with two children moves its successor into the same node object
+        optimal: Treasure = node.item
+        del self.treasures[node.key]
+        self.knapsack = None
+        return optimal
+
+    def treasure_order(self) -> List[Treasure]:
+        """
+        Every treasure in the hollow, in the order get_optimal_treasure would hand them out if they all fit,
+        read from the tree without removing anything. That is by ratio highest first, then lightest first,
+        then by the key's index like best_fitting.
+
+        Complexity:
+            Best Case Complexity: O(n log n)
+            Worst Case Complexity: O(n log n)
+            n is the number of treasures in the hollow, the tree nodes are merge sorted.
+        """
+        nodes: List[RatioTreeNode] = mergesort([node for node in self.treasures], lambda node: (-ratio(node.item), node.key))
+        return [node.item for node in nodes]
+
+    def peek_optimal_treasures(self, capacities: List[int]) -> List[Treasure | None]:
+        """
+        The treasure get_optimal_treasure would hand out for each capacity, without removing anything.
+
+        The tree is swept in weight order once, keeping the best ratio seen so far, and every capacity
+        takes the best of the treasures no heavier than it. When there are only a few capacities,
+        asking the tree for each one is cheaper than the sweep and is done instead.
+
+        Args:
+            capacities(List[int]): The backpack capacities, in ascending order.
+
+        Returns:
+            List[Treasure | None]: The treasure for each capacity, None where nothing fits.
+
+        Raises:
+            ValueError: If capacities are not in ascending order.
+
+        Complexity:
+            Best Case Complexity: O(q * log(n)) when q * log(n) < n.
+            Worst Case Complexity: O(n + q) for the sweep.
+            n is the number of treasures in the hollow and q the number of capacities.
+        """
+        check_ascending(capacities)
+        if len(capacities) * len(self.treasures).bit_length() < len(self.treasures):
+            nodes: List[RatioTreeNode | None] = [self.treasures.best_fitting(capacity) for capacity in capacities]
+            return [node.item if node is not None else None for node in nodes]
+
+        answers: List[Treasure | None] = []
+        best: Treasure | None = None
+        # In weight order, so keeping only strictly better ratios favours the lighter treasure as the tree does
+        for node in self.treasures:
+            while len(answers) < len(capacities) and capacities[len(answers)] < node.item.weight:
+                answers.append(best)
+            if len(answers) == len(capacities):
+                break
+            if best is None or node.item.value / node.item.weight > best.value / best.weight:
+                best = node.item
+        while len(answers) < len(capacities):
+            answers.append(best)
+        return answers
+
+    def knapsack_table(self) -> KnapsackTable:
+        """
+        The KnapsackTable of the treasures in the hollow now. The one restructure_hollow built is used
+        until a treasure is taken, after which a new one is built on the next lookup.
+
+        Complexity:
+            Best Case Complexity: O(1) when the table is up to date.
+            Worst Case Complexity: O(n * W) building it, n is the number of treasures in the hollow
+            and W is TreasureConfig.MAX_TREASURE_WEIGHT.
+        """
+        if self.knapsack is None:
+            self.knapsack = KnapsackTable([node.item for node in self.treasures])
+        return self.knapsack
+
+    def best_value(self, backpack_capacity: int) -> int:
+        """
+        The most value the hollow could fill backpack_capacity with, choosing freely rather than by ratio.
+
+        Complexity:
+            Best Case Complexity: O(1) when the knapsack table is up to date.
+            Worst Case Complexity: O(n * W), see knapsack_table.
+        """
+        return self.knapsack_table().best_value(backpack_capacity)
+
+    def best_treasures(self, backpack_capacity: int) -> List[Treasure]:
+        """
+        Treasures that together make up best_value(backpack_capacity), without removing them.
+
+        Complexity:
+            Best Case Complexity: O(n) when the knapsack table is up to date.
+            Worst Case Complexity: O(n * W), see knapsack_table.
+        """
+        return self.knapsack_table().chosen(backpack_capacity)
 
     def __str__(self) -> str:
         return Tiles.SPOOKY_HOLLOW.value
@@ -123,6 +254,18 @@ class SpookyHollow(Hollow):
 
 class MysticalHollow(Hollow):
 
+    def __init__(self, lazy: bool = False, knapsack: bool = False) -> None:
+        """
+        Args:
+            lazy(bool): Keep the treasures in a LazyRatioHeap, which sets aside the treasures too heavy for a
+            query until a larger capacity is asked for. Otherwise they go straight back into a MaxHeap.
+            Worth turning on for a hollow that is asked for treasures many times over.
+            knapsack(bool): Build the KnapsackTable of the treasures in restructure_hollow.
+        """
+        self.lazy: bool = lazy
+        self.precompute_knapsack: bool = knapsack
+        super().__init__()
+
     def restructure_hollow(self):
         """
         Re-arranges the treasures in the hollow from a list to a new
@@ -137,15 +280,21 @@ class MysticalHollow(Hollow):
         Complexity:
             (This is the actual complexity of your code, 
             remember to define all variables used.)
-            Best Case Complexity: TODO
-            Worst Case Complexity: TODO
+            Best Case Complexity: O(n)
+            Worst Case Complexity: O(n)
+            Where n is the number of treasures in the hollow, heapify is linear in both modes.
+            Building the knapsack table when asked to adds O(n * W), W being TreasureConfig.MAX_TREASURE_WEIGHT.
 
         Complexity requirements for full marks:
             Best Case Complexity: O(n)
             Worst Case Complexity: O(n)
             Where n is the number of treasures in the hollow
         """
-        raise NotImplementedError
+        # The index breaks ties between equal ratios so treasures themselves are never compared
+        entries: List[tuple[float, int, Treasure]] = [(treasure.value / treasure.weight, index, treasure)
+                                                      for index, treasure in enumerate(self.treasures)]
+        self.knapsack: KnapsackTable | None = KnapsackTable(self.treasures) if self.precompute_knapsack else None
+        self.treasures = LazyRatioHeap(entries) if self.lazy else MaxHeap.heapify(entries)
 
     def get_optimal_treasure(self, backpack_capacity: int) -> Treasure | None:
         """
@@ -166,15 +315,122 @@ class MysticalHollow(Hollow):
         Complexity:
             (This is the actual complexity of your code, 
             remember to define all variables used.)
-            Best Case Complexity: TODO
-            Worst Case Complexity: TODO
+            Best Case Complexity: O(log n) when the highest ratio treasure fits in the backpack.
+            In lazy mode O(1) when everything left in the heap was set aside by earlier queries.
+            Worst Case Complexity: O(n log n) when every treasure is too heavy, each one is
+            removed from the heap. The eager hollow adds them all back, the lazy one only once
+            a larger capacity releases them.
+            Where n is the number of treasures in the hollow
 
         Complexity requirements for full marks:
             Best Case Complexity: O(log n)
             Worst Case Complexity: O(n log n)
             Where n is the number of treasures in the hollow
         """
-        raise NotImplementedError
+        if self.lazy:
+            entry: tuple[float, int, Treasure] | None = self.treasures.get_best(backpack_capacity)
+            if entry is None:
+                return None
+            self.knapsack = None
+            return entry[2]
+        too_heavy: LinkedStack[tuple[float, int, Treasure]] = LinkedStack()
+        optimal: Treasure | None = None
+        while len(self.treasures) > 0:
+            entry: tuple[float, int, Treasure] = self.treasures.get_max()
+            if entry[2].weight <= backpack_capacity:
+                optimal = entry[2]
+                break
+            too_heavy.push(entry)
+        while not too_heavy.is_empty():
+            self.treasures.add(too_heavy.pop())
+        if optimal is not None:
+            self.knapsack = None
+        return optimal
+
+    def treasure_order(self) -> List[Treasure]:
+        """
+        Every treasure in the hollow, in the order get_optimal_treasure would hand them out if they all fit,
+        read from the heap, and anything the lazy heap set aside, without removing anything. That is by
+        ratio, then by index, both highest first.
+
+        Complexity:
+            Best Case Complexity: O(n log n)
+            Worst Case Complexity: O(n log n)
+            n is the number of treasures in the hollow, the heap entries are merge sorted.
+        """
+        entries: List[tuple[float, int, Treasure]] = mergesort(list(self.treasures), lambda entry: (-entry[0], -entry[1]))
+        return [entry[2] for entry in entries]
+
+    def peek_optimal_treasures(self, capacities: List[int]) -> List[Treasure | None]:
+        """
+        The treasure get_optimal_treasure would hand out for each capacity, without removing anything.
+
+        Every entry, including those the lazy heap has set aside, is looked at once. A binary search
+        finds the smallest capacity it fits, where it is kept if it beats what is there. Each capacity
+        then takes the best entry kept at it or at any smaller capacity.
+
+        Args:
+            capacities(List[int]): The backpack capacities, in ascending order.
+
+        Returns:
+            List[Treasure | None]: The treasure for each capacity, None where nothing fits.
+
+        Raises:
+            ValueError: If capacities are not in ascending order.
+
+        Complexity:
+            Best Case Complexity: O(n * log(q) + q)
+            Worst Case Complexity: O(n * log(q) + q)
+            n is the number of treasures in the hollow and q the number of capacities.
+        """
+        check_ascending(capacities)
+        best: List[tuple[float, int, Treasure] | None] = [None] * len(capacities)
+        for entry in self.treasures:
+            i: int = binary_search(capacities, entry[2].weight)
+            if i < len(capacities) and (best[i] is None or entry > best[i]):
+                best[i] = entry
+        for i in range(1, len(capacities)):
+            if best[i] is None or (best[i - 1] is not None and best[i - 1] > best[i]):
+                best[i] = best[i - 1]
+        # binary_search lands on any one of equal capacities, the last of them has seen every entry
+        for i in range(len(capacities) - 2, -1, -1):
+            if capacities[i] == capacities[i + 1]:
+                best[i] = best[i + 1]
+        return [entry[2] if entry is not None else None for entry in best]
+
+    def knapsack_table(self) -> KnapsackTable:
+        """
+        The KnapsackTable of the treasures in the hollow now. The one restructure_hollow built is used
+        until a treasure is taken, after which a new one is built on the next lookup.
+
+        Complexity:
+            Best Case Complexity: O(1) when the table is up to date.
+            Worst Case Complexity: O(n * W) building it, n is the number of treasures in the hollow
+            and W is TreasureConfig.MAX_TREASURE_WEIGHT.
+        """
+        if self.knapsack is None:
+            self.knapsack = KnapsackTable([entry[2] for entry in self.treasures])
+        return self.knapsack
+
+    def best_value(self, backpack_capacity: int) -> int:
+        """
+        The most value the hollow could fill backpack_capacity with, choosing freely rather than by ratio.
+
+        Complexity:
+            Best Case Complexity: O(1) when the knapsack table is up to date.
+            Worst Case Complexity: O(n * W), see knapsack_table.
+        """
+        return self.knapsack_table().best_value(backpack_capacity)
+
+    def best_treasures(self, backpack_capacity: int) -> List[Treasure]:
+        """
+        Treasures that together make up best_value(backpack_capacity), without removing them.
+
+        Complexity:
+            Best Case Complexity: O(n) when the knapsack table is up to date.
+            Worst Case Complexity: O(n * W), see knapsack_table.
+        """
+        return self.knapsack_table().chosen(backpack_capacity)
 
     def __str__(self) -> str:
         return Tiles.MYSTICAL_HOLLOW.value
@@ -0,0 +1,95 @@
+from __future__ import annotations
+"""
+The exact 0/1 knapsack optimum of a hollow for every capacity, used by the hollows' `best_value`
+and `best_treasures`.
+
+`get_optimal_treasure` is greedy by ratio, which is what `Maze.take_treasures` does, but it can
+leave value behind. KnapsackTable runs the usual dynamic programme over capacities once, so the
+most value any capacity can hold is then a single array lookup. The decisions can be kept as well,
+one byte per treasure and capacity, to recover which treasures make up that value.
+"""
+from array import array
+from typing import List
+
+from config import TreasureConfig
+from treasure import Treasure
+
+
+class KnapsackTable:
+
+    def __init__(self, treasures: List[Treasure], max_capacity: int = TreasureConfig.MAX_TREASURE_WEIGHT.value,
+                 keep_choices: bool = True) -> None:
+        """
+        Args:
+            treasures(List[Treasure]): The treasures to choose from.
+            max_capacity(int): The largest capacity that can be looked up, capacities that fit every treasure
+            can always be looked up.
+            keep_choices(bool): Keep the decisions `chosen` needs.
+
+        Complexity:
+            Best Case Complexity: O(n * W)
+            Worst Case Complexity: O(n * W)
+            where n is the number of treasures and W the smaller of max_capacity and their total weight.
+        """
+        self.treasures: List[Treasure] = treasures
+        self.total_weight: int = sum(treasure.weight for treasure in treasures)
+        self.total_value: int = sum(treasure.value for treasure in treasures)
+        self.size: int = min(max_capacity, self.total_weight) + 1
+        # values[c] is the most value that fits in capacity c
+        self.values: array = array('i', [0]) * self.size
+        # taken[i * size + c] is 1 when treasure i is part of the best choice for c among treasures 0..i
+        self.taken: bytearray | None = bytearray(len(treasures) * self.size) if keep_choices else None
+        for i, treasure in enumerate(treasures):
+            for capacity in range(self.size - 1, treasure.weight - 1, -1):
+                with_treasure: int = self.values[capacity - treasure.weight] + treasure.value
+                if with_treasure > self.values[capacity]:
+                    self.values[capacity] = with_treasure
+                    if self.taken is not None:
+                        self.taken[i * self.size + capacity] = 1
+
+    def check_capacity(self, capacity: int) -> None:
+        """
+        Raises ValueError if capacity is negative, or beyond max_capacity without fitting every treasure.
+
+        Complexity:
+            Best Case Complexity: O(1)
+            Worst Case Complexity: O(1)
+        """
+        if capacity < 0 or (self.size <= capacity < self.total_weight):
+            raise ValueError(f"Capacity {capacity} is outside the table, which goes up to {self.size - 1}")
+
+    def best_value(self, capacity: int) -> int:
+        """
+        The most value that fits in capacity.
+
+        Complexity:
+            Best Case Complexity: O(1)
+            Worst Case Complexity: O(1)
+        """
+        self.check_capacity(capacity)
+        if capacity >= self.total_weight:
+            return self.total_value
+        return self.values[capacity]
+
+    def chosen(self, capacity: int) -> List[Treasure]:
+        """
+        Treasures that fit in capacity together and are worth best_value(capacity).
+
+        Raises:
+            ValueError: If the table was built without keep_choices.
+
+        Complexity:
+            Best Case Complexity: O(n) where n is the number of treasures.
+            Worst Case Complexity: O(n)
+        """
+        if self.taken is None:
+            raise ValueError("The table was built without keep_choices")
+        self.check_capacity(capacity)
+        if capacity >= self.total_weight:
+            return list(self.treasures)
+        treasures: List[Treasure] = []
+        for i in range(len(self.treasures) - 1, -1, -1):
+            if self.taken[i * self.size + capacity]:
+                treasures.append(self.treasures[i])
+                capacity -= self.treasures[i].weight
+        return treasures
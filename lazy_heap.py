@@ -0,0 +1,119 @@
+from __future__ import annotations
+"""
+The treasures of a `MysticalHollow` in lazy deletion mode.
+
+One mystical hollow is shared by every mystical cell in a maze, so it is asked for treasures
+many times over. A max heap of (ratio, index, treasure) entries hands out the best ratio first,
+but every entry above the first one that fits has to be popped, and the eager hollow pushes all
+of them straight back. LazyRatioHeap keeps them aside instead, in a bucket labelled with the
+capacity they were too heavy for. They stay there while later queries ask for that capacity or
+less, since they cannot fit those either, and go back into the heap together as soon as a larger
+capacity is asked for.
+
+The buckets live on a stack whose capacities shrink towards the top, so the buckets a query
+has to release are always the ones on top.
+"""
+from typing import Iterator, List
+
+from data_structures.heap import MaxHeap
+from data_structures.linked_stack import LinkedStack
+from treasure import Treasure
+
+RatioEntry = tuple[float, int, Treasure]
+
+
+class LazyRatioHeap:
+
+    def __init__(self, entries: List[RatioEntry]) -> None:
+        """
+        Args:
+            entries(List[RatioEntry]): The (ratio, index, treasure) entries, the index keeps equal ratios apart.
+
+        Complexity:
+            Best Case Complexity: O(n)
+            Worst Case Complexity: O(n)
+            where n is the number of entries, heapify is linear.
+        """
+        self.heap: MaxHeap[RatioEntry] = MaxHeap.heapify(entries)
+        # (capacity, entries heavier than it, how many) with capacities shrinking towards the top
+        self.overflow: LinkedStack[tuple[int, LinkedStack[RatioEntry], int]] = LinkedStack()
+        self.set_aside: int = 0
+
+    def __len__(self) -> int:
+        return len(self.heap) + self.set_aside
+
+    def __iter__(self) -> Iterator[RatioEntry]:
+        """
+        Every entry, in the heap or set aside, in no particular order and without removing any.
+
+        Complexity:
+            Best Case Complexity: O(n) where n is the number of entries.
+            Worst Case Complexity: O(n)
+        """
+        yield from self.heap
+        bucket_node = self.overflow.top
+        while bucket_node is not None:
+            node = bucket_node.item[1].top
+            while node is not None:
+                yield node.item
+                node = node.link
+            bucket_node = bucket_node.link
+
+    def release(self, capacity: int) -> None:
+        """
+        Puts every entry set aside for a capacity below capacity back into the heap with `MaxHeap.add_all`,
+        which adds them one at a time or rebuilds the heap from the bottom up, whichever is cheaper.
+
+        Complexity:
+            Best Case Complexity: O(1) when nothing was set aside for a smaller capacity.
+            Worst Case Complexity: O(min(k * log(n), n)) where k is the number of entries released
+            and n the number of entries in the heap afterwards.
+        """
+        released: LinkedStack[RatioEntry] = LinkedStack()
+        count: int = 0
+        while not self.overflow.is_empty() and self.overflow.peek()[0] < capacity:
+            _, bucket, size = self.overflow.pop()
+            count += size
+            while not bucket.is_empty():
+                released.push(bucket.pop())
+        if count == 0:
+            return
+        self.set_aside -= count
+        # The heap was built for every entry, so there is always room for them
+        self.heap.add_all((released.pop() for _ in range(count)), count)
+
+    def get_best(self, capacity: int) -> RatioEntry | None:
+        """
+        Removes and returns the highest ratio entry whose treasure weighs at most capacity.
+        The entries above it in the heap are set aside for capacity rather than added back.
+
+        Returns:
+            RatioEntry | None: The entry, None if nothing fits.
+
+        Complexity:
+            Best Case Complexity: O(1) when the heap is empty after the release, because earlier queries for
+            this capacity or more set everything aside.
+            Worst Case Complexity: O(n log(n)) where n is the number of entries, when every entry is popped.
+            Each entry is then set aside once until a larger capacity releases it.
+        """
+        self.release(capacity)
+        heavy: LinkedStack[RatioEntry] = LinkedStack()
+        count: int = 0
+        best: RatioEntry | None = None
+        while len(self.heap) > 0:
+            entry: RatioEntry = self.heap.get_max()
+            if entry[2].weight <= capacity:
+                best = entry
+                break
+            heavy.push(entry)
+            count += 1
+        if count > 0:
+            self.set_aside += count
+            if not self.overflow.is_empty() and self.overflow.peek()[0] == capacity:
+                _, bucket, size = self.overflow.pop()
+                while not heavy.is_empty():
+                    bucket.push(heavy.pop())
+                count += size
+                heavy = bucket
+            self.overflow.push((capacity, heavy, count))
+        return best
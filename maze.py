@@ -1,14 +1,36 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import List, Tuple
+from array import array
+import os
+from collections import OrderedDict
+from typing import BinaryIO, Callable, Iterator, List, Sequence, Tuple
 
 from config import Directions, Tiles
+from data_structures.linked_queue import LinkedQueue
 from hollows import Hollow, MysticalHollow, SpookyHollow
+from maze_binary import MzbMaze, read_mzb, read_mzb_index, write_mzb
+from pathfinding import (FLAT_SEARCHES, UNREACHABLE, AdjacencyIndex, ClusterGraph, ComponentIndex, ExitTree, GridLayout, LazyLayout, SearchResult, SearchStrategy,
+                         descend_distance_field, exit_distance_field, exit_search_tree, lower_distances, raise_distances, reachable_cells)
+from route_planner import BEAM_WIDTH, TreasureRoutePlanner, pick_treasure
 from treasure import Treasure
 
+# bytes.translate tables, walls become 0 and every other tile 1 / any non-zero seen flag becomes 1
+_WALL_TO_CLOSED: bytes = bytes(int(code != ord(Tiles.WALL.value)) for code in range(256))
+_SEEN_TO_FLAG: bytes = bytes(int(code != 0) for code in range(256))
+_EMPTY_TO_SPACE: bytes = bytes.maketrans(Tiles.EMPTY.value.encode(), b' ')
+_WALL_BYTE: int = ord(Tiles.WALL.value)
+
+MZB_SUFFIX: str = ".mzb"
+
 
 class Position:
+    """
+    A row and column of a maze. Positions are hashed on their row and column so they can be
+    dict keys and set members, which means they should not be changed once made.
+    `Maze.position_at` hands out one shared Position per cell.
+    """
+    __slots__ = ('row', 'col')
+
     def __init__(self, row: int, col: int) -> None:
         """
         Args:
@@ -21,6 +43,30 @@ class Position:
     def __eq__(self, value: object) -> bool:
         return isinstance(value, Position) and value.row == self.row and value.col == self.col
 
+    def __hash__(self) -> int:
+        return hash((self.row, self.col))
+
+    def pack(self, cols: int) -> int:
+        """
+        The flat index row * cols + col of this position in a maze cols wide.
+
+        Complexity:
+            Best Case Complexity: O(1)
+            Worst Case Complexity: O(1)
+        """
+        return self.row * cols + self.col
+
+    @staticmethod
+    def unpack(index: int, cols: int) -> Position:
+        """
+        The position at flat index in a maze cols wide, the inverse of `pack`.
+
+        Complexity:
+            Best Case Complexity: O(1)
+            Worst Case Complexity: O(1)
+        """
+        return Position(index // cols, index % cols)
+
     def __repr__(self):
         return str(self)
 
@@ -28,11 +74,365 @@ class Position:
         return f"({self.row}, {self.col})"
 
 
-@dataclass
+class VisitStamps:
+    """
+    Visited flags for every cell of a maze, stored as one stamp per cell in flat index order
+    and a generation counter. A cell is visited when its stamp equals the current generation,
+    so every flag is cleared at once by moving on to the next generation instead of touching
+    each cell.
+
+    As the one object every cell of a list backed grid shares, it also carries the width of
+    the maze, which the cells work their flat index out from, and `on_tile_change`, which the
+    cells call with (index, old tile, new tile) whenever their tile is set. The maze uses it to
+    keep its caches in step with edits made straight to `grid[row][col].tile`.
+    """
+    MAX_GENERATION: int = 0xFFFFFFFF
+
+    def __init__(self, size: int = 0, cols: int = 0) -> None:
+        """
+        Args:
+            size(int): Number of cells to track, more can be added with `grow`.
+            cols(int): Width of the maze, the flag of the cell at (row, col) is at row * cols + col.
+
+        Complexity:
+            Best Case Complexity: O(N) where N is size.
+            Worst Case Complexity: O(N) where N is size.
+        """
+        self.generation: int = 1
+        self.stamps: array[int] = array('I', [0]) * size
+        self.cols: int = cols
+        self.on_tile_change: Callable[[int, str | Hollow, str | Hollow], None] | None = None
+
+    def grow(self, count: int) -> None:
+        """
+        Tracks count more unvisited cells after the existing ones.
+
+        Complexity:
+            Best Case Complexity: O(count)
+            Worst Case Complexity: O(count)
+        """
+        self.stamps.extend(array('I', [0]) * count)
+
+    def is_visited(self, index: int) -> bool:
+        """
+        Complexity:
+            Best Case Complexity: O(1)
+            Worst Case Complexity: O(1)
+        """
+        return self.stamps[index] == self.generation
+
+    def set_visited(self, index: int, visited: bool) -> None:
+        """
+        Complexity:
+            Best Case Complexity: O(1)
+            Worst Case Complexity: O(1)
+        """
+        self.stamps[index] = self.generation if visited else 0
+
+    def mark_seen(self, seen: bytearray) -> None:
+        """
+        Marks every cell with a non-zero entry in seen as visited.
+
+        Complexity:
+            Best Case Complexity: O(N) where N is the number of cells, scanning seen.
+            Worst Case Complexity: O(N) where N is the number of cells.
+        """
+        flags: bytearray = seen.translate(_SEEN_TO_FLAG)
+        stamps: array[int] = self.stamps
+        generation: int = self.generation
+        index: int = flags.find(1)
+        while index != -1:
+            stamps[index] = generation
+            index = flags.find(1, index + 1)
+
+    def clear_visited(self) -> None:
+        """
+        Complexity:
+            Best Case Complexity: O(1)
+            Worst Case Complexity: O(N) where N is the number of cells, once every
+            MAX_GENERATION clears when the counter wraps around and the stamps are zeroed.
+        """
+        if self.generation == VisitStamps.MAX_GENERATION:
+            self.stamps = array('I', [0]) * len(self.stamps)
+            self.generation = 0
+        self.generation += 1
+
+
+class VisitBitset:
+    """
+    Visited flags for every cell of a maze packed eight to a byte, for grids where memory
+    matters more than clearing time. It has the same methods as `VisitStamps`.
+    """
+
+    def __init__(self, size: int = 0) -> None:
+        """
+        Args:
+            size(int): Number of cells to track.
+
+        Complexity:
+            Best Case Complexity: O(N / 8) where N is size.
+            Worst Case Complexity: O(N / 8) where N is size.
+        """
+        self.bits: bytearray = bytearray((size + 7) >> 3)
+
+    def is_visited(self, index: int) -> bool:
+        """
+        Complexity:
+            Best Case Complexity: O(1)
+            Worst Case Complexity: O(1)
+        """
+        return bool(self.bits[index >> 3] & (1 << (index & 7)))
+
+    def set_visited(self, index: int, visited: bool) -> None:
+        """
+        Complexity:
+            Best Case Complexity: O(1)
+            Worst Case Complexity: O(1)
+        """
+        if visited:
+            self.bits[index >> 3] |= 1 << (index & 7)
+        else:
+            self.bits[index >> 3] &= ~(1 << (index & 7)) & 0xFF
+
+    def mark_seen(self, seen: bytearray) -> None:
+        """
+        Marks every cell with a non-zero entry in seen as visited.
+
+        Complexity:
+            Best Case Complexity: O(N) where N is the number of cells, scanning seen.
+            Worst Case Complexity: O(N) where N is the number of cells.
+        """
+        flags: bytearray = seen.translate(_SEEN_TO_FLAG)
+        bits: bytearray = self.bits
+        index: int = flags.find(1)
+        while index != -1:
+            bits[index >> 3] |= 1 << (index & 7)
+            index = flags.find(1, index + 1)
+
+    def clear_visited(self) -> None:
+        """
+        Complexity:
+            Best Case Complexity: O(N / 8) where N is the number of cells.
+            Worst Case Complexity: O(N / 8) where N is the number of cells.
+        """
+        self.bits[:] = bytes(len(self.bits))
+
+
 class MazeCell:
-    tile: str | Hollow
-    position: Position
-    visited: bool = False
+    """
+    One cell of a list backed maze grid. Its visited flag is not stored on the cell but in the
+    `VisitStamps` shared by the whole maze, at the cell's flat index, so the maze can clear every
+    flag at once. A cell created on its own gets a tracker of its own.
+
+    Cells have fixed slots rather than a __dict__ as a maze holds one per cell. The flat index is
+    worked out from the position and the width kept by the tracker rather than stored, so a cell
+    holds no int of its own. Setting the tile also sets `hollow`, the tile itself when it is a
+    Hollow and None otherwise, so path and treasure code can tell hollows apart without an
+    isinstance check.
+    """
+    __slots__ = ('_tile', 'hollow', 'position', 'visits')
+
+    def __init__(self, tile: str | Hollow, position: Position, visited: bool = False,
+                 visits: VisitStamps | None = None) -> None:
+        """
+        Args:
+            tile(str | Hollow): The tile in this cell.
+            position(Position): Where the cell is in the maze.
+            visited(bool): Whether the cell starts out visited.
+            visits(VisitStamps | None): The maze's visited flags, or None for a cell on its own.
+
+        Complexity:
+            Best Case Complexity: O(1)
+            Worst Case Complexity: O(1)
+        """
+        self._tile: str | Hollow = tile
+        self.hollow: Hollow | None = tile if isinstance(tile, Hollow) else None
+        self.position: Position = position
+        # A tracker of width 0 keeps the cell's flag at its column
+        self.visits: VisitStamps = visits if visits is not None else VisitStamps(position.col + 1)
+        if visited:
+            self.visits.set_visited(self.index, True)
+
+    @property
+    def index(self) -> int:
+        """
+        The flat index of the cell in visits.
+
+        Complexity:
+            Best Case Complexity: O(1)
+            Worst Case Complexity: O(1)
+        """
+        return self.position.row * self.visits.cols + self.position.col
+
+    @property
+    def tile(self) -> str | Hollow:
+        return self._tile
+
+    @tile.setter
+    def tile(self, tile: str | Hollow) -> None:
+        old_tile: str | Hollow = self._tile
+        self._tile = tile
+        self.hollow = tile if isinstance(tile, Hollow) else None
+        if self.visits.on_tile_change is not None:
+            self.visits.on_tile_change(self.index, old_tile, tile)
+
+    @property
+    def visited(self) -> bool:
+        # Read for every cell by the searches on cells, so the index is worked out inline
+        visits: VisitStamps = self.visits
+        position: Position = self.position
+        return visits.stamps[position.row * visits.cols + position.col] == visits.generation
+
+    @visited.setter
+    def visited(self, visited: bool) -> None:
+        self.visits.set_visited(self.index, visited)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, MazeCell) and (self.tile, self.position, self.visited) \
+            == (other.tile, other.position, other.visited)
+
+    def __str__(self) -> str:
+        return str(self.tile)
+
+    def __repr__(self) -> str:
+        return f"'{self.tile}'"
+
+
+class CompactGrid:
+    """
+    Array backed alternative to List[List[MazeCell]] for large mazes.
+
+    Each tile is stored as a single byte (the tile character, with empty cells stored as ' '),
+    visited flags are packed into a bitset and hollows are kept in a dictionary keyed by the
+    flat index row * cols + col, as only a small fraction of cells are hollows.
+
+    grid[row][col] hands out `CompactRow` / `CompactCell` views which are created on demand
+    and behave like a row of MazeCells, so code written against the list backed grid keeps working.
+    """
+
+    def __init__(self, rows: int, cols: int, tiles: bytearray | memoryview, hollows: dict[int, Hollow] | None = None) -> None:
+        """
+        Args:
+            rows(int): Number of rows in the maze.
+            cols(int): Number of columns in the maze.
+            tiles(bytearray | memoryview): rows * cols tile characters in row major order,
+                a writable memoryview when the tiles are memory mapped from a .mzb file.
+            hollows(dict[int, Hollow] | None): Hollows in the maze keyed by flat index.
+
+        Complexity:
+            Best Case Complexity: O(N) where N is the number of cells in the maze.
+            Worst Case Complexity: O(N) where N is the number of cells in the maze.
+        """
+        self.rows: int = rows
+        self.cols: int = cols
+        self.tiles: bytearray | memoryview = tiles
+        self.hollows: dict[int, Hollow] = {} if hollows is None else hollows
+        self.visits: VisitBitset = VisitBitset(rows * cols)
+        # Called with (index, old tile, new tile) by set_tile, see `VisitStamps`
+        self.on_tile_change: Callable[[int, str | Hollow, str | Hollow], None] | None = None
+
+    def get_tile(self, index: int) -> str | Hollow:
+        """
+        Complexity:
+            Best Case Complexity: O(1)
+            Worst Case Complexity: O(1)
+        """
+        hollow: Hollow | None = self.hollows.get(index)
+        return hollow if hollow is not None else chr(self.tiles[index])
+
+    def set_tile(self, index: int, tile: str | Hollow) -> None:
+        """
+        Complexity:
+            Best Case Complexity: O(1)
+            Worst Case Complexity: O(1)
+        """
+        old_tile: str | Hollow = self.get_tile(index)
+        if isinstance(tile, Hollow):
+            self.hollows[index] = tile
+            self.tiles[index] = ord(str(tile))
+        else:
+            self.hollows.pop(index, None)
+            self.tiles[index] = ord(tile)
+        if self.on_tile_change is not None:
+            self.on_tile_change(index, old_tile, tile)
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def __getitem__(self, row: int) -> CompactRow:
+        if not 0 <= row < self.rows:
+            raise IndexError(f"Row {row} is out of range")
+        return CompactRow(self, row)
+
+    def __iter__(self) -> Iterator[CompactRow]:
+        for row in range(self.rows):
+            yield CompactRow(self, row)
+
+
+class CompactRow:
+    """
+    A lazy view over one row of a `CompactGrid` or `ChunkedGrid`.
+    """
+    __slots__ = ('grid', 'row')
+
+    def __init__(self, grid: CompactGrid | ChunkedGrid, row: int) -> None:
+        self.grid: CompactGrid | ChunkedGrid = grid
+        self.row: int = row
+
+    def __len__(self) -> int:
+        return self.grid.cols
+
+    def __getitem__(self, col: int) -> CompactCell:
+        if not 0 <= col < self.grid.cols:
+            raise IndexError(f"Column {col} is out of range")
+        return CompactCell(self.grid, self.row * self.grid.cols + col)
+
+    def __iter__(self) -> Iterator[CompactCell]:
+        start: int = self.row * self.grid.cols
+        for index in range(start, start + self.grid.cols):
+            yield CompactCell(self.grid, index)
+
+    def __str__(self) -> str:
+        return str(list(self))
+
+    def __repr__(self) -> str:
+        return str(self)
+
+
+class CompactCell:
+    """
+    A lazy view over one cell of a `CompactGrid` or `ChunkedGrid`, it has the same tile, hollow, position and
+    visited attributes as a MazeCell but reads and writes them straight through to the grid arrays.
+    """
+    __slots__ = ('grid', 'index')
+
+    def __init__(self, grid: CompactGrid | ChunkedGrid, index: int) -> None:
+        self.grid: CompactGrid | ChunkedGrid = grid
+        self.index: int = index
+
+    @property
+    def tile(self) -> str | Hollow:
+        return self.grid.get_tile(self.index)
+
+    @tile.setter
+    def tile(self, tile: str | Hollow) -> None:
+        self.grid.set_tile(self.index, tile)
+
+    @property
+    def hollow(self) -> Hollow | None:
+        return self.grid.hollows.get(self.index)
+
+    @property
+    def position(self) -> Position:
+        return Position.unpack(self.index, self.grid.cols)
+
+    @property
+    def visited(self) -> bool:
+        return self.grid.visits.is_visited(self.index)
+
+    @visited.setter
+    def visited(self, visited: bool) -> None:
+        self.grid.visits.set_visited(self.index, visited)
 
     def __str__(self) -> str:
         return str(self.tile)
@@ -41,6 +441,163 @@ class MazeCell:
         return f"'{self.tile}'"
 
 
+class ChunkedGrid:
+    """
+    A grid for mazes too large to hold in memory, read from its file a chunk at a time.
+
+    The maze is split into chunk_size x chunk_size chunks of tile bytes (stored like a
+    `CompactGrid`, the chunks on the right and bottom edges are padded with walls). A chunk
+    is read from the text or .mzb file the first time one of its cells is looked at and kept
+    in a least recently used cache, the least recently used chunk is dropped once the cache
+    holds more than memory_budget bytes of tiles. Tiles changed with `set_tile` are kept
+    per chunk and put back whenever their chunk is read again.
+
+    Hollows and the visited bitset are kept for the whole maze as with a `CompactGrid` and
+    grid[row][col] hands out the same `CompactRow` / `CompactCell` views. Only the tiles are
+    chunked, see `Maze.load_chunked_maze` for what the searches still allocate per cell.
+
+    The file is opened when the first chunk is read and kept open until `close`.
+    """
+
+    def __init__(self, rows: int, cols: int, path: str, row_offsets: Sequence[int], hollows: dict[int, Hollow] | None = None,
+                 chunk_size: int = 256, memory_budget: int = 64 * 2 ** 20) -> None:
+        """
+        Args:
+            rows(int): Number of rows in the maze.
+            cols(int): Number of columns in the maze.
+            path(str): The text or .mzb file to read the tiles from.
+            row_offsets(Sequence[int]): Byte offset in the file of the first tile of each row.
+            hollows(dict[int, Hollow] | None): Hollows in the maze keyed by flat index.
+            chunk_size(int): Number of rows and columns in a chunk.
+            memory_budget(int): Most bytes of tiles to keep in memory, at least one chunk is always kept.
+
+        Complexity:
+            Best Case Complexity: O(N / 8) where N is the number of cells in the maze, the visited bitset.
+            Worst Case Complexity: O(N / 8)
+        """
+        self.rows: int = rows
+        self.cols: int = cols
+        self.path: str = path
+        self.row_offsets: Sequence[int] = row_offsets
+        self.hollows: dict[int, Hollow] = {} if hollows is None else hollows
+        self.visits: VisitBitset = VisitBitset(rows * cols)
+        self.chunk_size: int = chunk_size
+        self.max_chunks: int = max(1, memory_budget // (chunk_size * chunk_size))
+        self.chunks: OrderedDict[tuple[int, int], bytearray] = OrderedDict()
+        self.edits: dict[tuple[int, int], dict[int, int]] = {}
+        self.chunks_read: int = 0
+        self._file: BinaryIO | None = None
+        # Called with (index, old tile, new tile) by set_tile, see `VisitStamps`
+        self.on_tile_change: Callable[[int, str | Hollow, str | Hollow], None] | None = None
+
+    def _chunk(self, key: tuple[int, int]) -> bytearray:
+        """
+        The tile bytes of the chunk at (chunk row, chunk column), read from the file if they are not cached.
+
+        Complexity:
+            Best Case Complexity: O(1) when the chunk is cached.
+            Worst Case Complexity: O(S * S + D) where S is chunk_size and D the number of
+            tiles changed in the chunk, reading it from the file.
+        """
+        chunk: bytearray | None = self.chunks.get(key)
+        if chunk is not None:
+            self.chunks.move_to_end(key)
+            return chunk
+        if self._file is None:
+            self._file = open(self.path, 'rb')
+        size: int = self.chunk_size
+        first_row: int = key[0] * size
+        first_col: int = key[1] * size
+        width: int = min(size, self.cols - first_col)
+        chunk = bytearray(Tiles.WALL.value.encode()) * (size * size)
+        for k, row in enumerate(range(first_row, min(first_row + size, self.rows))):
+            self._file.seek(self.row_offsets[row] + first_col)
+            chunk[k * size:k * size + width] = self._file.read(width).translate(_EMPTY_TO_SPACE)
+        for offset, tile in self.edits.get(key, {}).items():
+            chunk[offset] = tile
+        self.chunks_read += 1
+        self.chunks[key] = chunk
+        if len(self.chunks) > self.max_chunks:
+            self.chunks.popitem(last=False)
+        return chunk
+
+    def _locate(self, index: int) -> tuple[tuple[int, int], int]:
+        """
+        The chunk holding a flat index and the offset of the cell inside it.
+
+        Complexity:
+            Best Case Complexity: O(1)
+            Worst Case Complexity: O(1)
+        """
+        row, col = divmod(index, self.cols)
+        chunk_row, row_offset = divmod(row, self.chunk_size)
+        chunk_col, col_offset = divmod(col, self.chunk_size)
+        return (chunk_row, chunk_col), row_offset * self.chunk_size + col_offset
+
+    def tile_byte(self, index: int) -> int:
+        """
+        Complexity:
+            Best Case Complexity: O(1) when the chunk is cached.
+            Worst Case Complexity: O(_chunk)
+        """
+        key, offset = self._locate(index)
+        return self._chunk(key)[offset]
+
+    def is_open(self, index: int) -> bool:
+        """
+        Complexity:
+            Best Case Complexity: O(1) when the chunk is cached.
+            Worst Case Complexity: O(_chunk)
+        """
+        return self.tile_byte(index) != _WALL_BYTE
+
+    def get_tile(self, index: int) -> str | Hollow:
+        """
+        Complexity:
+            Best Case Complexity: O(1) when the chunk is cached.
+            Worst Case Complexity: O(_chunk)
+        """
+        hollow: Hollow | None = self.hollows.get(index)
+        return hollow if hollow is not None else chr(self.tile_byte(index))
+
+    def set_tile(self, index: int, tile: str | Hollow) -> None:
+        """
+        Complexity:
+            Best Case Complexity: O(1) when the chunk is cached.
+            Worst Case Complexity: O(_chunk)
+        """
+        old_tile: str | Hollow = self.get_tile(index)
+        if isinstance(tile, Hollow):
+            self.hollows[index] = tile
+        else:
+            self.hollows.pop(index, None)
+        key, offset = self._locate(index)
+        self._chunk(key)[offset] = ord(str(tile))
+        self.edits.setdefault(key, {})[offset] = ord(str(tile))
+        if self.on_tile_change is not None:
+            self.on_tile_change(index, old_tile, tile)
+
+    def close(self) -> None:
+        """
+        Closes the file the chunks are read from, it is opened again if another chunk is needed.
+        """
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def __getitem__(self, row: int) -> CompactRow:
+        if not 0 <= row < self.rows:
+            raise IndexError(f"Row {row} is out of range")
+        return CompactRow(self, row)
+
+    def __iter__(self) -> Iterator[CompactRow]:
+        for row in range(self.rows):
+            yield CompactRow(self, row)
+
+
 class Maze:
     directions: dict[Directions, Tuple[int, int]] = {
         Directions.UP: (-1, 0),
@@ -49,7 +606,7 @@ class Maze:
         Directions.RIGHT: (0, 1),
     }
 
-    def __init__(self, start_position: Position, end_positions: List[Position], walls: List[Position], hollows: List[tuple[Hollow, Position]], rows: int, cols: int) -> None:
+    def __init__(self, start_position: Position, end_positions: List[Position], walls: List[Position], hollows: List[tuple[Hollow, Position]], rows: int, cols: int, grid: List[List[MazeCell]] | CompactGrid | ChunkedGrid | None = None, visits: VisitStamps | None = None) -> None:
         """
         Constructs the maze you should never be interacting with this method.
         Please take a look at `load_maze_from_file` & `sample1`
@@ -61,16 +618,39 @@ class Maze:
             hollows(List[Position]): Hollows in the maze.
             rows(int): Number of rows in the maze.
             cols(int): Number of columns in the maze.
+            grid(List[List[MazeCell]] | CompactGrid | ChunkedGrid | None): An already built grid, used instead of
+                `_create_grid` when the loader has built the cells itself.
+            visits(VisitStamps | None): The visited flags shared by the cells of a list backed grid,
+                a new one is made when None. A `CompactGrid` or `ChunkedGrid` brings its own.
 
         Complexity:
-            Best Case Complexity: O(_create_grid)
+            Best Case Complexity: O(1) when grid and visits are given.
             Worst Case Complexity: O(_create_grid)
         """
         self.start_position: Position = start_position
         self.end_positions: List[Position] = end_positions
         self.rows: int = rows
         self.cols: int = cols
-        self.grid: List[List[MazeCell]] = self._create_grid(walls, hollows, end_positions)
+        self.visits: VisitStamps | VisitBitset
+        if isinstance(grid, (CompactGrid, ChunkedGrid)):
+            self.visits = grid.visits
+        else:
+            self.visits = visits if visits is not None else VisitStamps(rows * cols, cols)
+        self.grid: List[List[MazeCell]] | CompactGrid | ChunkedGrid = grid if grid is not None else self._create_grid(walls, hollows, end_positions)
+        self._layout: GridLayout | None = None
+        self._exit_distances: array[int] | None = None
+        self._components: ComponentIndex | None = None
+        self._exit_components: set[int] = set()
+        self._clusters: ClusterGraph | None = None
+        self.adjacency_enabled: bool = False
+        self.layout_version: int = 0
+        self.nodes_expanded: int = 0
+        self._positions: dict[int, Position] = {}
+        # Tiles set on the grid directly must still reach the caches below, see `_tile_changed`
+        if isinstance(self.grid, (CompactGrid, ChunkedGrid)):
+            self.grid.on_tile_change = self._tile_changed
+        else:
+            self.visits.on_tile_change = self._tile_changed
 
     def _create_grid(self, walls: List[Position], hollows: List[(Hollow, Position)], end_positions: List[Position]) -> List[List[MazeCell]]:
         """
@@ -86,10 +666,11 @@ class Maze:
             Best Case Complexity: O(N) where N is the number of cells in the maze.
             Worst Case Complexity: O(N) where N is the number of cells in the maze.
         """
-        grid: List[List[MazeCell]] = [[MazeCell(' ', Position(i, j))
-                                       for j in range(self.cols)] for i in range(self.rows)]
-        grid[self.start_position.row][self.start_position.col] = MazeCell(
-            Tiles.START_POSITION.value, self.start_position)
+        # One int object per column shared by every row, the positions are the ones `position_at` hands out
+        columns: List[int] = list(range(self.cols))
+        grid: List[List[MazeCell]] = [[MazeCell(' ', Position(i, j), visits=self.visits)
+                                       for j in columns] for i in range(self.rows)]
+        grid[self.start_position.row][self.start_position.col].tile = Tiles.START_POSITION.value
         for wall in walls:
             grid[wall.row][wall.col].tile = Tiles.WALL.value
         for hollow, pos in hollows:
@@ -99,40 +680,58 @@ class Maze:
         return grid
 
     @staticmethod
-    def validate_maze_file(maze_name: str) -> None:
+    def _stream_maze_rows(maze_name: str, tile_count: dict[str, int], row_offsets: array[int] | None = None) -> Iterator[str]:
         """
-        Mazes must have the following:
-        - A start position (P)
-        - At least one exit (E)
-        - All rows must have the same number of columns
-        - Tiles are representations can be found in config.py
-        - At least one treasure
+        Streams the stripped rows of a maze file one at a time, counting every tile
+        into tile_count and checking each row has the same number of columns as the first.
+        Only the current line is held in memory, the file object does the buffering.
 
         Args:
             maze_name(str): The name of the maze.
+            tile_count(dict[str, int]): Running count of each tile seen so far, updated in place.
+            row_offsets(array[int] | None): If given, the byte offset in the file of the first
+                tile of each row is appended to it.
 
         Raises:
-            ValueError: If maze_name is invalid.
+            ValueError: If the rows of the maze have uneven columns.
 
         Complexity:
             Best Case Complexity: O(N) where N is the number of cells in the maze.
             Worst Case Complexity: O(N) where N is the number of cells in the maze.
-
-            Assuming dictionary operations can be done on O(1) time.
         """
-        tile_count: dict[str, int] = {}
-        with open(f"./mazes/{maze_name}", 'r') as f:
-            lines: List[str] = f.readlines()
-            cols: int = len(lines[0].strip())
-            for line in lines:
-                if len(line.strip()) != cols:
+        cols: int | None = None
+        position: int = 0
+        with open(f"./mazes/{maze_name}", 'rb') as f:
+            for line in f:
+                if row_offsets is not None:
+                    row_offsets.append(position + len(line) - len(line.lstrip()))
+                position += len(line)
+                row: str = line.strip().decode()
+                if cols is None:
+                    cols = len(row)
+                elif len(row) != cols:
                     raise ValueError(f"Uneven columns in {maze_name} ensure all rows have the same number of columns")
-                # Check tiles
-                for tile in line.strip():
-                    if tile not in tile_count:
-                        tile_count[tile] = 1
-                    else:
-                        tile_count[tile] += 1
+                # str.count runs in C, only the handful of distinct tiles are looped over in python
+                for tile in set(row):
+                    tile_count[tile] = tile_count.get(tile, 0) + row.count(tile)
+                yield row
+
+    @staticmethod
+    def _validate_tile_count(maze_name: str, tile_count: dict[str, int]) -> None:
+        """
+        Runs the whole-maze checks of `validate_maze_file` once every tile has been counted.
+
+        Args:
+            maze_name(str): The name of the maze.
+            tile_count(dict[str, int]): The number of times each tile appears in the maze.
+
+        Raises:
+            ValueError: If the tiles do not make up a valid maze.
+
+        Complexity:
+            Best Case Complexity: O(1)
+            Worst Case Complexity: O(T) where T is the number of distinct tiles in the maze.
+        """
         if 'P' not in tile_count or 'E' not in tile_count:
             raise ValueError(f"Missing start or end position in {maze_name}")
 
@@ -148,82 +747,405 @@ class Maze:
         if invalid_tiles:
             raise ValueError(f"Invalid tile(s) found in {maze_name} ({invalid_tiles})")
 
+    @staticmethod
+    def validate_maze_file(maze_name: str) -> None:
+        """
+        Mazes must have the following:
+        - A start position (P)
+        - At least one exit (E)
+        - All rows must have the same number of columns
+        - Tiles are representations can be found in config.py
+        - At least one treasure
+
+        Args:
+            maze_name(str): The name of the maze.
+
+        Raises:
+            ValueError: If maze_name is invalid.
+
+        Complexity:
+            Best Case Complexity: O(N) where N is the number of cells in the maze.
+            Worst Case Complexity: O(N) where N is the number of cells in the maze.
+
+            Assuming dictionary operations can be done on O(1) time.
+        """
+        tile_count: dict[str, int] = {}
+        for _ in Maze._stream_maze_rows(maze_name, tile_count):
+            pass
+        Maze._validate_tile_count(maze_name, tile_count)
+
     @classmethod
-    def load_maze_from_file(cls, maze_name: str) -> Maze:
+    def load_maze_from_file(cls, maze_name: str, compact: bool = False) -> Maze:
         """
+        Validates and builds the maze in a single streaming pass over the file,
+        the grid rows are created as each line is read rather than collecting
+        the walls, exits and hollows first.
+
         Args:
             maze_name(str): The maze name to load the maze from.
+            compact(bool): Store the grid as a `CompactGrid` instead of List[List[MazeCell]].
+                Names ending in .mzb are always memory mapped onto a `CompactGrid`, see `convert_to_mzb`.
 
         Return:
             Maze: The newly created maze instance.
 
+        Raises:
+            ValueError: If maze_name is invalid, see `validate_maze_file`.
+
         Complexity:
             Best Case Complexity: O(N) where N is the number of cells in the maze.
             Worst Case Complexity: O(N) where N is the number of cells in the maze.
 
-            For small mazes we assume the lists we not need to resize.
+            Memory apart from the grid is O(C + E) where C is the number of columns
+            and E is the number of exits.
+
+            A .mzb maze only costs O(E + H) where H is the number of hollows, see `_load_binary_maze`.
         """
-        cls.validate_maze_file(maze_name)
-        end_positions, walls, hollows = [], [], []
+        if maze_name.endswith(MZB_SUFFIX):
+            return cls._load_binary_maze(maze_name)
+        if compact:
+            return cls._load_compact_maze(maze_name)
+        tile_count: dict[str, int] = {}
+        end_positions: List[Position] = []
+        grid: List[List[MazeCell]] = []
+        visits: VisitStamps = VisitStamps()
         mystical_hollow: MysticalHollow = MysticalHollow()
         start_position: Position | None = None
-        with open(f"./mazes/{maze_name}", 'r') as f:
-            lines: List[str] = f.readlines()
-            rows: int = len(lines)
-            cols: int = len(lines[0].strip())
-            for i, line in enumerate(lines):
-                for j, tile in enumerate(line.strip()):
-                    if tile == Tiles.START_POSITION.value:
-                        start_position: Position = Position(i, j)
-                    elif tile == Tiles.EXIT.value:
-                        end_positions.append(Position(i, j))
-                    elif tile == Tiles.WALL.value:
-                        walls.append(Position(i, j))
-                    elif tile == Tiles.SPOOKY_HOLLOW.value:
-                        hollows.append((SpookyHollow(), Position(i, j)))
-                    elif tile == Tiles.MYSTICAL_HOLLOW.value:
-                        hollows.append((mystical_hollow, Position(i, j)))
+        # One int object per column shared by every row, the positions are the ones `position_at` hands out
+        columns: List[int] = []
+        for i, line in enumerate(cls._stream_maze_rows(maze_name, tile_count)):
+            row: List[MazeCell] = [None] * len(line)
+            visits.grow(len(line))
+            if i == 0:
+                visits.cols = len(line)
+            if len(columns) < len(line):
+                columns.extend(range(len(columns), len(line)))
+            for j, tile in zip(columns, line):
+                position: Position = Position(i, j)
+                if tile == Tiles.START_POSITION.value:
+                    start_position = position
+                    row[j] = MazeCell(Tiles.START_POSITION.value, position, visits=visits)
+                elif tile == Tiles.EXIT.value:
+                    end_positions.append(position)
+                    row[j] = MazeCell(Tiles.EXIT.value, position, visits=visits)
+                elif tile == Tiles.WALL.value:
+                    row[j] = MazeCell(Tiles.WALL.value, position, visits=visits)
+                elif tile == Tiles.SPOOKY_HOLLOW.value:
+                    row[j] = MazeCell(SpookyHollow(), position, visits=visits)
+                elif tile == Tiles.MYSTICAL_HOLLOW.value:
+                    row[j] = MazeCell(mystical_hollow, position, visits=visits)
+                else:
+                    row[j] = MazeCell(' ', position, visits=visits)
+            grid.append(row)
+        cls._validate_tile_count(maze_name, tile_count)
         assert start_position is not None
-        return Maze(start_position, end_positions, walls, hollows, rows, cols)
+        return Maze(start_position, end_positions, [], [], len(grid), len(grid[0]), grid=grid, visits=visits)
 
-    def is_valid_position(self, position: Position) -> bool:
+    @staticmethod
+    def _find_tiles(line: str, tile: str) -> Iterator[int]:
         """
-        Checks if the position is within the maze and not blocked by a wall.
-
-        Args:
-            position (Position): The position to check.
-
-        Returns:
-            bool - True if the position is within the maze and not blocked by a wall.
+        Yields the column of every occurrence of tile in line, left to right.
 
         Complexity:
-            Best Case Complexity: TODO
-            Worst Case Complexity: TODO
+            Best Case Complexity: O(C) where C is the length of the line.
+            Worst Case Complexity: O(C) where C is the length of the line.
         """
-        raise NotImplementedError
+        col: int = line.find(tile)
+        while col != -1:
+            yield col
+            col = line.find(tile, col + 1)
 
-    def get_available_positions(self, current_position: Position) -> List[Position]:
+    @classmethod
+    def _scan_compact_rows(cls, maze_name: str, tiles: bytearray | None = None,
+                           row_offsets: array[int] | None = None) -> tuple[int, int, int, List[int], List[int]]:
         """
-        Returns a list of all the new possible you can move to from your current position.
+        Reads a text maze into `CompactGrid` tile bytes. Each row is copied into the tile array
+        as bytes, only the start, exits and hollows are looked at one by one.
 
         Args:
-            current_position (Position): Your current position.
+            maze_name(str): The maze name to read.
+            tiles(bytearray | None): The tile bytes are appended to it if given.
+            row_offsets(array[int] | None): The byte offset of each row is appended to it if given.
 
-        Returns:
-            List[Position] - A list of all the new possible you can move to from your current position.
+        Return:
+            tuple: rows, cols and the flat indices of the start, the exits and the hollows.
+            Exits are in row major order, hollows are in row order with the spooky hollows of a row first.
+
+        Raises:
+            ValueError: If maze_name is invalid, see `validate_maze_file`.
+
+        Complexity:
+            Best Case Complexity: O(N) where N is the number of cells in the maze.
+            Worst Case Complexity: O(N) where N is the number of cells in the maze.
+
+            The O(N) work is done by str / bytearray methods, python only loops over
+            the O(E + H) exits and hollows.
+        """
+        empty_to_space: dict[int, int] = str.maketrans(Tiles.EMPTY.value, ' ')
+        tile_count: dict[str, int] = {}
+        hollows: List[int] = []
+        exits: List[int] = []
+        start: int = -1
+        rows: int = 0
+        cols: int = 0
+        for line in cls._stream_maze_rows(maze_name, tile_count, row_offsets):
+            cols = len(line)
+            offset: int = rows * cols
+            if tiles is not None:
+                # Invalid tiles are reported by _validate_tile_count, just keep a placeholder byte for now
+                tiles += line.translate(empty_to_space).encode('ascii', errors='replace')
+            rows += 1
+            for j in cls._find_tiles(line, Tiles.START_POSITION.value):
+                start = offset + j
+            for j in cls._find_tiles(line, Tiles.EXIT.value):
+                exits.append(offset + j)
+            for j in cls._find_tiles(line, Tiles.SPOOKY_HOLLOW.value):
+                hollows.append(offset + j)
+            for j in cls._find_tiles(line, Tiles.MYSTICAL_HOLLOW.value):
+                hollows.append(offset + j)
+        cls._validate_tile_count(maze_name, tile_count)
+        return rows, cols, start, exits, hollows
+
+    @staticmethod
+    def _create_hollows(tiles: Callable[[int], int], indices: Sequence[int]) -> dict[int, Hollow]:
+        """
+        Creates the hollows of a `CompactGrid` keyed by flat index, tiles gives the tile byte at
+        a flat index. The mystical hollow is created first and shared, then only spooky hollows
+        generate treasures, in the order of indices.
+
+        Complexity:
+            Best Case Complexity: O(H * SpookyHollow()) where H is the number of hollows.
+            Worst Case Complexity: O(H * SpookyHollow())
+        """
+        spooky: int = ord(Tiles.SPOOKY_HOLLOW.value)
+        mystical_hollow: MysticalHollow = MysticalHollow()
+        hollows: dict[int, Hollow] = {}
+        for index in indices:
+            hollows[index] = SpookyHollow() if tiles(index) == spooky else mystical_hollow
+        return hollows
+
+    @classmethod
+    def _load_compact_maze(cls, maze_name: str) -> Maze:
+        """
+        The `CompactGrid` version of `load_maze_from_file`, see `_scan_compact_rows`.
+
+        Args:
+            maze_name(str): The maze name to load the maze from.
+
+        Return:
+            Maze: The newly created maze instance.
+
+        Raises:
+            ValueError: If maze_name is invalid, see `validate_maze_file`.
+
+        Complexity:
+            Best Case Complexity: O(N) where N is the number of cells in the maze.
+            Worst Case Complexity: O(N) where N is the number of cells in the maze.
+        """
+        tiles: bytearray = bytearray()
+        rows, cols, start, exits, hollow_indices = cls._scan_compact_rows(maze_name, tiles)
+        # Spooky hollows sit before mystical ones within a row, so they are still created in row major order
+        hollows: dict[int, Hollow] = cls._create_hollows(tiles.__getitem__, hollow_indices)
+        return Maze(Position.unpack(start, cols), [Position.unpack(index, cols) for index in exits],
+                    [], [], rows, cols, grid=CompactGrid(rows, cols, tiles, hollows))
+
+    @classmethod
+    def _load_binary_maze(cls, maze_name: str) -> Maze:
+        """
+        The .mzb version of `load_maze_from_file`. The file is memory mapped and its tiles are
+        wrapped by a `CompactGrid` without being parsed, see `maze_binary.read_mzb`.
+
+        Args:
+            maze_name(str): The .mzb maze name to load the maze from.
+
+        Return:
+            Maze: The newly created maze instance.
+
+        Raises:
+            ValueError: If maze_name is not a .mzb file.
+
+        Complexity:
+            Best Case Complexity: O(E + H * SpookyHollow()) where E is the number of exits and H the number of hollows.
+            Worst Case Complexity: O(E + H * SpookyHollow())
+        """
+        mzb: MzbMaze = read_mzb(f"./mazes/{maze_name}")
+        hollows: dict[int, Hollow] = cls._create_hollows(mzb.tiles.__getitem__, mzb.hollows)
+        cols: int = mzb.cols
+        return Maze(Position.unpack(mzb.start, cols), [Position.unpack(index, cols) for index in mzb.exits],
+                    [], [], mzb.rows, cols, grid=CompactGrid(mzb.rows, cols, mzb.tiles, hollows))
+
+    @classmethod
+    def convert_to_mzb(cls, maze_name: str, mzb_name: str | None = None) -> str:
+        """
+        Validates a text maze and saves it in the .mzb binary format, see `maze_binary`.
+        The file is written next to the text maze unless mzb_name says otherwise and
+        only replaces an existing file once it has been fully written.
+
+        Args:
+            maze_name(str): The text maze to convert.
+            mzb_name(str | None): Where to save it, relative to the mazes directory.
+                Defaults to maze_name with its extension changed to .mzb.
+
+        Return:
+            str: The name to pass to `load_maze_from_file`.
+
+        Raises:
+            ValueError: If maze_name is invalid, see `validate_maze_file`.
+
+        Complexity:
+            Best Case Complexity: O(N) where N is the number of cells in the maze.
+            Worst Case Complexity: O(N) where N is the number of cells in the maze.
+        """
+        if mzb_name is None:
+            mzb_name = os.path.splitext(maze_name)[0] + MZB_SUFFIX
+        tiles: bytearray = bytearray()
+        rows, cols, start, exits, hollows = cls._scan_compact_rows(maze_name, tiles)
+        path: str = f"./mazes/{mzb_name}"
+        with open(path + ".tmp", 'wb') as f:
+            write_mzb(f, rows, cols, start, exits, hollows, tiles)
+        os.replace(path + ".tmp", path)
+        return mzb_name
+
+    @classmethod
+    def load_chunked_maze(cls, maze_name: str, chunk_size: int = 256, memory_budget: int = 64 * 2 ** 20) -> Maze:
+        """
+        Loads a text or .mzb maze onto a `ChunkedGrid`, so its tiles are only read from the
+        file a chunk at a time as the maze is searched and never all held in memory at once.
+        The file stays open between chunks, so `close` the maze or use it in a with block.
+
+        Only the tile storage is chunked. The visited bitset takes N / 8 bytes for the whole maze.
+        BFS walks the cells and only keeps the ones it reaches, but the other strategies,
+        `exit_distances`, `component_index` and `cluster_graph` all allocate a few bytes per cell
+        of the whole maze while they run or for as long as they are cached.
+
+        A text maze is still streamed once to be validated and to find the start, exits, hollows
+        and where each row starts in the file. A .mzb maze only has its header read.
+
+        Args:
+            maze_name(str): The maze name to load the maze from.
+            chunk_size(int): Number of rows and columns in a chunk.
+            memory_budget(int): Most bytes of tiles to keep in memory.
+
+        Return:
+            Maze: The newly created maze instance.
+
+        Raises:
+            ValueError: If maze_name is invalid, see `validate_maze_file`.
+
+        Complexity:
+            Best Case Complexity: O(E + H * SpookyHollow()) for a .mzb maze, where E is the number
+            of exits and H the number of hollows.
+            Worst Case Complexity: O(N) where N is the number of cells in the maze, for a text maze.
+        """
+        path: str = f"./mazes/{maze_name}"
+        rows: int
+        cols: int
+        start: int
+        exits: Sequence[int]
+        hollow_indices: Sequence[int]
+        row_offsets: Sequence[int]
+        if maze_name.endswith(MZB_SUFFIX):
+            with open(path, 'rb') as f:
+                mzb: MzbMaze = read_mzb_index(f, path)
+            rows, cols, start, exits, hollow_indices = mzb.rows, mzb.cols, mzb.start, mzb.exits, mzb.hollows
+            row_offsets = MzbMaze.row_offsets(rows, cols)
+        else:
+            row_offsets = array('q')
+            rows, cols, start, exits, hollow_indices = cls._scan_compact_rows(maze_name, row_offsets=row_offsets)
+        grid: ChunkedGrid = ChunkedGrid(rows, cols, path, row_offsets, chunk_size=chunk_size, memory_budget=memory_budget)
+        try:
+            grid.hollows = cls._create_hollows(grid.tile_byte, hollow_indices)
+        except BaseException:
+            grid.close()
+            raise
+        return Maze(Position.unpack(start, cols), [Position.unpack(index, cols) for index in exits],
+                    [], [], rows, cols, grid=grid)
+
+    def is_valid_position(self, position: Position) -> bool:
+        """
+        Checks if the position is within the maze and not blocked by a wall.
+
+        Args:
+            position (Position): The position to check.
+
+        Returns:
+            bool - True if the position is within the maze and not blocked by a wall.
 
         Complexity:
-            Best Case Complexity: TODO
-            Worst Case Complexity: TODO
+            Best Case Complexity: O(1)
+            Worst Case Complexity: O(1)
+        """
+        return 0 <= position.row < self.rows and 0 <= position.col < self.cols \
+            and self.grid[position.row][position.col].tile != Tiles.WALL.value
+
+    def get_available_positions(self, current_position: Position) -> List[Position]:
         """
+        Returns a list of all the new possible you can move to from your current position.
 
-        raise NotImplementedError
+        Args:
+            current_position (Position): Your current position.
+
+        Returns:
+            List[Position] - A list of all the new possible you can move to from your current position.
+
+        Once `build_adjacency_index` has been called the open neighbours are read from the
+        index instead of checking all four directions with `is_valid_position`, the index is
+        rebuilt on the next call after the walls change.
+
+        Complexity:
+            Best Case Complexity: O(1)
+            Worst Case Complexity: O(1)
+            There are only ever four directions to check.
+        """
+        available: List[Position] = []
+        # A wall edit drops the index, it is rebuilt here so the search does not stay on the slow path
+        layout: GridLayout | None = self._search_layout() if self.adjacency_enabled else self._layout
+        if isinstance(layout, AdjacencyIndex) and 0 <= current_position.row < self.rows \
+                and 0 <= current_position.col < self.cols \
+                and layout.open_cells[self._index_of(current_position)]:
+            for index in layout.neighbours(self._index_of(current_position)):
+                if not self.visits.is_visited(index):
+                    available.append(self.position_at(index))
+            return available
+        for row_offset, col_offset in Maze.directions.values():
+            row: int = current_position.row + row_offset
+            col: int = current_position.col + col_offset
+            if not (0 <= row < self.rows and 0 <= col < self.cols):
+                continue
+            position: Position = self.position_at(row * self.cols + col)
+            if self.is_valid_position(position) and not self.visits.is_visited(row * self.cols + col):
+                available.append(position)
+        return available
 
-    def find_way_out(self) -> List[Position] | None:
+    def find_way_out(self, strategy: SearchStrategy = SearchStrategy.BFS, use_components: bool = False) -> List[Position] | None:
         """
         Finds a way out of the maze in some cases there may be multiple exits
         or no exits at all.
 
+        Every cell the search reaches is marked as visited, the visited flags are
+        cleared before the search starts, see `clear_visited`. The number of cells the search expanded
+        is left in `nodes_expanded` so strategies can be compared.
+
+        Args:
+            strategy (SearchStrategy): Which search to run, see `pathfinding.SearchStrategy`.
+                BFS searches outwards from the start using the maze cells.
+                BIDIRECTIONAL_BFS searches from the start and from every exit at once on flat arrays,
+                it stops as soon as either side runs out of cells so it does not visit the whole maze
+                when there is no way out.
+                A_STAR searches from the start on flat arrays guided by the Manhattan distance
+                to the nearest exit, in open mazes it expands little more than the path itself.
+                DFS searches depth first from the start on flat arrays with an explicit stack,
+                it is safe on very long corridors but the path may not be the shortest.
+                DISTANCE_FIELD walks down the cached `exit_distances`, so once the field has been
+                built every later call, from whatever start_position is set, only costs the length of the path.
+                JUMP_POINT is A* over jump points, it runs straight along corridors and open rooms without
+                queueing the cells on the way and only stops where the path may have to turn, the straight
+                runs are filled back in so the path is a shortest path like BFS's.
+                HIERARCHICAL searches the cached `cluster_graph` and fills the path in one cluster at a time,
+                for many queries on one large maze. The path may be a few steps longer than the shortest.
+            use_components (bool): Check `can_exit` first and give up straight away when no exit is in the
+                start position's component, without searching or marking any cell as visited.
+
         Returns:
             List[Position]: If there is a way out of the maze, 
             the path will be made up of the coordinates starting at 
@@ -232,11 +1154,562 @@ class Maze:
             None: Unable to find a path to the exit, simply return None.
 
         Complexity:
-            Best Case Complexity: TODO
-            Worst Case Complexity: TODO
+            Best Case Complexity: O(1) when an exit is next to the start position and the search is BFS.
+            Worst Case Complexity: O(N) where N is the number of cells in the maze, every cell is reached once.
+        """
+        self.clear_visited()
+        if use_components and not self.can_exit():
+            self.nodes_expanded = 0
+            return None
+        if strategy == SearchStrategy.BFS:
+            return self._breadth_first_way_out()
+        if strategy == SearchStrategy.DISTANCE_FIELD:
+            return self._distance_field_way_out()
+        if strategy == SearchStrategy.HIERARCHICAL:
+            return self._hierarchical_way_out()
+        return self._flat_way_out(FLAT_SEARCHES[strategy](
+            self._search_layout(), self._index_of(self.start_position),
+            [self._index_of(end_position) for end_position in self.end_positions]))
+
+    def find_ways_out(self, k: int | None = None, backpack_capacity: int | None = None) -> List[List[Position]]:
+        """
+        The shortest path to every exit that can be reached, all from one breadth first search
+        whose parent pointers are shared by the paths. Each exit in end_positions gets one path.
+
+        Every cell the search reaches is marked as visited, as with `find_way_out`, and the number
+        of cells expanded is left in `nodes_expanded`.
+
+        Args:
+            k (int | None): Only return the first k paths. When ranking by length the search stops
+                as soon as the k nearest exits have been reached.
+            backpack_capacity (int | None): Rank by the total value `take_treasures` would collect along
+                each path with this capacity, highest first and shorter first on ties. The treasures are
+                worked out from each hollow's `treasure_order`, so the maze keeps all of its treasures.
+                When None the paths are ranked by length, shortest first, paths of equal length in the
+                order the search reached their exits.
+
+        Returns:
+            List[List[Position]]: The ranked paths, each from the start position to an exit.
+            Empty if no exit can be reached.
+
+        Complexity:
+            Best Case Complexity: O(N) where N is the number of cells in the maze, when the k nearest exits
+            are next to the start position.
+            Worst Case Complexity: O(N + E * L + E * T) where E is the number of exits, L the length of the
+            longest path and T the cost of `_treasure_value` on one path.
+        """
+        self.clear_visited()
+        exits: List[int] = [self._index_of(end_position) for end_position in self.end_positions]
+        tree: ExitTree = exit_search_tree(self._search_layout(), self._index_of(self.start_position), exits,
+                                          k if backpack_capacity is None else None)
+        self.nodes_expanded = tree.expanded
+        self.visits.mark_seen(tree.seen)
+        paths: List[List[Position]] = [[self.position_at(index) for index in tree.path_to(exit_index)]
+                                       for exit_index in tree.exits]
+        if backpack_capacity is not None:
+            orders: dict[int, List[Treasure]] = {}
+            values: List[int] = [self._treasure_value(path, backpack_capacity, orders) for path in paths]
+            order: List[int] = sorted(range(len(paths)), key=lambda i: (-values[i], len(paths[i]), i))
+            paths = [paths[i] for i in order]
+        return paths if k is None else paths[:k]
+
+    def _treasure_value(self, path: List[Position], backpack_capacity: int, orders: dict[int, List[Treasure]]) -> int:
+        """
+        The total value `take_treasures` would collect along path, without taking anything. Each hollow's
+        `treasure_order` is read once and cached in orders by id, so a mystical hollow met twice is still
+        one shared hollow. From each hollow `route_planner.pick_treasure` finds the treasure
+        `get_optimal_treasure` would hand out.
+
+        Complexity:
+            Best Case Complexity: O(L) where L is the length of the path, when none of the cells are hollows.
+            Worst Case Complexity: O(L * T + H * treasure_order) where T is the most treasures in one hollow
+            and H the number of hollows on the path.
+        """
+        value: int = 0
+        taken: set[int] = set()
+        for position in path:
+            hollow: Hollow | None = self.grid[position.row][position.col].hollow
+            if hollow is None:
+                continue
+            if id(hollow) not in orders:
+                orders[id(hollow)] = hollow.treasure_order()
+            treasure: Treasure | None = pick_treasure(orders[id(hollow)], backpack_capacity, taken)
+            if treasure is not None:
+                taken.add(id(treasure))
+                value += treasure.value
+                backpack_capacity -= treasure.weight
+        return value
+
+    def _breadth_first_way_out(self) -> List[Position] | None:
+        """
+        Breadth first search from the start position. Each queue entry is a (position, previous entry)
+        pair so the path is only rebuilt once an exit is found instead of being copied at every step.
+
+        Complexity:
+            Best Case Complexity: O(1) when an exit is next to the start position.
+            Worst Case Complexity: O(N) where N is the number of cells in the maze.
+        """
+        queue: LinkedQueue[tuple[Position, tuple | None]] = LinkedQueue()
+        self.visits.set_visited(self._index_of(self.start_position), True)
+        queue.append((self.start_position, None))
+        self.nodes_expanded = 0
+        while not queue.is_empty():
+            entry: tuple[Position, tuple | None] = queue.serve()
+            self.nodes_expanded += 1
+            position: Position = entry[0]
+            if self.grid[position.row][position.col].tile == Tiles.EXIT.value:
+                path: List[Position] = []
+                while entry is not None:
+                    path.append(entry[0])
+                    entry = entry[1]
+                path.reverse()
+                return path
+            for next_position in self.get_available_positions(position):
+                self.visits.set_visited(self._index_of(next_position), True)
+                queue.append((next_position, entry))
+        return None
+
+    def _distance_field_way_out(self) -> List[Position] | None:
+        """
+        Follows `exit_distances` down from the start position, marking the path as visited.
+
+        Complexity:
+            Best Case Complexity: O(L) where L is the length of the path, once the distance field is cached.
+            Worst Case Complexity: O(N) where N is the number of cells in the maze, building the distance field.
+        """
+        distances: array[int] = self.exit_distances()
+        path: List[int] | None = descend_distance_field(self._search_layout(), distances, self._index_of(self.start_position))
+        if path is None:
+            self.nodes_expanded = 0
+            return None
+        self.nodes_expanded = len(path)
+        for index in path:
+            self.visits.set_visited(index, True)
+        return [self.position_at(index) for index in path]
+
+    def _hierarchical_way_out(self) -> List[Position] | None:
+        """
+        Searches `cluster_graph` from the start position, marking the path as visited.
+        nodes_expanded counts the abstract nodes expanded.
+
+        Complexity:
+            Best Case Complexity: O(ClusterGraph.search) once the clusters around the path have been built.
+            Worst Case Complexity: O(ClusterGraph.search)
+        """
+        path: List[int] | None
+        path, self.nodes_expanded = self.cluster_graph().search(self._index_of(self.start_position))
+        if path is None:
+            return None
+        for index in path:
+            self.visits.set_visited(index, True)
+        return [self.position_at(index) for index in path]
+
+    def cluster_graph(self, cluster_size: int = 32) -> ClusterGraph:
+        """
+        The hierarchical view of the maze used by the HIERARCHICAL strategy, see `pathfinding.ClusterGraph`.
+        It is created on first use and cached, filling itself in as queries go through it, until `set_tile`
+        or `invalidate_layout` changes the walls or exits.
+
+        Args:
+            cluster_size (int): Width and height of a cluster if the graph is not cached.
+
+        Complexity:
+            Best Case Complexity: O(1) when the graph is already cached.
+            Worst Case Complexity: O(E) where E is the number of exits.
+        """
+        if self._clusters is None:
+            self._clusters = ClusterGraph(self._search_layout(),
+                                          [self._index_of(end_position) for end_position in self.end_positions],
+                                          cluster_size)
+        return self._clusters
+
+    def exit_distances(self) -> array[int]:
+        """
+        The number of steps from every cell to its nearest exit as a flat array('i') indexed by
+        row * cols + col, -1 (`pathfinding.UNREACHABLE`) for walls and cells that cannot reach an exit.
+        It is worked out with one breadth first search from all the exits and cached until
+        `set_tile` or `invalidate_layout` changes the walls or exits.
+
+        Complexity:
+            Best Case Complexity: O(1) when the distances are already cached.
+            Worst Case Complexity: O(N) where N is the number of cells in the maze.
+        """
+        if self._exit_distances is None:
+            self._exit_distances = exit_distance_field(
+                self._search_layout(), [self._index_of(end_position) for end_position in self.end_positions])
+        return self._exit_distances
+
+    def distance_to_exit(self, position: Position) -> int | None:
+        """
+        Args:
+            position (Position): The cell to measure from.
+
+        Returns:
+            int | None: The number of steps from position to the nearest exit, None if no exit can be reached.
+
+        Complexity:
+            Best Case Complexity: O(1) when the distances are already cached.
+            Worst Case Complexity: O(exit_distances)
+        """
+        distance: int = self.exit_distances()[self._index_of(position)]
+        return None if distance == UNREACHABLE else distance
+
+    def reachable_cells(self, position: Position | None = None, use_numpy: bool | None = None) -> bytearray:
+        """
+        Every cell that can be reached from position, see `pathfinding.reachable_cells`.
+        The visited flags are left alone.
+
+        Args:
+            position (Position | None): Where to fill from, the start position when None.
+            use_numpy (bool | None): Force the NumPy or python version, by default NumPy is used when it is installed.
+
+        Returns:
+            bytearray: 1 for every reachable cell and 0 for the rest, indexed by row * cols + col.
+
+        Complexity:
+            Best Case Complexity: O(N) where N is the number of cells in the maze.
+            Worst Case Complexity: O(pathfinding.reachable_cells)
+        """
+        if position is None:
+            position = self.start_position
+        return reachable_cells(self._search_layout(), [self._index_of(position)], use_numpy)
+
+    def component_index(self, use_numpy: bool | None = None) -> ComponentIndex:
+        """
+        The connected component of every cell, see `pathfinding.ComponentIndex`. It is built
+        on first use and cached, along with the components holding an exit, until `set_tile`
+        or `invalidate_layout` changes the walls or exits.
+
+        Args:
+            use_numpy (bool | None): How to build the index if it is not cached, see `pathfinding.ComponentIndex`.
+
+        Complexity:
+            Best Case Complexity: O(1) when the index is already cached.
+            Worst Case Complexity: O(N * α(N)) where N is the number of cells in the maze.
+        """
+        if self._components is None:
+            self._components = ComponentIndex(self._search_layout(), use_numpy)
+            self._exit_components = {self._components.component(self._index_of(end_position))
+                                     for end_position in self.end_positions} - {UNREACHABLE}
+        return self._components
+
+    def can_exit(self, position: Position | None = None) -> bool:
+        """
+        Whether any exit can be reached from position (the start position when None).
+
+        Complexity:
+            Best Case Complexity: O(1) when the component index is already cached.
+            Worst Case Complexity: O(component_index)
+        """
+        if position is None:
+            position = self.start_position
+        return self.component_index().component(self._index_of(position)) in self._exit_components
+
+    def reachable_exits(self, use_numpy: bool | None = None) -> List[Position]:
+        """
+        The exits that can be reached from the start position, in the order of end_positions.
+
+        Complexity:
+            Best Case Complexity: O(E) where E is the number of exits, when the component index is cached.
+            Worst Case Complexity: O(component_index + E)
+        """
+        components: ComponentIndex = self.component_index(use_numpy)
+        start: int = self._index_of(self.start_position)
+        return [end_position for end_position in self.end_positions
+                if components.connected(start, self._index_of(end_position))]
+
+    def reachable_hollows(self, use_numpy: bool | None = None) -> List[Position]:
+        """
+        The hollows that can be reached from the start position, in row major order.
+        Treasure planning only needs to consider these.
+
+        Complexity:
+            Best Case Complexity: O(H log H) where H is the number of hollows, for a `CompactGrid`
+            or `ChunkedGrid` when the component index is cached.
+            Worst Case Complexity: O(component_index + N) where N is the number of cells in the maze,
+            a list backed grid has to look at every cell.
+        """
+        components: ComponentIndex = self.component_index(use_numpy)
+        start: int = self._index_of(self.start_position)
+        return [self.position_at(index) for index in self._hollow_indices()
+                if components.connected(start, index)]
+
+    def _hollow_indices(self) -> List[int]:
+        """
+        Flat index of every hollow in the maze, in row major order.
+
+        Complexity:
+            Best Case Complexity: O(H log H) where H is the number of hollows, for a `CompactGrid` or `ChunkedGrid`.
+            Worst Case Complexity: O(N) where N is the number of cells in the maze, for a list backed grid.
+        """
+        if isinstance(self.grid, (CompactGrid, ChunkedGrid)):
+            return sorted(self.grid.hollows)
+        return [i * self.cols + j for i, row in enumerate(self.grid) for j, cell in enumerate(row)
+                if cell.hollow is not None]
+
+    def _flat_way_out(self, result: SearchResult) -> List[Position] | None:
+        """
+        Marks every cell a flat search reached as visited, records how many cells it expanded
+        and turns its path of flat indices into positions.
+
+        Complexity:
+            Best Case Complexity: O(N) where N is the number of cells in the maze, scanning the seen flags.
+            Worst Case Complexity: O(N) where N is the number of cells in the maze.
+        """
+        self.nodes_expanded = result.expanded
+        self.visits.mark_seen(result.seen)
+        if result.path is None:
+            return None
+        return [self.position_at(index) for index in result.path]
+
+    def _index_of(self, position: Position) -> int:
+        """
+        Complexity:
+            Best Case Complexity: O(1)
+            Worst Case Complexity: O(1)
+        """
+        return position.pack(self.cols)
+
+    def position_at(self, index: int) -> Position:
+        """
+        The Position at flat index row * cols + col. Every call for the same cell returns the same
+        object, so the paths and neighbour lists of many searches share their positions instead of
+        each making new ones. A list backed grid already holds one Position per cell, the cell's own,
+        so that is the one handed out. The other grids make them on demand and keep them in a dict.
+
+        Complexity:
+            Best Case Complexity: O(1)
+            Worst Case Complexity: O(1)
+        """
+        if isinstance(self.grid, list):
+            row, col = divmod(index, self.cols)
+            return self.grid[row][col].position
+        position: Position | None = self._positions.get(index)
+        if position is None:
+            position = self._positions[index] = Position.unpack(index, self.cols)
+        return position
+
+    def _search_layout(self) -> GridLayout:
+        """
+        Flat layout of the maze for the pathfinding engines, built on first use and then
+        reused until the walls change. It is an `AdjacencyIndex` once `build_adjacency_index` has been called,
+        and a `LazyLayout` reading the chunks of a `ChunkedGrid`.
+
+        Complexity:
+            Best Case Complexity: O(1) when the layout has already been built.
+            Worst Case Complexity: O(N) where N is the number of cells in the maze.
+        """
+        if self._layout is None and isinstance(self.grid, ChunkedGrid):
+            # There is no room for a flag per cell, the adjacency index is not built either
+            self._layout = LazyLayout(self.rows * self.cols, self.cols, self.grid.is_open)
+        if self._layout is None:
+            open_cells: bytearray
+            if isinstance(self.grid, CompactGrid):
+                tiles: bytearray | memoryview = self.grid.tiles
+                open_cells = (tiles if isinstance(tiles, bytearray) else bytearray(tiles)).translate(_WALL_TO_CLOSED)
+            else:
+                open_cells = bytearray(cell.tile != Tiles.WALL.value for row in self.grid for cell in row)
+            if self.adjacency_enabled:
+                self._layout = AdjacencyIndex(open_cells, self.cols)
+            else:
+                self._layout = GridLayout(open_cells, self.cols)
+        return self._layout
+
+    def build_adjacency_index(self) -> None:
+        """
+        Works out the open neighbours of every cell once and keeps them as CSR style flat arrays,
+        see `pathfinding.AdjacencyIndex`. From then on `get_available_positions` and the flat
+        searches read neighbours straight out of the index. It is rebuilt the next time it is
+        needed after `set_tile` or `invalidate_layout` changes the walls.
+
+        Complexity:
+            Best Case Complexity: O(N) where N is the number of cells in the maze.
+            Worst Case Complexity: O(N) where N is the number of cells in the maze.
+        """
+        self.adjacency_enabled = True
+        if not isinstance(self._layout, AdjacencyIndex):
+            self._layout = None
+            self._search_layout()
+
+    def set_tile(self, position: Position, tile: str | Hollow) -> None:
+        """
+        Changes the tile at position and keeps the cached layout in step, adding or
+        removing a wall or an exit invalidates it. Assigning to `grid[row][col].tile`
+        does the same, see `_tile_changed`.
+
+        Args:
+            position (Position): The cell to change.
+            tile (str | Hollow): The new tile.
+
+        Complexity:
+            Best Case Complexity: O(1) when neither the old nor the new tile is a wall or an exit.
+            Worst Case Complexity: O(E) where E is the number of exits.
+        """
+        self.grid[position.row][position.col].tile = tile
+
+    def _tile_changed(self, index: int, old_tile: str | Hollow, tile: str | Hollow) -> None:
+        """
+        Called by the grid whenever a tile is set, however it was set. Keeps `end_positions` up to
+        date and drops the caches built from the walls and exits when a wall or an exit comes or goes.
+
+        Complexity:
+            Best Case Complexity: O(1) when neither the old nor the new tile is a wall or an exit.
+            Worst Case Complexity: O(E) where E is the number of exits.
+        """
+        if old_tile == Tiles.EXIT.value:
+            self.end_positions.remove(Position.unpack(index, self.cols))
+        if tile == Tiles.EXIT.value:
+            self.end_positions.append(Position.unpack(index, self.cols))
+        if (old_tile == Tiles.WALL.value) != (tile == Tiles.WALL.value) \
+                or old_tile == Tiles.EXIT.value or tile == Tiles.EXIT.value:
+            self.invalidate_layout()
+
+    def set_wall(self, position: Position) -> List[Position] | None:
+        """
+        Puts a wall at position and returns the new way out, see `clear_wall`.
+
+        Args:
+            position (Position): The cell to wall up.
+
+        Returns:
+            List[Position] | None: The way out after the change, as `find_way_out` with DISTANCE_FIELD.
+
+        Complexity:
+            Best Case Complexity: O(L) where L is the length of the path, when no cell's route went through position.
+            Worst Case Complexity: O(A log A + L) where A is the number of cells whose route to an exit went
+            through position, or O(N) when the distances were not cached yet.
+        """
+        return self._replan(position, Tiles.WALL.value)
+
+    def clear_wall(self, position: Position, tile: str | Hollow = ' ') -> List[Position] | None:
+        """
+        Replaces the wall at position with tile and returns the new way out.
+
+        Rather than dropping the cached `exit_distances` as `set_tile` does, `set_wall` and
+        `clear_wall` repair it in place, only the cells whose distance to an exit changes are
+        looked at (see `pathfinding.lower_distances` and `pathfinding.raise_distances`).
+        The path is then walked down the repaired distances from the start position.
+        Every other cache built from the walls is dropped as with `set_tile`.
+
+        Args:
+            position (Position): The cell to open up.
+            tile (str | Hollow): What to put there, an exit or any other tile that is not a wall.
+
+        Returns:
+            List[Position] | None: The way out after the change, as `find_way_out` with DISTANCE_FIELD.
+
+        Raises:
+            ValueError: If there is no wall at position.
+
+        Complexity:
+            Best Case Complexity: O(L) where L is the length of the path, when no cell gets closer to an exit.
+            Worst Case Complexity: O(A + L) where A is the number of cells that get closer to an exit,
+            or O(N) when the distances were not cached yet.
+        """
+        if self.grid[position.row][position.col].tile != Tiles.WALL.value:
+            raise ValueError(f"There is no wall to clear at {position}")
+        return self._replan(position, tile)
+
+    def _replan(self, position: Position, tile: str | Hollow) -> List[Position] | None:
+        """
+        Changes a tile with `set_tile` but keeps the flat layout and repairs the distance field.
+
+        Complexity:
+            Best Case Complexity: O(L) where L is the length of the path.
+            Worst Case Complexity: O(A log A + L), see `set_wall` and `clear_wall`.
+        """
+        layout: GridLayout | None = self._layout
+        distances: array[int] | None = self._exit_distances
+        index: int = self._index_of(position)
+        old_tile: str | Hollow = self.grid[position.row][position.col].tile
+        self.set_tile(position, tile)
+        # The adjacency index cannot be patched in place, so it is left to be rebuilt
+        if layout is not None and distances is not None and not isinstance(layout, AdjacencyIndex):
+            if type(layout) is GridLayout:
+                layout.open_cells[index] = tile != Tiles.WALL.value
+            self._layout = layout
+            if tile == Tiles.WALL.value or (old_tile == Tiles.EXIT.value and tile != Tiles.EXIT.value):
+                raise_distances(layout, distances, index)
+            elif tile == Tiles.EXIT.value:
+                lower_distances(layout, distances, index, 0)
+            elif old_tile == Tiles.WALL.value:
+                nearest: List[int] = [distances[neighbour] for neighbour in layout.neighbours(index)
+                                      if distances[neighbour] != UNREACHABLE]
+                lower_distances(layout, distances, index, min(nearest) + 1 if nearest else UNREACHABLE)
+            self._exit_distances = distances
+        return self.find_way_out(SearchStrategy.DISTANCE_FIELD)
+
+    def invalidate_layout(self) -> None:
+        """
+        Drops every cache built from the walls and exits of the maze and bumps `layout_version`.
+        Setting a tile calls this when needed, it is only left to call after changing the grid some other way.
+
+        Complexity:
+            Best Case Complexity: O(1)
+            Worst Case Complexity: O(1)
+        """
+        self._layout = None
+        self._exit_distances = None
+        self._components = None
+        self._clusters = None
+        self.layout_version += 1
+
+    def clear_visited(self) -> None:
+        """
+        Marks every cell of the maze as not visited. A list backed grid only moves its
+        `VisitStamps` on to the next generation, a `CompactGrid` zeroes its bitset.
+
+        Complexity:
+            Best Case Complexity: O(1) for a list backed grid.
+            Worst Case Complexity: O(N / 8) where N is the number of cells in the maze, for a `CompactGrid`.
+        """
+        self.visits.clear_visited()
+
+    def close(self) -> None:
+        """
+        Closes the file a `ChunkedGrid` reads its chunks from, nothing to do for any other grid.
+        The maze can still be used, the file is opened again when another chunk is needed.
+        A maze can also be used as a context manager, which closes it on the way out.
+
+        Complexity:
+            Best Case Complexity: O(1)
+            Worst Case Complexity: O(1)
+        """
+        if isinstance(self.grid, ChunkedGrid):
+            self.grid.close()
+
+    def __enter__(self) -> Maze:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def plan_treasure_route(self, backpack_capacity: int, beam_width: int = BEAM_WIDTH) -> List[Position] | None:
+        """
+        The way out that collects the most treasure value with `take_treasures`, visiting hollows
+        on the way instead of taking whatever lies on the shortest path, see `route_planner`.
+        Neither the hollows nor the visited flags are changed.
+
+        Args:
+            backpack_capacity (int): The capacity that will be handed to `take_treasures`.
+            beam_width (int): How many partial routes to keep at each step when there are too many
+                hollows to try every set of them.
+
+        Returns:
+            List[Position] | None: The route from the start position to an exit, the shorter one when two collect
+            the same value. Handing its cells to `take_treasures` collects the value it was planned for.
+            None if no exit can be reached.
+
+        Complexity:
+            Best Case Complexity: O(N) where N is the number of cells in the maze, when no hollow can be reached.
+            Worst Case Complexity: O(TreasureRoutePlanner + TreasureRoutePlanner.plan)
         """
-        start: Position = self.start_position
-        raise NotImplementedError
+        hollows: dict[int, Hollow] = {index: self.grid[index // self.cols][index % self.cols].hollow
+                                      for index in self._hollow_indices()}
+        planner: TreasureRoutePlanner = TreasureRoutePlanner(self._search_layout(), self._index_of(self.start_position),
+                                                             self.exit_distances(), hollows)
+        path: List[int] | None = planner.plan(backpack_capacity, beam_width)
+        return None if path is None else [self.position_at(index) for index in path]
 
     def take_treasures(self, path: List[MazeCell], backpack_capacity: int) -> List[Treasure] | None:
         """
@@ -258,11 +1731,20 @@ class Maze:
             None - If there are no treasures to take.
 
         Complexity:
-            Best Case Complexity: TODO
-            Worst Case Complexity: TODO
+            Best Case Complexity: O(L) where L is the length of the path, when none of the cells are hollows.
+            Worst Case Complexity: O(L * G) where G is the worst case of `get_optimal_treasure`
+            across the hollows on the path.
 
         """
-        raise NotImplementedError
+        treasures: List[Treasure] = []
+        for cell in path:
+            if cell.hollow is None:
+                continue
+            treasure: Treasure | None = cell.hollow.get_optimal_treasure(backpack_capacity)
+            if treasure is not None:
+                treasures.append(treasure)
+                backpack_capacity -= treasure.weight
+        return treasures if treasures else None
 
     def __repr__(self) -> str:
         return str(self)
@@ -0,0 +1,151 @@
+from __future__ import annotations
+"""
+The .mzb binary maze format, loaded by `Maze.load_maze_from_file` for names ending in .mzb
+and written from text mazes by `Maze.convert_to_mzb`.
+
+Layout, little endian:
+    header  magic b'MZB1', 4 bytes padding, then rows, cols, start, exit count and hollow count as u64
+    tiles   rows * cols tile bytes in row major order, the characters of `config.Tiles`
+            with empty cells stored as ' ' exactly as in `maze.CompactGrid`
+    exits   exit count u64 flat indices (row * cols + col)
+    hollows hollow count u64 flat indices row by row, the tile byte says which kind
+
+The tiles sit at a fixed offset so a file can be mapped with mmap and the tile array handed
+to a CompactGrid as is, only the exits and hollows are read one by one.
+
+Usage:
+    python maze_binary.py task3/maze1.txt [task3/maze1.mzb]
+"""
+import mmap
+import os
+import struct
+import sys
+from array import array
+from dataclasses import dataclass
+from typing import BinaryIO, List
+
+MAGIC: bytes = b'MZB1'
+HEADER: struct.Struct = struct.Struct('<4s4xQQQQQ')
+INDEX_TYPE: str = 'Q'
+INDEX_SIZE: int = array(INDEX_TYPE).itemsize
+
+
+@dataclass
+class MzbMaze:
+    rows: int
+    cols: int
+    start: int
+    exits: array
+    hollows: array
+    tiles: memoryview | None = None
+
+    @staticmethod
+    def row_offsets(rows: int, cols: int) -> range:
+        """
+        Byte offset in the file of the first tile of every row.
+
+        Complexity:
+            Best Case Complexity: O(1)
+            Worst Case Complexity: O(1)
+        """
+        return range(HEADER.size, HEADER.size + rows * cols, max(cols, 1))
+
+
+def write_mzb(out: BinaryIO, rows: int, cols: int, start: int, exits: List[int], hollows: List[int],
+              tiles: bytes | bytearray) -> None:
+    """
+    Writes a whole maze in the .mzb format.
+
+    Args:
+        out(BinaryIO): File opened for binary writing.
+        rows(int): Number of rows in the maze.
+        cols(int): Number of columns in the maze.
+        start(int): Flat index of the start position.
+        exits(List[int]): Flat index of every exit.
+        hollows(List[int]): Flat index of every hollow, row by row.
+        tiles(bytes | bytearray): rows * cols tile bytes.
+
+    Complexity:
+        Best Case Complexity: O(N + E + H) where N is the number of cells, E the number of exits
+        and H the number of hollows.
+        Worst Case Complexity: O(N + E + H)
+    """
+    out.write(HEADER.pack(MAGIC, rows, cols, start, len(exits), len(hollows)))
+    out.write(tiles)
+    out.write(array(INDEX_TYPE, exits).tobytes())
+    out.write(array(INDEX_TYPE, hollows).tobytes())
+
+
+def read_mzb_index(f: BinaryIO, path: str) -> MzbMaze:
+    """
+    Reads the header, exits and hollows of an open .mzb file, leaving the tiles on disk.
+
+    Args:
+        f(BinaryIO): The .mzb file opened for binary reading.
+        path(str): Path of the file, for error messages.
+
+    Returns:
+        MzbMaze: The header values with the exits and hollows read out and no tiles.
+
+    Raises:
+        ValueError: If the file is not a .mzb file or its size does not match its header.
+
+    Complexity:
+        Best Case Complexity: O(E + H) where E is the number of exits and H the number of hollows.
+        Worst Case Complexity: O(E + H)
+    """
+    size: int = os.fstat(f.fileno()).st_size
+    f.seek(0)
+    header: bytes = f.read(HEADER.size)
+    if len(header) < HEADER.size:
+        raise ValueError(f"{path} is not a .mzb maze")
+    magic, rows, cols, start, exit_count, hollow_count = HEADER.unpack(header)
+    tiles_end: int = HEADER.size + rows * cols
+    if magic != MAGIC or size != tiles_end + (exit_count + hollow_count) * INDEX_SIZE:
+        raise ValueError(f"{path} is not a .mzb maze")
+    f.seek(tiles_end)
+    exits: array = array(INDEX_TYPE)
+    exits.fromfile(f, exit_count)
+    hollows: array = array(INDEX_TYPE)
+    hollows.fromfile(f, hollow_count)
+    return MzbMaze(rows, cols, start, exits, hollows)
+
+
+def read_mzb(path: str) -> MzbMaze:
+    """
+    Maps a .mzb file into memory. The tiles are a writable view over a private copy-on-write
+    mapping, so edits made through the grid never reach the file and untouched pages are
+    only read from disk when they are first used.
+
+    Args:
+        path(str): Path of the .mzb file.
+
+    Returns:
+        MzbMaze: The header values with the exits and hollows read out and the tiles still mapped.
+
+    Raises:
+        ValueError: If the file is not a .mzb file or its size does not match its header.
+
+    Complexity:
+        Best Case Complexity: O(E + H) where E is the number of exits and H the number of hollows.
+        Worst Case Complexity: O(E + H)
+    """
+    with open(path, 'rb') as f:
+        mzb: MzbMaze = read_mzb_index(f, path)
+        mapped: mmap.mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+    mzb.tiles = memoryview(mapped)[HEADER.size:HEADER.size + mzb.rows * mzb.cols]
+    return mzb
+
+
+def main(argv: List[str] | None = None) -> None:
+    args: List[str] = sys.argv[1:] if argv is None else argv
+    if len(args) not in (1, 2):
+        print("Usage: python maze_binary.py <maze name> [<mzb name>]", file=sys.stderr)
+        sys.exit(2)
+    # Imported here as maze imports this module to load .mzb files
+    from maze import Maze
+    print(Maze.convert_to_mzb(*args))
+
+
+if __name__ == "__main__":
+    main()
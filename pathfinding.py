@@ -0,0 +1,1301 @@
+from __future__ import annotations
+"""
+Flat array pathfinding engines used by `Maze.find_way_out`.
+
+The engines never see Position or MazeCell objects. Every cell is addressed by its
+flat index (row * cols + col) and the layout of the maze is a bytearray holding 1 for
+cells that can be stood on and 0 for walls. Parent pointers, distances and seen flags
+are kept in flat arrays indexed the same way.
+"""
+from array import array
+from dataclasses import dataclass
+from enum import Enum
+from typing import Callable, Generic, List, Sequence, TypeVar
+
+from data_structures.heap import MaxHeap
+from data_structures.linked_stack import LinkedStack
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, reachable_cells falls back to a python flood fill
+    np = None
+
+HAVE_NUMPY: bool = np is not None
+
+T = TypeVar('T')
+
+UNSEEN: int = 0
+FORWARD: int = 1
+BACKWARD: int = 2
+UNREACHABLE: int = -1
+
+
+class SearchStrategy(Enum):
+    BFS = 'bfs'
+    BIDIRECTIONAL_BFS = 'bidirectional_bfs'
+    A_STAR = 'a_star'
+    DFS = 'dfs'
+    DISTANCE_FIELD = 'distance_field'
+    JUMP_POINT = 'jump_point'
+    HIERARCHICAL = 'hierarchical'
+
+
+@dataclass
+class SearchResult:
+    path: List[int] | None
+    seen: bytearray
+    expanded: int = 0
+
+
+@dataclass
+class ExitTree:
+    """
+    The parent pointers of one breadth first search from a start, shared by the paths to every exit it reached.
+    """
+    parent: array
+    exits: List[int]
+    seen: bytearray
+    expanded: int = 0
+
+    def path_to(self, index: int) -> List[int]:
+        """
+        The flat indices from the start to index, following the shared parent pointers back.
+
+        Complexity:
+            Best Case Complexity: O(L) where L is the length of the path.
+            Worst Case Complexity: O(L)
+        """
+        path: List[int] = []
+        while index != -1:
+            path.append(index)
+            index = self.parent[index]
+        path.reverse()
+        return path
+
+
+class MinPriorityQueue(Generic[T]):
+    """
+    Smallest priority first queue built on `MaxHeap` by storing negated priorities.
+    MaxHeap has a fixed capacity, so the heap is rebuilt at double the size when it fills up.
+
+    Items with equal priorities come out largest item first, so items should be comparable.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        """
+        Complexity:
+            Best Case Complexity: O(capacity)
+            Worst Case Complexity: O(capacity)
+        """
+        self.heap: MaxHeap[tuple[int, T]] = MaxHeap(capacity)
+
+    def __len__(self) -> int:
+        return len(self.heap)
+
+    def push(self, priority: int, item: T) -> None:
+        """
+        Complexity:
+            Best Case Complexity: O(1) when the entry does not need to rise.
+            Worst Case Complexity: O(n) when the heap has to grow, O(log n) amortised.
+            n is the number of entries in the queue.
+        """
+        if self.heap.is_full():
+            grown: MaxHeap[tuple[int, T]] = MaxHeap(2 * len(self.heap))
+            grown.add_all(self.heap, len(self.heap))
+            self.heap = grown
+        self.heap.add((-priority, item))
+
+    def pop(self) -> tuple[int, T]:
+        """
+        Removes and returns the (priority, item) pair with the smallest priority.
+
+        Complexity:
+            Best Case Complexity: O(log n)
+            Worst Case Complexity: O(log n)
+            n is the number of entries in the queue.
+        """
+        negated, item = self.heap.get_max()
+        return -negated, item
+
+
+class GridLayout:
+    """
+    The flat layout the engines search over, 1 for every cell that can be stood on and 0 for walls.
+    Neighbours are worked out from the flat index each time they are asked for.
+    """
+
+    def __init__(self, open_cells: bytearray, cols: int) -> None:
+        """
+        Args:
+            open_cells(bytearray): 1 for every cell that can be stood on, 0 for walls, in row major order.
+            cols(int): Number of columns in the maze.
+
+        Complexity:
+            Best Case Complexity: O(1)
+            Worst Case Complexity: O(1)
+        """
+        self.open_cells: bytearray = open_cells
+        self.cols: int = cols
+
+    def __len__(self) -> int:
+        return len(self.open_cells)
+
+    def is_open(self, index: int) -> bool:
+        """
+        Complexity:
+            Best Case Complexity: O(1)
+            Worst Case Complexity: O(1)
+        """
+        return self.open_cells[index] != 0
+
+    def neighbours(self, index: int) -> Sequence[int]:
+        """
+        Returns the open cells next to index, in the same up, down, left, right order as `Maze.directions`.
+
+        Complexity:
+            Best Case Complexity: O(1)
+            Worst Case Complexity: O(1)
+        """
+        open_cells: bytearray = self.open_cells
+        cols: int = self.cols
+        result: List[int] = []
+        if index >= cols and open_cells[index - cols]:
+            result.append(index - cols)
+        if index + cols < len(open_cells) and open_cells[index + cols]:
+            result.append(index + cols)
+        col: int = index % cols
+        if col > 0 and open_cells[index - 1]:
+            result.append(index - 1)
+        if col < cols - 1 and open_cells[index + 1]:
+            result.append(index + 1)
+        return result
+
+
+class AdjacencyIndex(GridLayout):
+    """
+    A GridLayout with every cell's open neighbours worked out once, stored CSR style:
+    the neighbours of cell i are targets[offsets[i]:offsets[i + 1]]. Looking them up
+    hands back a memoryview of that slice, so nothing is copied or allocated per cell.
+
+    The index describes one wall layout, it has to be rebuilt when a wall is added or removed.
+    """
+
+    def __init__(self, open_cells: bytearray, cols: int) -> None:
+        """
+        Args:
+            open_cells(bytearray): 1 for every cell that can be stood on, 0 for walls, in row major order.
+            cols(int): Number of columns in the maze.
+
+        Complexity:
+            Best Case Complexity: O(N) where N is the number of cells in the maze.
+            Worst Case Complexity: O(N) where N is the number of cells in the maze.
+        """
+        super().__init__(open_cells, cols)
+        self.offsets: array = array('i', [0]) * (len(open_cells) + 1)
+        self.targets: array = array('i')
+        for index in range(len(open_cells)):
+            # Walls are never searched from, so they are left with no neighbours
+            if open_cells[index]:
+                self.targets.extend(GridLayout.neighbours(self, index))
+            self.offsets[index + 1] = len(self.targets)
+        self.view: memoryview = memoryview(self.targets)
+
+    def neighbours(self, index: int) -> Sequence[int]:
+        """
+        Complexity:
+            Best Case Complexity: O(1)
+            Worst Case Complexity: O(1)
+        """
+        return self.view[self.offsets[index]:self.offsets[index + 1]]
+
+
+class LazyLayout(GridLayout):
+    """
+    A GridLayout that asks is_open about each cell as it is needed instead of holding a
+    flag for every cell, for mazes whose tiles are not all in memory at once.
+    """
+
+    def __init__(self, size: int, cols: int, is_open: Callable[[int], bool]) -> None:
+        """
+        Args:
+            size(int): Number of cells in the maze.
+            cols(int): Number of columns in the maze.
+            is_open(Callable[[int], bool]): Whether the cell at a flat index can be stood on.
+
+        Complexity:
+            Best Case Complexity: O(1)
+            Worst Case Complexity: O(1)
+        """
+        super().__init__(bytearray(), cols)
+        self.size: int = size
+        self._is_open: Callable[[int], bool] = is_open
+
+    def __len__(self) -> int:
+        return self.size
+
+    def is_open(self, index: int) -> bool:
+        """
+        Complexity:
+            Best Case Complexity: O(is_open)
+            Worst Case Complexity: O(is_open)
+        """
+        return self._is_open(index)
+
+    def neighbours(self, index: int) -> Sequence[int]:
+        """
+        Complexity:
+            Best Case Complexity: O(is_open)
+            Worst Case Complexity: O(is_open)
+        """
+        is_open: Callable[[int], bool] = self._is_open
+        cols: int = self.cols
+        result: List[int] = []
+        if index >= cols and is_open(index - cols):
+            result.append(index - cols)
+        if index + cols < self.size and is_open(index + cols):
+            result.append(index + cols)
+        col: int = index % cols
+        if col > 0 and is_open(index - 1):
+            result.append(index - 1)
+        if col < cols - 1 and is_open(index + 1):
+            result.append(index + 1)
+        return result
+
+
+def bidirectional_search(layout: GridLayout, start: int, exits: List[int]) -> SearchResult:
+    """
+    Breadth first search run from both ends at once. The forward frontier grows from start,
+    the backward frontier is seeded with every exit at the same time, and the smaller of
+    the two frontiers is expanded one whole level at a time until they touch.
+
+    Expanding whole levels means the first level that finds a meeting point also holds
+    the best one, so the path returned is a shortest path to the nearest exit.
+
+    Args:
+        layout(GridLayout): The maze to search.
+        start(int): Flat index of the start position.
+        exits(List[int]): Flat indices of every exit.
+
+    Returns:
+        SearchResult: the flat indices from start to an exit (None if no exit can be reached),
+        which cells either frontier reached and how many cells were expanded.
+
+    Complexity:
+        Best Case Complexity: O(N + E) where N is the number of cells in the maze
+        and E the number of exits, allocating the flat arrays dominates.
+        Worst Case Complexity: O(N + E) when neither frontier runs out before every
+        reachable cell has been seen.
+    """
+    side: bytearray = bytearray(len(layout))
+    parent: array = array('i', [-1]) * len(layout)
+    distance: array = array('i', [0]) * len(layout)
+
+    side[start] = FORWARD
+    forward: List[int] = [start]
+    backward: List[int] = []
+    for exit_index in exits:
+        if side[exit_index] == UNSEEN:
+            side[exit_index] = BACKWARD
+            backward.append(exit_index)
+
+    # (path length, forward cell, backward cell) of the best meeting found so far
+    best: tuple[int, int, int] | None = None
+    expanded: int = 0
+    while forward and backward and best is None:
+        expand_forward: bool = len(forward) <= len(backward)
+        frontier: List[int] = forward if expand_forward else backward
+        this_side: int = FORWARD if expand_forward else BACKWARD
+        next_frontier: List[int] = []
+        expanded += len(frontier)
+        for index in frontier:
+            for neighbour in layout.neighbours(index):
+                if side[neighbour] == UNSEEN:
+                    side[neighbour] = this_side
+                    parent[neighbour] = index
+                    distance[neighbour] = distance[index] + 1
+                    next_frontier.append(neighbour)
+                elif side[neighbour] != this_side:
+                    length: int = distance[index] + distance[neighbour] + 1
+                    if best is None or length < best[0]:
+                        best = (length, index, neighbour) if expand_forward else (length, neighbour, index)
+        if expand_forward:
+            forward = next_frontier
+        else:
+            backward = next_frontier
+
+    if best is None:
+        return SearchResult(None, side, expanded)
+
+    _, forward_cell, backward_cell = best
+    path: List[int] = []
+    current: int = forward_cell
+    while current != -1:
+        path.append(current)
+        current = parent[current]
+    path.reverse()
+    # Backward parents point one step closer to an exit
+    current = backward_cell
+    while current != -1:
+        path.append(current)
+        current = parent[current]
+    return SearchResult(path, side, expanded)
+
+
+def a_star_search(layout: GridLayout, start: int, exits: List[int]) -> SearchResult:
+    """
+    A* search from start, guided by the Manhattan distance to the nearest exit.
+    The heuristic never overestimates and is consistent on a four way grid, so the first
+    exit taken off the queue ends a shortest path and no cell is expanded twice.
+    Ties on f = g + h are broken towards the larger g, which in open rooms keeps the
+    search running straight at the exit instead of widening a diamond of equal f cells.
+
+    Args:
+        layout(GridLayout): The maze to search.
+        start(int): Flat index of the start position.
+        exits(List[int]): Flat indices of every exit.
+
+    Returns:
+        SearchResult: the flat indices from start to an exit (None if no exit can be reached),
+        the cells pushed onto the queue and how many cells were expanded.
+
+    Complexity:
+        Best Case Complexity: O(N + E * L) where N is the number of cells in the maze, E the number of
+        exits and L the length of the path, only the cells on the path are expanded.
+        Worst Case Complexity: O(N + N * (E + log N)) when every cell is expanded.
+    """
+    cols: int = layout.cols
+    exit_cells: List[tuple[int, int]] = [(index // cols, index % cols) for index in exits]
+
+    def heuristic(index: int) -> int:
+        row, col = index // cols, index % cols
+        return min(abs(row - exit_row) + abs(col - exit_col) for exit_row, exit_col in exit_cells)
+
+    seen: bytearray = bytearray(len(layout))
+    if not exits:
+        return SearchResult(None, seen)
+    is_exit: bytearray = bytearray(len(layout))
+    for index in exits:
+        is_exit[index] = 1
+    closed: bytearray = bytearray(len(layout))
+    parent: array = array('i', [-1]) * len(layout)
+    cost: array = array('i', [0]) * len(layout)
+
+    queue: MinPriorityQueue[tuple[int, int]] = MinPriorityQueue(64)
+    seen[start] = 1
+    queue.push(heuristic(start), (0, start))
+    expanded: int = 0
+    while len(queue) > 0:
+        _, (g, index) = queue.pop()
+        if closed[index] or g != cost[index]:
+            continue  # Stale entry, a cheaper route to this cell was queued later
+        closed[index] = 1
+        expanded += 1
+        if is_exit[index]:
+            path: List[int] = []
+            while index != -1:
+                path.append(index)
+                index = parent[index]
+            path.reverse()
+            return SearchResult(path, seen, expanded)
+        for neighbour in layout.neighbours(index):
+            if closed[neighbour] or (seen[neighbour] and cost[neighbour] <= g + 1):
+                continue
+            seen[neighbour] = 1
+            parent[neighbour] = index
+            cost[neighbour] = g + 1
+            queue.push(g + 1 + heuristic(neighbour), (g + 1, neighbour))
+    return SearchResult(None, seen, expanded)
+
+
+# (row step, column step) of each direction a jump point can be reached in, START is the start itself
+JUMP_DIRECTIONS: List[tuple[int, int]] = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+START: int = len(JUMP_DIRECTIONS)
+
+
+def jump_point_search(layout: GridLayout, start: int, exits: List[int]) -> SearchResult:
+    """
+    Jump point search adapted to a four way grid, A* over jump points instead of single cells.
+
+    Among the shortest paths it only follows those where a horizontal run turns up or down
+    just past a wall, any other turn can be made earlier for the same length. So from a cell
+    reached horizontally the search runs straight on and only turns where the cell behind the
+    turn is a wall (a forced neighbour), from a cell reached vertically it may also turn left
+    or right. Runs are jumped over without queueing the cells on them and a vertical run
+    stops where a horizontal jump from it would find a jump point. An exit always ends a run.
+
+    A vertical run looks both ways along the row at every step, so those horizontal looks have to
+    be cheap. Every cell where a horizontal run would stop, an exit or a forced neighbour in that
+    direction, is marked once per search in a byte per cell (see `_jump_stops`). A horizontal jump
+    is then two `find` calls on the row, one for the next wall and one for the next mark, instead
+    of a Python loop over the cells. On a layout without the open cell flags (a `LazyLayout`) the
+    cells are still stepped through one at a time.
+
+    The same cell can be reached in more than one direction with different moves left open,
+    so the search state is the cell together with the direction it was reached in.
+
+    Args:
+        layout(GridLayout): The maze to search.
+        start(int): Flat index of the start position.
+        exits(List[int]): Flat indices of every exit.
+
+    Returns:
+        SearchResult: the flat indices from start to an exit with every run filled in (None if no
+        exit can be reached), the jump points queued and how many jump points were expanded.
+
+    Complexity:
+        Best Case Complexity: O(N + L) where N is the number of cells in the maze and L the length of the path,
+        allocating the flat arrays and a single run straight to an exit.
+        Worst Case Complexity: O(N * (C + E + log N)) where C is the number of columns, every cell is reached
+        by a vertical run that looks both ways along its row. The C is a byte scan done by bytearray.find,
+        and only up to the next wall or mark.
+    """
+    cols: int = layout.cols
+    rows: int = len(layout) // cols if cols else 0
+    is_open: Callable[[int], bool] = layout.is_open
+    exit_cells: List[tuple[int, int]] = [(index // cols, index % cols) for index in exits]
+
+    def heuristic(index: int) -> int:
+        row, col = index // cols, index % cols
+        return min(abs(row - exit_row) + abs(col - exit_col) for exit_row, exit_col in exit_cells)
+
+    def free(row: int, col: int) -> bool:
+        return 0 <= row < rows and 0 <= col < cols and is_open(row * cols + col)
+
+    def forced(row: int, col: int, col_step: int, row_step: int) -> bool:
+        # Turning row_step here from a run heading col_step cannot be done one cell earlier
+        return free(row + row_step, col) and not free(row + row_step, col - col_step)
+
+    def jump_horizontal(row: int, col: int, col_step: int) -> int:
+        index: int = row * cols + col
+        if stops_right is not None:
+            if col_step > 0:
+                end: int = index - col + cols
+                wall: int = open_cells.find(0, index + 1, end)
+                stop: int = stops_right.find(1, index + 1, end)
+                return stop if stop != -1 and (wall == -1 or stop < wall) else -1
+            wall = open_cells.rfind(0, index - col, index)
+            stop = stops_left.rfind(1, index - col, index)
+            return stop if stop > wall else -1
+        while True:
+            col += col_step
+            if not free(row, col):
+                return -1
+            if is_exit[row * cols + col] or forced(row, col, col_step, -1) or forced(row, col, col_step, 1):
+                return row * cols + col
+
+    def jump_vertical(row: int, col: int, row_step: int) -> int:
+        while True:
+            row += row_step
+            if not free(row, col):
+                return -1
+            if is_exit[row * cols + col] or jump_horizontal(row, col, -1) != -1 or jump_horizontal(row, col, 1) != -1:
+                return row * cols + col
+
+    seen: bytearray = bytearray(len(layout))
+    if not exits:
+        return SearchResult(None, seen)
+    is_exit: bytearray = bytearray(len(layout))
+    for index in exits:
+        is_exit[index] = 1
+    open_cells: bytearray = layout.open_cells
+    stops_right: bytearray | None = None
+    stops_left: bytearray | None = None
+    if len(open_cells) == len(layout):
+        stops_right, stops_left = _jump_stops(open_cells, rows, cols)
+        for index in exits:
+            stops_right[index] = stops_left[index] = 1
+    # Keyed by state = cell * (START + 1) + direction, only jump points are ever stored
+    cost: dict[int, int] = {}
+    parent: dict[int, int] = {}
+    closed: set[int] = set()
+
+    queue: MinPriorityQueue[tuple[int, int]] = MinPriorityQueue(64)
+    first: int = start * (START + 1) + START
+    seen[start] = 1
+    cost[first] = 0
+    parent[first] = -1
+    queue.push(heuristic(start), (0, first))
+    expanded: int = 0
+    while len(queue) > 0:
+        _, (g, state) = queue.pop()
+        if state in closed or g != cost[state]:
+            continue  # Stale entry, a cheaper route to this state was queued later
+        closed.add(state)
+        expanded += 1
+        index, direction = divmod(state, START + 1)
+        if is_exit[index]:
+            return SearchResult(_expand_runs(parent, state, cols), seen, expanded)
+        row, col = index // cols, index % cols
+        moves: List[int]
+        if direction == START:
+            moves = [0, 1, 2, 3]
+        elif JUMP_DIRECTIONS[direction][0] != 0:
+            moves = [direction, 2, 3]
+        else:
+            col_step: int = JUMP_DIRECTIONS[direction][1]
+            moves = [direction] + [turn for turn in (0, 1) if forced(row, col, col_step, JUMP_DIRECTIONS[turn][0])]
+        for move in moves:
+            row_step, col_step = JUMP_DIRECTIONS[move]
+            target: int = jump_vertical(row, col, row_step) if row_step else jump_horizontal(row, col, col_step)
+            if target == -1:
+                continue
+            next_state: int = target * (START + 1) + move
+            next_g: int = g + abs(target // cols - row) + abs(target % cols - col)
+            if next_state in closed or cost.get(next_state, next_g + 1) <= next_g:
+                continue
+            seen[target] = 1
+            cost[next_state] = next_g
+            parent[next_state] = state
+            queue.push(next_g + heuristic(target), (next_g, next_state))
+    return SearchResult(None, seen, expanded)
+
+
+def _jump_stops(open_cells: bytearray, rows: int, cols: int) -> tuple[bytearray, bytearray]:
+    """
+    Marks the forced neighbours of horizontal runs with a 1, one byte per cell, for runs heading right and
+    for runs heading left. A run heading right has a forced neighbour at a cell when the cell above
+    (or below) it is open but the one above (or below) the cell before it is not, so the turn cannot be
+    made earlier. Each row is worked out at once by reading the rows above and below as integers with
+    one byte per cell, shifting them by a cell is then shifting the integer by 8 bits.
+
+    Complexity:
+        Best Case Complexity: O(N) where N is the number of cells, the byte operations on each row.
+        Worst Case Complexity: O(N)
+    """
+    right: List[bytes] = []
+    left: List[bytes] = []
+    above: int = 0
+    here: int = int.from_bytes(open_cells[0:cols], 'little') if rows else 0
+    for row in range(rows):
+        below: int = int.from_bytes(open_cells[(row + 1) * cols:(row + 2) * cols], 'little') if row + 1 < rows else 0
+        right.append(((above & ~(above << 8)) | (below & ~(below << 8))).to_bytes(cols, 'little'))
+        left.append(((above & ~(above >> 8)) | (below & ~(below >> 8))).to_bytes(cols, 'little'))
+        above, here = here, below
+    return bytearray(b''.join(right)), bytearray(b''.join(left))
+
+
+def _expand_runs(parent: dict[int, int], state: int, cols: int) -> List[int]:
+    """
+    Follows the parent states back from state and fills in every cell of the straight runs between jump points.
+
+    Complexity:
+        Best Case Complexity: O(L) where L is the length of the path.
+        Worst Case Complexity: O(L)
+    """
+    jump_points: List[int] = []
+    while state != -1:
+        jump_points.append(state // (START + 1))
+        state = parent[state]
+    jump_points.reverse()
+    path: List[int] = [jump_points[0]]
+    for target in jump_points[1:]:
+        step: int = (1 if target > path[-1] else -1) * (1 if target // cols == path[-1] // cols else cols)
+        while path[-1] != target:
+            path.append(path[-1] + step)
+    return path
+
+
+def depth_first_search(layout: GridLayout, start: int, exits: List[int]) -> SearchResult:
+    """
+    Depth first search from start using an explicit LinkedStack, so long corridors cannot hit
+    Python's recursion limit. Each cell is pushed at most once and remembers the cell it was
+    reached from in a flat parent array, the path is only rebuilt from those parents once an
+    exit is found, no path lists are copied while searching.
+
+    The path found is a valid way out but not necessarily the shortest one.
+
+    Args:
+        layout(GridLayout): The maze to search.
+        start(int): Flat index of the start position.
+        exits(List[int]): Flat indices of every exit.
+
+    Returns:
+        SearchResult: the flat indices from start to an exit (None if no exit can be reached),
+        the cells pushed onto the stack and how many cells were expanded.
+
+    Complexity:
+        Best Case Complexity: O(N + E) where N is the number of cells in the maze and E the number
+        of exits, allocating the flat arrays dominates.
+        Worst Case Complexity: O(N + E) when every reachable cell is expanded.
+        Memory is O(N), the stack never holds a cell more than once.
+    """
+    seen: bytearray = bytearray(len(layout))
+    is_exit: bytearray = bytearray(len(layout))
+    for index in exits:
+        is_exit[index] = 1
+    parent: array = array('i', [-1]) * len(layout)
+
+    stack: LinkedStack[int] = LinkedStack()
+    seen[start] = 1
+    stack.push(start)
+    expanded: int = 0
+    while not stack.is_empty():
+        index: int = stack.pop()
+        expanded += 1
+        if is_exit[index]:
+            path: List[int] = []
+            while index != -1:
+                path.append(index)
+                index = parent[index]
+            path.reverse()
+            return SearchResult(path, seen, expanded)
+        following: Sequence[int] = layout.neighbours(index)
+        # Pushed in reverse so the first direction is explored first
+        for k in range(len(following) - 1, -1, -1):
+            neighbour: int = following[k]
+            if not seen[neighbour]:
+                seen[neighbour] = 1
+                parent[neighbour] = index
+                stack.push(neighbour)
+    return SearchResult(None, seen, expanded)
+
+
+def exit_search_tree(layout: GridLayout, start: int, exits: List[int], limit: int | None = None) -> ExitTree:
+    """
+    Breadth first search from start that keeps going past the first exit until every exit
+    (or the first limit of them) has been reached, so one set of parent pointers holds a
+    shortest path to each of them.
+
+    Args:
+        layout(GridLayout): The maze to search.
+        start(int): Flat index of the start position.
+        exits(List[int]): Flat indices of every exit.
+        limit(int | None): Stop once this many exits have been reached.
+
+    Returns:
+        ExitTree: the parent pointers, the exits reached nearest first (each once), which
+        cells were seen and how many cells were expanded.
+
+    Complexity:
+        Best Case Complexity: O(N) where N is the number of cells in the maze, allocating the flat arrays
+        when the exits are all next to start.
+        Worst Case Complexity: O(N + E) where E is the number of exits, when every cell is reached.
+    """
+    seen: bytearray = bytearray(len(layout))
+    parent: array = array('i', [-1]) * len(layout)
+    is_exit: bytearray = bytearray(len(layout))
+    for index in exits:
+        is_exit[index] = 1
+    wanted: int = sum(is_exit) if limit is None else min(limit, sum(is_exit))
+    reached: List[int] = []
+    seen[start] = 1
+    frontier: List[int] = [start]
+    expanded: int = 0
+    while frontier and len(reached) < wanted:
+        next_frontier: List[int] = []
+        for index in frontier:
+            expanded += 1
+            if is_exit[index]:
+                reached.append(index)
+                if len(reached) == wanted:
+                    break
+            for neighbour in layout.neighbours(index):
+                if not seen[neighbour]:
+                    seen[neighbour] = 1
+                    parent[neighbour] = index
+                    next_frontier.append(neighbour)
+        frontier = next_frontier
+    return ExitTree(parent, reached, seen, expanded)
+
+
+def exit_distance_field(layout: GridLayout, exits: List[int]) -> array:
+    """
+    Breadth first search seeded with every exit at once, giving the number of steps from
+    every cell to its nearest exit.
+
+    Args:
+        layout(GridLayout): The maze to measure.
+        exits(List[int]): Flat indices of every exit.
+
+    Returns:
+        array: array('i') of the distance to the nearest exit for every flat index,
+        UNREACHABLE for walls and cells no exit can be reached from.
+
+    Complexity:
+        Best Case Complexity: O(N + E) where N is the number of cells in the maze and E the number of exits.
+        Worst Case Complexity: O(N + E)
+    """
+    distances: array = array('i', [UNREACHABLE]) * len(layout)
+    frontier: List[int] = []
+    for index in exits:
+        if distances[index] == UNREACHABLE:
+            distances[index] = 0
+            frontier.append(index)
+    distance: int = 0
+    while frontier:
+        distance += 1
+        next_frontier: List[int] = []
+        for index in frontier:
+            for neighbour in layout.neighbours(index):
+                if distances[neighbour] == UNREACHABLE:
+                    distances[neighbour] = distance
+                    next_frontier.append(neighbour)
+        frontier = next_frontier
+    return distances
+
+
+def descend_distance_field(layout: GridLayout, distances: array, start: int) -> List[int] | None:
+    """
+    Walks from start down an `exit_distance_field`, always stepping to the first neighbour
+    (in `GridLayout.neighbours` order) one step closer to an exit, which gives a shortest path.
+
+    Args:
+        layout(GridLayout): The maze the distances were measured on.
+        distances(array): The distance field of layout.
+        start(int): Flat index to walk from.
+
+    Returns:
+        List[int] | None: The flat indices from start to the nearest exit, None if no exit can be reached.
+
+    Complexity:
+        Best Case Complexity: O(1) when start is an exit or cannot reach one.
+        Worst Case Complexity: O(L) where L is the length of the path.
+    """
+    if distances[start] == UNREACHABLE:
+        return None
+    path: List[int] = [start]
+    index: int = start
+    while distances[index] > 0:
+        closer: int = distances[index] - 1
+        for neighbour in layout.neighbours(index):
+            if distances[neighbour] == closer:
+                index = neighbour
+                break
+        path.append(index)
+    return path
+
+
+def lower_distances(layout: GridLayout, distances: array, index: int, distance: int) -> int:
+    """
+    Repairs an `exit_distance_field` in place after the cell at index has become distance
+    steps from an exit, when that is closer than before (a wall was removed or an exit added).
+    Only cells that end up closer to an exit are touched.
+
+    Args:
+        layout(GridLayout): The maze with the change already made.
+        distances(array): The distance field from before the change.
+        index(int): Flat index of the changed cell.
+        distance(int): Its new distance, 0 for a new exit.
+
+    Returns:
+        int: The number of cells whose distance changed.
+
+    Complexity:
+        Best Case Complexity: O(1) when no other cell gets closer to an exit.
+        Worst Case Complexity: O(A) where A is the number of cells that get closer.
+    """
+    if distance == UNREACHABLE or (distances[index] != UNREACHABLE and distances[index] <= distance):
+        return 0
+    distances[index] = distance
+    frontier: List[int] = [index]
+    changed: int = 1
+    while frontier:
+        next_frontier: List[int] = []
+        for cell in frontier:
+            closer: int = distances[cell] + 1
+            for neighbour in layout.neighbours(cell):
+                if distances[neighbour] == UNREACHABLE or distances[neighbour] > closer:
+                    distances[neighbour] = closer
+                    next_frontier.append(neighbour)
+                    changed += 1
+        frontier = next_frontier
+    return changed
+
+
+def raise_distances(layout: GridLayout, distances: array, index: int) -> int:
+    """
+    Repairs an `exit_distance_field` in place after the cell at index has become a wall or
+    stopped being an exit, in the style of the increase step of D* Lite.
+
+    First the cells whose every shortest route went through index are found, level by level
+    outwards from it: a cell is affected when none of its unaffected neighbours is one step
+    closer to an exit. Only those cells are then settled again, smallest distance first,
+    starting from the best distance their unaffected neighbours offer.
+
+    Args:
+        layout(GridLayout): The maze with the change already made.
+        distances(array): The distance field from before the change.
+        index(int): Flat index of the changed cell.
+
+    Returns:
+        int: The number of cells whose distance changed.
+
+    Complexity:
+        Best Case Complexity: O(1) when no cell depended on index.
+        Worst Case Complexity: O(A log A) where A is the number of cells that depended on index.
+    """
+    old: int = distances[index]
+    if old == UNREACHABLE:
+        return 0
+    frontier: List[int]
+    if layout.is_open(index):
+        frontier = [index]
+    else:
+        # A wall is never a neighbour, so nothing can lean on it once its distance is dropped
+        distances[index] = UNREACHABLE
+        frontier = [neighbour for neighbour in layout.neighbours(index) if distances[neighbour] == old + 1]
+    affected: set[int] = set()
+    decided: set[int] = set(frontier)
+    while frontier:
+        next_frontier: List[int] = []
+        for cell in frontier:
+            distance: int = distances[cell]
+            if distance > 0 and any(distances[neighbour] == distance - 1 and neighbour not in affected
+                                    for neighbour in layout.neighbours(cell)):
+                continue
+            affected.add(cell)
+            for neighbour in layout.neighbours(cell):
+                if distances[neighbour] == distance + 1 and neighbour not in decided:
+                    decided.add(neighbour)
+                    next_frontier.append(neighbour)
+        frontier = next_frontier
+
+    queue: MinPriorityQueue[int] = MinPriorityQueue(len(affected) + 1)
+    for cell in affected:
+        distances[cell] = UNREACHABLE
+    for cell in affected:
+        best: int = UNREACHABLE
+        for neighbour in layout.neighbours(cell):
+            if neighbour not in affected and distances[neighbour] != UNREACHABLE \
+                    and (best == UNREACHABLE or distances[neighbour] + 1 < best):
+                best = distances[neighbour] + 1
+        if best != UNREACHABLE:
+            distances[cell] = best
+            queue.push(best, cell)
+    while len(queue) > 0:
+        distance, cell = queue.pop()
+        if distance != distances[cell]:
+            continue
+        for neighbour in layout.neighbours(cell):
+            if neighbour in affected and (distances[neighbour] == UNREACHABLE or distances[neighbour] > distance + 1):
+                distances[neighbour] = distance + 1
+                queue.push(distance + 1, neighbour)
+    return len(affected) + (not layout.is_open(index))
+
+
+def reachable_cells(layout: GridLayout, sources: List[int], use_numpy: bool | None = None) -> bytearray:
+    """
+    Every cell that can be reached from any of sources.
+
+    With NumPy the open cells are labelled by connected component with whole-array passes
+    (see `_label_components`) and the components of the sources are picked out in one go.
+    Without it, or for a `LazyLayout` that has no flags to hand over, it is a breadth first
+    flood fill over layout.neighbours.
+
+    Args:
+        layout(GridLayout): The maze to fill.
+        sources(List[int]): Flat indices to fill from, walls among them are ignored.
+        use_numpy(bool | None): Force the NumPy or python version, by default NumPy is used when it is installed.
+
+    Returns:
+        bytearray: 1 for every reachable cell and 0 for the rest, indexed by flat index.
+
+    Raises:
+        ImportError: If use_numpy is True and NumPy is not installed.
+
+    Complexity:
+        Best Case Complexity: O(N) where N is the number of cells in the maze.
+        Worst Case Complexity: O(N) for the flood fill, O(N * R) with NumPy where R is the
+        number of labelling rounds, a handful in practice.
+    """
+    if use_numpy is None:
+        use_numpy = HAVE_NUMPY and not isinstance(layout, LazyLayout)
+    if use_numpy:
+        labels = _label_components(layout.open_cells, layout.cols)
+        chosen = np.zeros(len(layout), dtype=np.uint8)
+        chosen[labels[[source for source in sources if layout.is_open(source)]]] = 1
+        return bytearray(chosen[labels].tobytes())
+
+    reached: bytearray = bytearray(len(layout))
+    frontier: List[int] = []
+    for source in sources:
+        if layout.is_open(source) and not reached[source]:
+            reached[source] = 1
+            frontier.append(source)
+    while frontier:
+        next_frontier: List[int] = []
+        for index in frontier:
+            for neighbour in layout.neighbours(index):
+                if not reached[neighbour]:
+                    reached[neighbour] = 1
+                    next_frontier.append(neighbour)
+        frontier = next_frontier
+    return reached
+
+
+class ComponentIndex:
+    """
+    The connected component of every cell of a layout, worked out once so that whether two
+    cells are joined is answered in O(1). labels[i] is the root cell of i's component (the same
+    root for every cell of a component) and -1 for walls.
+
+    It is built with a union-find over the open cells, or with `_label_components` when NumPy is used.
+    """
+
+    def __init__(self, layout: GridLayout, use_numpy: bool | None = None) -> None:
+        """
+        Args:
+            layout(GridLayout): The maze to label.
+            use_numpy(bool | None): Force the NumPy or python version, by default NumPy is used when it is installed.
+
+        Raises:
+            ImportError: If use_numpy is True and NumPy is not installed.
+
+        Complexity:
+            Best Case Complexity: O(N) where N is the number of cells in the maze.
+            Worst Case Complexity: O(N * α(N)) for the union-find, α being the inverse Ackermann function.
+        """
+        if use_numpy is None:
+            use_numpy = HAVE_NUMPY and not isinstance(layout, LazyLayout)
+        self.labels: array
+        if use_numpy:
+            roots = _label_components(layout.open_cells, layout.cols)
+            roots[np.frombuffer(bytes(layout.open_cells), dtype=np.uint8) == 0] = UNREACHABLE
+            self.labels = array('i')
+            self.labels.frombytes(roots.astype(np.intc).tobytes())
+            return
+
+        parent: array = array('i', range(len(layout)))
+        for index in range(len(layout)):
+            if not layout.is_open(index):
+                continue
+            for neighbour in layout.neighbours(index):
+                # Each edge is seen from both ends, it only needs joining once
+                if neighbour > index:
+                    self._union(parent, index, neighbour)
+        for index in range(len(layout)):
+            parent[index] = self._find(parent, index) if layout.is_open(index) else UNREACHABLE
+        self.labels = parent
+
+    @staticmethod
+    def _find(parent: array, index: int) -> int:
+        """
+        The root of index, halving the path to it on the way.
+
+        Complexity:
+            Best Case Complexity: O(1)
+            Worst Case Complexity: O(α(N)) amortised.
+        """
+        while parent[index] != index:
+            parent[index] = parent[parent[index]]
+            index = parent[index]
+        return index
+
+    @staticmethod
+    def _union(parent: array, first: int, second: int) -> None:
+        """
+        Joins the components of first and second under the smaller of their roots.
+
+        Complexity:
+            Best Case Complexity: O(1)
+            Worst Case Complexity: O(α(N)) amortised.
+        """
+        first = ComponentIndex._find(parent, first)
+        second = ComponentIndex._find(parent, second)
+        if first < second:
+            parent[second] = first
+        elif second < first:
+            parent[first] = second
+
+    def component(self, index: int) -> int:
+        """
+        Complexity:
+            Best Case Complexity: O(1)
+            Worst Case Complexity: O(1)
+        """
+        return self.labels[index]
+
+    def connected(self, first: int, second: int) -> bool:
+        """
+        Whether a route joins the two cells, always False if either is a wall.
+
+        Complexity:
+            Best Case Complexity: O(1)
+            Worst Case Complexity: O(1)
+        """
+        return self.labels[first] != UNREACHABLE and self.labels[first] == self.labels[second]
+
+
+class ClusterGraph:
+    """
+    A hierarchical (HPA*) view of a layout for answering many start to exit queries on one large maze.
+
+    The maze is cut into square clusters. Wherever open cells face each other across the border of
+    two clusters, each run of facing pairs becomes an entrance: its middle pair, or both end pairs
+    when the run is at least ENTRANCE_SPLIT long. The entrance cells and the exits are the nodes
+    of a small abstract graph. Nodes are joined by a single step across each entrance and, inside a
+    cluster, by the length of the shortest path between them that stays in the cluster.
+    A query runs A* over the abstract graph and then fills in every hop with a search inside one cluster.
+
+    Nothing is worked out up front. A cluster's entrances are found the first time a search
+    reaches the cluster and a node's edges the first time it is expanded, so the graph only
+    covers the parts of the maze that queries go through. Paths can only cross between clusters at
+    entrances, so they may be a little longer than the shortest path.
+    """
+    ENTRANCE_SPLIT: int = 6
+
+    def __init__(self, layout: GridLayout, exits: List[int], cluster_size: int = 32) -> None:
+        """
+        Args:
+            layout(GridLayout): The maze to search.
+            exits(List[int]): Flat indices of every exit.
+            cluster_size(int): Width and height of a cluster in cells.
+
+        Complexity:
+            Best Case Complexity: O(E) where E is the number of exits.
+            Worst Case Complexity: O(E)
+        """
+        self.layout: GridLayout = layout
+        self.cols: int = layout.cols
+        self.rows: int = len(layout) // layout.cols if layout.cols else 0
+        self.cluster_size: int = cluster_size
+        self.cluster_cols: int = -(-self.cols // cluster_size)
+        self.exits: set[int] = set(exits)
+        self.exit_cells: List[tuple[int, int]] = [(index // self.cols, index % self.cols) for index in exits]
+        self._cluster_exits: dict[int, List[int]] = {}
+        for index in exits:
+            self._cluster_exits.setdefault(self.cluster_of(index), []).append(index)
+        # Entrances of the border below (key cluster * 2 + 1) or to the right of (key cluster * 2) a cluster
+        self._borders: dict[int, List[tuple[int, int]]] = {}
+        self._nodes: dict[int, List[int]] = {}
+        self._crossings: dict[int, List[int]] = {}
+        self._edges: dict[int, List[tuple[int, int]]] = {}
+
+    def cluster_of(self, index: int) -> int:
+        """
+        Complexity:
+            Best Case Complexity: O(1)
+            Worst Case Complexity: O(1)
+        """
+        row, col = index // self.cols, index % self.cols
+        return (row // self.cluster_size) * self.cluster_cols + col // self.cluster_size
+
+    def _border(self, cluster: int, down: bool) -> List[tuple[int, int]]:
+        """
+        The entrances from cluster to the cluster below it (down) or to its right, as (cell in cluster,
+        cell across) pairs, worked out on first use. Both cells of every pair are recorded in `_crossings`.
+
+        Complexity:
+            Best Case Complexity: O(1) when the border has already been scanned.
+            Worst Case Complexity: O(S) where S is the cluster size.
+        """
+        key: int = cluster * 2 + down
+        if key in self._borders:
+            return self._borders[key]
+        size: int = self.cluster_size
+        top: int = cluster // self.cluster_cols * size
+        left: int = cluster % self.cluster_cols * size
+        pairs: List[tuple[int, int]] = []
+        if down and top + size < self.rows:
+            pairs = [((top + size - 1) * self.cols + col, (top + size) * self.cols + col)
+                     for col in range(left, min(left + size, self.cols))]
+        elif not down and left + size < self.cols:
+            pairs = [(row * self.cols + left + size - 1, row * self.cols + left + size)
+                     for row in range(top, min(top + size, self.rows))]
+        entrances: List[tuple[int, int]] = []
+        run: List[tuple[int, int]] = []
+        for pair in pairs + [(-1, -1)]:
+            if pair[0] != -1 and self.layout.is_open(pair[0]) and self.layout.is_open(pair[1]):
+                run.append(pair)
+                continue
+            if len(run) >= self.ENTRANCE_SPLIT:
+                entrances += [run[0], run[-1]]
+            elif run:
+                entrances.append(run[len(run) // 2])
+            run = []
+        for inside, across in entrances:
+            self._crossings.setdefault(inside, []).append(across)
+            self._crossings.setdefault(across, []).append(inside)
+        self._borders[key] = entrances
+        return entrances
+
+    def cluster_nodes(self, cluster: int) -> List[int]:
+        """
+        The entrance cells on all four sides of cluster and the exits inside it, worked out on first use.
+
+        Complexity:
+            Best Case Complexity: O(1) when the cluster has already been scanned.
+            Worst Case Complexity: O(S + E) where S is the cluster size and E the number of exits in the cluster.
+        """
+        if cluster in self._nodes:
+            return self._nodes[cluster]
+        nodes: List[int] = [inside for inside, _ in self._border(cluster, False) + self._border(cluster, True)]
+        if cluster % self.cluster_cols > 0:
+            nodes += [across for _, across in self._border(cluster - 1, False)]
+        if cluster >= self.cluster_cols:
+            nodes += [across for _, across in self._border(cluster - self.cluster_cols, True)]
+        nodes += self._cluster_exits.get(cluster, [])
+        self._nodes[cluster] = list(dict.fromkeys(nodes))
+        return self._nodes[cluster]
+
+    def _local_distances(self, source: int, target: int = -1) -> dict[int, int]:
+        """
+        Breadth first search from source that never leaves its cluster, stopping early once target is reached.
+
+        Returns:
+            dict[int, int]: The number of steps from source to every cell it reached.
+
+        Complexity:
+            Best Case Complexity: O(1) when target is next to source.
+            Worst Case Complexity: O(S^2) where S is the cluster size.
+        """
+        cluster: int = self.cluster_of(source)
+        distances: dict[int, int] = {source: 0}
+        frontier: List[int] = [source]
+        steps: int = 0
+        while frontier and target not in distances:
+            steps += 1
+            next_frontier: List[int] = []
+            for index in frontier:
+                for neighbour in self.layout.neighbours(index):
+                    if neighbour not in distances and self.cluster_of(neighbour) == cluster:
+                        distances[neighbour] = steps
+                        next_frontier.append(neighbour)
+            frontier = next_frontier
+        return distances
+
+    def _local_edges(self, node: int) -> List[tuple[int, int]]:
+        """
+        (other node, steps) for every node of node's cluster it can reach without leaving the cluster.
+
+        Complexity:
+            Best Case Complexity: O(S^2) where S is the cluster size.
+            Worst Case Complexity: O(S^2)
+        """
+        distances: dict[int, int] = self._local_distances(node)
+        return [(other, distances[other]) for other in self.cluster_nodes(self.cluster_of(node))
+                if other != node and other in distances]
+
+    def edges(self, node: int) -> List[tuple[int, int]]:
+        """
+        The abstract edges of node as (other node, steps), worked out on first use and then cached.
+
+        Complexity:
+            Best Case Complexity: O(1) when the edges are already cached.
+            Worst Case Complexity: O(S^2) where S is the cluster size.
+        """
+        if node not in self._edges:
+            self._edges[node] = self._local_edges(node) + [(across, 1) for across in self._crossings.get(node, [])]
+        return self._edges[node]
+
+    def search(self, start: int) -> tuple[List[int] | None, int]:
+        """
+        A* over the abstract graph from start to the nearest exit by the Manhattan distance,
+        then every hop is filled in with a search inside one cluster.
+
+        Args:
+            start(int): Flat index of the start position.
+
+        Returns:
+            tuple[List[int] | None, int]: the flat indices from start to an exit (None if no exit
+            can be reached) and how many abstract nodes were expanded.
+
+        Complexity:
+            Best Case Complexity: O(S^2) where S is the cluster size, when the graph around the path is already built.
+            Worst Case Complexity: O(N + V * (E + log V)) where N is the number of cells in the maze, V the number
+            of abstract nodes and E the number of exits, building every cluster on the way.
+        """
+        if not self.exits:
+            return None, 0
+
+        def heuristic(index: int) -> int:
+            row, col = index // self.cols, index % self.cols
+            return min(abs(row - exit_row) + abs(col - exit_col) for exit_row, exit_col in self.exit_cells)
+
+        # The start is only a node when it happens to sit on an entrance, otherwise its edges are not kept
+        start_is_node: bool = start in self.cluster_nodes(self.cluster_of(start))
+        cost: dict[int, int] = {start: 0}
+        parent: dict[int, int] = {start: -1}
+        closed: set[int] = set()
+        queue: MinPriorityQueue[tuple[int, int]] = MinPriorityQueue(64)
+        queue.push(heuristic(start), (0, start))
+        expanded: int = 0
+        while len(queue) > 0:
+            _, (g, node) = queue.pop()
+            if node in closed or g != cost[node]:
+                continue  # Stale entry, a cheaper route to this node was queued later
+            closed.add(node)
+            expanded += 1
+            if node in self.exits:
+                return self._refine(parent, node), expanded
+            edges: List[tuple[int, int]] = self.edges(node) if node != start or start_is_node else self._local_edges(node)
+            for other, steps in edges:
+                if other in closed or cost.get(other, g + steps + 1) <= g + steps:
+                    continue
+                cost[other] = g + steps
+                parent[other] = node
+                queue.push(g + steps + heuristic(other), (g + steps, other))
+        return None, expanded
+
+    def _refine(self, parent: dict[int, int], node: int) -> List[int]:
+        """
+        Turns the chain of abstract nodes ending at node into a path of cells, walking every hop inside
+        a cluster back down its local distances.
+
+        Complexity:
+            Best Case Complexity: O(L) where L is the length of the path.
+            Worst Case Complexity: O(H * S^2) where H is the number of hops and S the cluster size.
+        """
+        path: List[int] = [node]
+        while parent[node] != -1:
+            previous: int = parent[node]
+            if self.cluster_of(previous) == self.cluster_of(node):
+                distances: dict[int, int] = self._local_distances(previous, node)
+                index: int = node
+                while index != previous:
+                    index = next(neighbour for neighbour in self.layout.neighbours(index)
+                                 if distances.get(neighbour, -1) == distances[index] - 1)
+                    path.append(index)
+            else:
+                path.append(previous)
+            node = previous
+        path.reverse()
+        return path
+
+
+def _label_components(open_cells: bytearray, cols: int):
+    """
+    Labels every cell with the root of its connected component, a union-find done with
+    whole-array operations. Each round every edge between two open cells whose roots differ
+    hooks the larger root under the smaller one, then every label is followed up to its root
+    (pointer jumping), and edges already inside one component are dropped.
+
+    Raises:
+        ImportError: If NumPy is not installed.
+
+    Complexity:
+        Best Case Complexity: O(N) where N is the number of cells in the maze.
+        Worst Case Complexity: O(N * R) where R is the number of rounds.
+    """
+    if not HAVE_NUMPY:
+        raise ImportError("NumPy is not installed, use use_numpy=False or leave it to pick the python version")
+    size: int = len(open_cells)
+    is_open = np.frombuffer(bytes(open_cells), dtype=np.uint8) != 0
+    index = np.arange(size)
+    right = is_open[:-1] & is_open[1:] & (index[:-1] % cols != cols - 1)
+    down = is_open[:-cols] & is_open[cols:]
+    heads = np.concatenate([index[:-1][right], index[:-cols][down]])
+    tails = np.concatenate([index[1:][right], index[cols:][down]])
+    parent = index.copy()
+    while len(heads):
+        head_roots = parent[heads]
+        tail_roots = parent[tails]
+        apart = head_roots != tail_roots
+        heads, tails = heads[apart], tails[apart]
+        head_roots, tail_roots = head_roots[apart], tail_roots[apart]
+        # np.minimum.at copes with one root being hooked by many edges in the same round
+        np.minimum.at(parent, np.maximum(head_roots, tail_roots), np.minimum(head_roots, tail_roots))
+        while True:
+            grandparent = parent[parent]
+            if np.array_equal(grandparent, parent):
+                break
+            parent = grandparent
+    return parent
+
+
+FLAT_SEARCHES: dict[SearchStrategy, Callable[[GridLayout, int, List[int]], SearchResult]] = {
+    SearchStrategy.BIDIRECTIONAL_BFS: bidirectional_search,
+    SearchStrategy.A_STAR: a_star_search,
+    SearchStrategy.DFS: depth_first_search,
+    SearchStrategy.JUMP_POINT: jump_point_search,
+}
@@ -0,0 +1,139 @@
+from __future__ import annotations
+"""
+A balanced tree of treasures keyed by weight, used by `SpookyHollow`.
+
+Every node also records the highest value / weight ratio in its subtree. The treasures light
+enough for a backpack are then a prefix of the in-order traversal, made of O(log n) whole
+subtrees and nodes along one root to leaf path, so the best of them is found without visiting
+every treasure.
+"""
+from typing import List, Tuple
+
+from betterbst import BetterBST
+from data_structures.node import TreeNode
+from treasure import Treasure
+
+# Treasures are keyed by (weight, position in the original list), so equal weights stay unique keys
+RatioKey = Tuple[int, int]
+
+
+def ratio(treasure: Treasure) -> float:
+    return treasure.value / treasure.weight
+
+
+class RatioTreeNode(TreeNode[RatioKey, Treasure]):
+    """ BST node that also stores the highest ratio found in its subtree. """
+
+    def __init__(self, key: RatioKey, item: Treasure = None, depth: int = 1) -> None:
+        """
+        Complexity:
+            O(1)
+        """
+        super().__init__(key, item, depth)
+        self.max_ratio: float = ratio(item)
+
+
+class RatioTree(BetterBST[RatioKey, Treasure]):
+
+    def __init__(self, treasures: List[Treasure]) -> None:
+        """
+        Builds the balanced tree from treasures.
+
+        Args:
+            treasures(List[Treasure]): The treasures to store.
+
+        Complexity:
+            Best Case Complexity: O(n * log(n))
+            Worst Case Complexity: O(n * log(n))
+            where n is the number of treasures, the cost of building the BetterBST.
+        """
+        super().__init__([((treasure.weight, index), treasure) for index, treasure in enumerate(treasures)])
+
+    def update(self, current: RatioTreeNode) -> None:
+        """
+        Recomputes the highest ratio in the subtree of current from its children.
+
+        Complexity:
+            Best Case Complexity: O(1)
+            Worst Case Complexity: O(1)
+        """
+        current.max_ratio = ratio(current.item)
+        if current.left is not None and current.left.max_ratio > current.max_ratio:
+            current.max_ratio = current.left.max_ratio
+        if current.right is not None and current.right.max_ratio > current.max_ratio:
+            current.max_ratio = current.right.max_ratio
+
+    def insert_aux(self, current: RatioTreeNode, key: RatioKey, item: Treasure, current_depth: int) -> RatioTreeNode:
+        """
+        Inserts like `BinarySearchTree.insert_aux` and updates the ratios on the way back up.
+
+        Complexity:
+            Best Case Complexity: O(CompK) inserting at the root.
+            Worst Case Complexity: O(CompK * D) inserting at the bottom of the tree, D is the depth of the tree.
+        """
+        if current is None:
+            self.length += 1
+            return RatioTreeNode(key, item, current_depth)
+        elif key < current.key:
+            current.left = self.insert_aux(current.left, key, item, current_depth + 1)
+        elif key > current.key:
+            current.right = self.insert_aux(current.right, key, item, current_depth + 1)
+        else:
+            raise ValueError('Inserting duplicate item')
+        self.update(current)
+        return current
+
+    def delete_aux(self, current: RatioTreeNode, key: RatioKey) -> RatioTreeNode | None:
+        """
+        Deletes like `BinarySearchTree.delete_aux`, whose recursive calls come back through here,
+        so every node on the path to the deleted key (and to its successor) gets its ratio updated.
+
+        Complexity:
+            Best Case Complexity: O(CompK) deleting the root when it has at most one child.
+            Worst Case Complexity: O(CompK * D) where D is the depth of the tree.
+        """
+        current = super().delete_aux(current, key)
+        if current is not None:
+            self.update(current)
+        return current
+
+    def best_fitting(self, capacity: int) -> RatioTreeNode | None:
+        """
+        The node holding the highest ratio treasure no heavier than capacity, the lightest of them on ties.
+
+        Going down the tree, a node that fits means its whole left subtree fits too, and only the
+        stored best ratio of that subtree needs to be looked at before moving right. A node that
+        does not fit sends the search left. The chosen subtree is then followed down its best ratios.
+
+        Returns:
+            RatioTreeNode | None: The node, None if nothing fits.
+
+        Complexity:
+            Best Case Complexity: O(1) when the root is too heavy and has no left child.
+            Worst Case Complexity: O(D) where D is the depth of the tree, O(log(n)) for the balanced tree.
+        """
+        best_ratio: float = -1
+        best: RatioTreeNode | None = None
+        # Set when the best so far is somewhere inside a subtree rather than a node on the path
+        best_subtree: RatioTreeNode | None = None
+        current: RatioTreeNode | None = self.root
+        # Candidates are met in increasing weight, so keeping only strictly better ones favours the lightest
+        while current is not None:
+            if current.item.weight <= capacity:
+                if current.left is not None and current.left.max_ratio > best_ratio:
+                    best_ratio, best, best_subtree = current.left.max_ratio, None, current.left
+                if ratio(current.item) > best_ratio:
+                    best_ratio, best, best_subtree = ratio(current.item), current, None
+                current = current.right
+            else:
+                current = current.left
+
+        current = best_subtree
+        while current is not None and best is None:
+            if current.left is not None and current.left.max_ratio == best_ratio:
+                current = current.left
+            elif ratio(current.item) == best_ratio:
+                best = current
+            else:
+                current = current.right
+        return best
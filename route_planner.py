@@ -0,0 +1,182 @@
+from __future__ import annotations
+"""
+Chooses the route through a maze that collects the most treasure, used by `Maze.plan_treasure_route`.
+
+`Maze.take_treasures` walks a path that is already fixed and takes the best treasure that
+still fits from each hollow it passes. The planner picks the path as well. It measures the
+distances between the start and every hollow with one breadth first search from each of
+them, then searches over the order to visit hollows in before heading to the nearest exit.
+
+Routes are grown one hollow at a time. Two routes that end at the same hollow after the same
+set of hollows and have taken the same treasures carry on alike, their value and the capacity
+left are fixed by the treasures, so only the shorter is kept. Routes that took different
+treasures are all kept, a route worth less so far may have room for something better later.
+With few hollows every order of every set of hollows is covered and the best of them is found.
+With more hollows only the best BEAM_WIDTH routes of each length are kept.
+
+Treasures are taken with the same greedy rule as `take_treasures`, so a route is worth
+exactly what `take_treasures` collects along the path the planner returns, including from
+hollows the path only passes through. The order each hollow hands out its treasures in is
+read once with the hollow's own `treasure_order`, which leaves the hollow untouched.
+"""
+from array import array
+from dataclasses import dataclass
+from typing import List
+
+from hollows import Hollow
+from pathfinding import UNREACHABLE, GridLayout, descend_distance_field, exit_distance_field
+from treasure import Treasure
+
+SUBSET_LIMIT: int = 8
+BEAM_WIDTH: int = 64
+
+
+@dataclass
+class Route:
+    value: int
+    length: int
+    capacity: int
+    # Hollows chosen as stops, as a bitmask over the planner's hollow list
+    stops: int
+    # Flat indices of the start and every stop so far
+    nodes: tuple[int, ...]
+    # id of every treasure taken so far
+    taken: frozenset[int]
+
+    def key(self) -> tuple[int, int]:
+        """
+        Routes with more value, then fewer steps, rank higher.
+        """
+        return self.value, -self.length
+
+
+def pick_treasure(order: List[Treasure], capacity: int, taken: set[int] | frozenset[int]) -> Treasure | None:
+    """
+    The treasure `get_optimal_treasure` would hand out from a hollow whose `treasure_order` is order
+    once the treasures with their id in taken are gone.
+
+    Complexity:
+        Best Case Complexity: O(1) when the first treasure fits and has not been taken.
+        Worst Case Complexity: O(T) where T is the number of treasures in order.
+    """
+    for treasure in order:
+        if treasure.weight <= capacity and id(treasure) not in taken:
+            return treasure
+    return None
+
+
+class TreasureRoutePlanner:
+    """
+    Plans the route from start to an exit that collects the most treasure value, see the module docstring.
+    """
+
+    def __init__(self, layout: GridLayout, start: int, exit_distances: array, hollows: dict[int, Hollow]) -> None:
+        """
+        Args:
+            layout(GridLayout): The maze to plan on.
+            start(int): Flat index of the start position.
+            exit_distances(array): The `exit_distance_field` of layout.
+            hollows(dict[int, Hollow]): The hollow at every flat index that has one.
+
+        Complexity:
+            Best Case Complexity: O(N) where N is the number of cells in the maze, when no hollow can be reached.
+            Worst Case Complexity: O(H * N + H * treasure_order) where H is the number of hollows,
+            a breadth first search from every reachable hollow and reading the treasure order of each.
+        """
+        self.layout: GridLayout = layout
+        self.start: int = start
+        self.exit_distances: array = exit_distances
+        self.hollows: dict[int, Hollow] = hollows
+        self.distances: dict[int, array] = {start: exit_distance_field(layout, [start])}
+        self.stops: List[int] = [index for index in hollows if self.distances[start][index] != UNREACHABLE]
+        for index in self.stops:
+            self.distances[index] = exit_distance_field(layout, [index])
+        # A mystical hollow is one object shared by many cells, so it is read once
+        self.orders: dict[int, List[Treasure]] = {}
+        for hollow in hollows.values():
+            if id(hollow) not in self.orders:
+                self.orders[id(hollow)] = hollow.treasure_order()
+        self._legs: dict[tuple[int, int], List[int]] = {}
+
+    def _leg(self, source: int, target: int) -> List[int]:
+        """
+        The cells of a shortest path from source to target, without source. target is the exit nearest
+        to source when it is -1.
+
+        Complexity:
+            Best Case Complexity: O(1) when the leg is cached.
+            Worst Case Complexity: O(L) where L is the length of the leg.
+        """
+        if (source, target) not in self._legs:
+            if target == -1:
+                self._legs[(source, target)] = descend_distance_field(self.layout, self.exit_distances, source)[1:]
+            else:
+                self._legs[(source, target)] = descend_distance_field(self.layout, self.distances[source], target)[-2::-1]
+        return self._legs[(source, target)]
+
+    def _walk(self, route: Route, cells: List[int], stop: int, target: int) -> Route:
+        """
+        route carried on along cells to target, taking a treasure from every hollow on the way with the greedy rule.
+
+        Complexity:
+            Best Case Complexity: O(L) where L is the number of cells, when none of them are hollows.
+            Worst Case Complexity: O(L * T) where T is the most treasures in one hollow.
+        """
+        value, capacity, taken = route.value, route.capacity, set(route.taken)
+        for index in cells:
+            hollow: Hollow | None = self.hollows.get(index)
+            if hollow is None:
+                continue
+            treasure: Treasure | None = pick_treasure(self.orders[id(hollow)], capacity, taken)
+            if treasure is not None:
+                taken.add(id(treasure))
+                value += treasure.value
+                capacity -= treasure.weight
+        return Route(value, route.length + len(cells), capacity, stop, route.nodes + (target,), frozenset(taken))
+
+    def plan(self, backpack_capacity: int, beam_width: int = BEAM_WIDTH) -> List[int] | None:
+        """
+        The route from start to an exit that collects the most treasure value, the shorter route on ties.
+
+        Args:
+            backpack_capacity(int): The capacity `take_treasures` will be given.
+            beam_width(int): How many routes of each length to keep when there are more than SUBSET_LIMIT hollows.
+
+        Returns:
+            List[int] | None: The flat indices of the route from start to an exit, None if no exit can be reached.
+
+        Complexity:
+            Best Case Complexity: O(L) where L is the length of the way out, when no hollow can be reached.
+            Worst Case Complexity: O(H! * H * W) for H up to SUBSET_LIMIT hollows, where W is the cost of walking
+            a leg, when every order of the hollows takes different treasures. It is O(2^H * H^2 * W) when the
+            treasures only depend on which hollows were visited. Otherwise O(H^2 * beam_width * W).
+        """
+        if self.exit_distances[self.start] == UNREACHABLE:
+            return None
+        # The start cell is never a hollow, so nothing is taken before the first leg
+        routes: List[Route] = [Route(0, 1, backpack_capacity, 0, (self.start,), frozenset())]
+        best: Route | None = None
+        while routes:
+            next_routes: dict[tuple[int, int, frozenset[int]], Route] = {}
+            for route in routes:
+                last: int = route.nodes[-1]
+                finished: Route = self._walk(route, self._leg(last, -1), route.stops, -1)
+                if best is None or finished.key() > best.key():
+                    best = finished
+                for i, stop in enumerate(self.stops):
+                    if route.stops >> i & 1:
+                        continue
+                    extended: Route = self._walk(route, self._leg(last, stop), route.stops | 1 << i, stop)
+                    # The treasures taken fix the value and capacity, so only the length can differ
+                    state: tuple[int, int, frozenset[int]] = (extended.stops, i, extended.taken)
+                    kept: Route | None = next_routes.get(state)
+                    if kept is None or extended.length < kept.length:
+                        next_routes[state] = extended
+            routes = list(next_routes.values())
+            if len(self.stops) > SUBSET_LIMIT and len(routes) > beam_width:
+                routes = sorted(routes, key=Route.key, reverse=True)[:beam_width]
+
+        path: List[int] = [self.start]
+        for source, target in zip(best.nodes, best.nodes[1:]):
+            path += self._leg(source, target)
+        return path
@@ -0,0 +1,42 @@
+from __future__ import annotations
+"""
+Temporary maze files for the tests.
+
+`Maze.load_maze_from_file` and the other loaders take names relative to ./mazes, so the files
+are written to a temporary directory, removed again once the test is done, and named by their
+path relative to ./mazes. Nothing is left behind in the mazes directory.
+"""
+import os
+import tempfile
+from typing import List
+from unittest import TestCase
+
+from maze import Maze
+
+MAZE_DIR: str = "mazes"
+
+
+def temp_maze_name(test: TestCase, suffix: str = ".txt") -> str:
+    """
+    The name of a maze file that does not exist yet, in a temporary directory removed when test finishes.
+    """
+    directory: tempfile.TemporaryDirectory = tempfile.TemporaryDirectory()
+    test.addCleanup(directory.cleanup)
+    return os.path.relpath(os.path.join(directory.name, f"maze{suffix}"), MAZE_DIR)
+
+
+def write_rows(test: TestCase, rows: List[str]) -> str:
+    """
+    Writes rows to a temporary maze file and returns its name.
+    """
+    maze_name: str = temp_maze_name(test)
+    with open(os.path.join(MAZE_DIR, maze_name), 'w') as f:
+        f.write("\n".join(rows))
+    return maze_name
+
+
+def load_rows(test: TestCase, rows: List[str], compact: bool = False) -> Maze:
+    """
+    Loads rows with `Maze.load_maze_from_file` through a temporary maze file.
+    """
+    return Maze.load_maze_from_file(write_rows(test, rows), compact=compact)
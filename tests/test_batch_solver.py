@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import io
+import json
+from typing import List
+from unittest import TestCase
+
+from batch_solver import find_maze_files, solve_mazes, task_seed, write_results
+from ed_utils.decorators import number, visibility
+from pathfinding import SearchStrategy
+
+
+class TestBatchSolver(TestCase):
+
+    @number("3.30")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_find_maze_files(self) -> None:
+        from_dir: List[str] = find_maze_files("mazes/task3")
+        self.assertIn("task3/maze1.txt", from_dir)
+        self.assertIn("task3/treasures/maze2.txt", from_dir, "Directories should be searched recursively")
+        self.assertEqual(from_dir, sorted(from_dir))
+        self.assertEqual(find_maze_files("mazes/task3/treasures/*.txt"),
+                         ["task3/treasures/maze1.txt", "task3/treasures/maze2.txt"])
+
+    @number("3.31")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_batch_is_reproducible(self) -> None:
+        maze_names: List[str] = find_maze_files("mazes/task3")
+        out: io.StringIO = io.StringIO()
+        self.assertEqual(write_results(solve_mazes(maze_names, 60, seed=5, workers=2), out), len(maze_names))
+        results: List[dict] = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual([result["maze"] for result in results], maze_names)
+
+        by_name: dict[str, dict] = {result["maze"]: result for result in results}
+        self.assertEqual(by_name["task3/maze3.txt"]["error"], "No treasures found in task3/maze3.txt")
+        self.assertIsNone(by_name["task3/no_valid_exit.txt"]["path_length"])
+        self.assertEqual(by_name["task3/maze1.txt"]["path_length"], 10)
+        self.assertEqual(by_name["task3/maze1.txt"]["seed"], task_seed(5, "task3/maze1.txt"))
+        for result in results:
+            if "error" not in result:
+                self.assertLessEqual(result["total_weight"], 60)
+
+        # A maze solved on its own, in another order and by another strategy gets the same treasures
+        alone: List[dict] = list(solve_mazes(["task3/treasures/maze2.txt"], 60, seed=5, workers=1,
+                                             strategy=SearchStrategy.A_STAR))
+        self.assertEqual(alone[0]["treasures"], by_name["task3/treasures/maze2.txt"]["treasures"])
+
+        # The component check gives up on the maze with no way out before searching it
+        checked: List[dict] = list(solve_mazes(["task3/maze1.txt", "task3/no_valid_exit.txt"], 60, seed=5, workers=1,
+                                               use_components=True))
+        self.assertEqual(checked[0], by_name["task3/maze1.txt"])
+        self.assertIsNone(checked[1]["path_length"])
+        self.assertEqual(checked[1]["nodes_expanded"], 0)
+        self.assertGreater(by_name["task3/no_valid_exit.txt"]["nodes_expanded"], 0)
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+from typing import List
+from unittest import TestCase
+
+from benchmarks.generators import open_room
+from config import Tiles
+from ed_utils.decorators import number, visibility
+from maze import ChunkedGrid, Maze, Position
+from pathfinding import SearchStrategy
+from random_gen import RandomGen
+from tests.maze_files import temp_maze_name, write_rows
+
+
+class TestChunkedMaze(TestCase):
+
+    def assert_same_maze(self, chunked: Maze, maze: Maze) -> None:
+        self.assertIsInstance(chunked.grid, ChunkedGrid)
+        self.assertEqual(str(chunked), str(maze))
+        self.assertEqual(chunked.start_position, maze.start_position)
+        self.assertEqual(chunked.end_positions, maze.end_positions)
+        for i in range(maze.rows):
+            for j in range(maze.cols):
+                self.assertEqual(chunked.is_valid_position(Position(i, j)), maze.is_valid_position(Position(i, j)))
+                self.assertEqual(chunked.get_available_positions(Position(i, j)), maze.get_available_positions(Position(i, j)))
+                if not isinstance(maze.grid[i][j].tile, str):
+                    self.assertEqual(len(chunked.grid[i][j].tile), len(maze.grid[i][j].tile))
+        for strategy in SearchStrategy:
+            self.assertEqual(chunked.find_way_out(strategy), maze.find_way_out(strategy), strategy)
+
+    @number("3.50")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_chunked_matches_compact(self) -> None:
+        for maze_name in ["sample.txt", "sample2.txt", "task3/maze4.txt", "task3/no_valid_exit.txt", "task3/treasures/maze2.txt"]:
+            RandomGen.set_seed(1008)
+            maze: Maze = Maze.load_maze_from_file(maze_name, compact=True)
+            RandomGen.set_seed(1008)
+            chunked: Maze = Maze.load_chunked_maze(maze_name, chunk_size=3, memory_budget=2 * 3 * 3)
+            self.addCleanup(chunked.close)
+            self.assert_same_maze(chunked, maze)
+            self.assertLessEqual(len(chunked.grid.chunks), 2)
+
+    @number("3.51")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_chunked_from_mzb(self) -> None:
+        maze_name: str = write_rows(self, open_room(61, 83, exits=3, wall_chance=0.3, seed=3))
+        mzb_name: str = Maze.convert_to_mzb(maze_name, temp_maze_name(self, ".mzb"))
+        RandomGen.set_seed(1008)
+        maze: Maze = Maze.load_maze_from_file(maze_name, compact=True)
+        RandomGen.set_seed(1008)
+        chunked: Maze = Maze.load_chunked_maze(mzb_name, chunk_size=16, memory_budget=4 * 16 * 16)
+        self.addCleanup(chunked.close)
+        self.assert_same_maze(chunked, maze)
+        self.assertLessEqual(len(chunked.grid.chunks), 4)
+
+    @number("3.52")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_chunked_edits_survive_eviction(self) -> None:
+        maze: Maze = Maze.load_chunked_maze("task3/maze1.txt", chunk_size=2, memory_budget=4)
+        self.assertEqual(maze.grid.max_chunks, 1)
+        self.assertEqual(len(maze.find_way_out()), 10)
+        maze.set_tile(Position(4, 2), Tiles.WALL.value)
+        maze.set_tile(Position(3, 1), Tiles.WALL.value)
+        # Reading the rest of the maze pushes the edited chunks out of the cache
+        reads: int = maze.grid.chunks_read
+        walls: List[Position] = [Position(i, j) for i in range(maze.rows) for j in range(maze.cols)
+                                 if not maze.is_valid_position(Position(i, j))]
+        self.assertGreater(maze.grid.chunks_read, reads)
+        self.assertIn(Position(4, 2), walls)
+        self.assertIn(Position(3, 1), walls)
+        self.assertIsNone(maze.find_way_out())
+        maze.close()
+
+    @number("3.54")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_chunked_maze_closes_its_file(self) -> None:
+        with Maze.load_chunked_maze("task3/maze1.txt", chunk_size=2, memory_budget=4) as maze:
+            self.assertEqual(len(maze.find_way_out()), 10)
+            self.assertIsNotNone(maze.grid._file)
+        self.assertIsNone(maze.grid._file)
+        # A closed maze opens its file again for the next chunk it needs
+        self.assertEqual(len(maze.find_way_out()), 10)
+        maze.close()
+        self.assertIsNone(maze.grid._file)
+
+        compact: Maze = Maze.load_maze_from_file("task3/maze1.txt", compact=True)
+        compact.close()
+        self.assertEqual(len(compact.find_way_out()), 10)
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import os
+from unittest import TestCase
+
+from config import Tiles
+from ed_utils.decorators import number, visibility
+from maze import CompactGrid, Maze, Position
+from maze_binary import read_mzb
+from pathfinding import SearchStrategy
+from random_gen import RandomGen
+from tests.maze_files import temp_maze_name
+
+
+class TestMazeBinary(TestCase):
+
+    def convert(self, maze_name: str) -> str:
+        return Maze.convert_to_mzb(maze_name, temp_maze_name(self, ".mzb"))
+
+    @number("3.40")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_mzb_matches_text_maze(self) -> None:
+        for maze_name in ["sample.txt", "sample2.txt", "task3/maze4.txt", "task3/treasures/maze2.txt"]:
+            mzb_name: str = self.convert(maze_name)
+            RandomGen.set_seed(1008)
+            maze: Maze = Maze.load_maze_from_file(maze_name)
+            RandomGen.set_seed(1008)
+            binary: Maze = Maze.load_maze_from_file(mzb_name)
+            self.assertIsInstance(binary.grid, CompactGrid)
+            self.assertEqual(str(binary), str(maze))
+            self.assertEqual((binary.rows, binary.cols), (maze.rows, maze.cols))
+            self.assertEqual(binary.start_position, maze.start_position)
+            self.assertEqual(binary.end_positions, maze.end_positions)
+            for row, binary_row in zip(maze.grid, binary.grid):
+                for cell, binary_cell in zip(row, binary_row):
+                    self.assertEqual(type(binary_cell.tile), type(cell.tile))
+                    if not isinstance(cell.tile, str):
+                        self.assertEqual(len(binary_cell.tile), len(cell.tile))
+                        self.assertEqual(binary_cell.tile.get_optimal_treasure(100), cell.tile.get_optimal_treasure(100))
+            self.assertEqual(binary.find_way_out(SearchStrategy.A_STAR), maze.find_way_out(SearchStrategy.A_STAR))
+
+    @number("3.41")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_mzb_tiles_are_mapped(self) -> None:
+        mzb_name: str = self.convert("task3/maze1.txt")
+        with open(f"mazes/{mzb_name}", 'rb') as f:
+            on_disk: bytes = f.read()
+        maze: Maze = Maze.load_maze_from_file(mzb_name)
+        self.assertIsInstance(maze.grid.tiles, memoryview)
+        self.assertEqual(len(maze.find_way_out()), 10)
+        # Wall the start in
+        maze.set_tile(Position(3, 1), Tiles.WALL.value)
+        maze.set_tile(Position(4, 2), Tiles.WALL.value)
+        self.assertEqual(maze.grid[3][1].tile, Tiles.WALL.value)
+        self.assertIsNone(maze.find_way_out(SearchStrategy.BIDIRECTIONAL_BFS))
+        with open(f"mazes/{mzb_name}", 'rb') as f:
+            self.assertEqual(f.read(), on_disk, "Editing the grid should not change the file")
+        self.assertEqual(bytes(read_mzb(f"mazes/{mzb_name}").tiles), bytes(Maze.load_maze_from_file(mzb_name).grid.tiles))
+
+    @number("3.42")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_mzb_errors(self) -> None:
+        junk_name: str = temp_maze_name(self, ".mzb")
+        with open(f"mazes/{junk_name}", 'wb') as f:
+            f.write(b"#P.E\n" * 20)
+        with self.assertRaises(ValueError):
+            Maze.load_maze_from_file(junk_name)
+
+        mzb_name: str = self.convert("task3/maze1.txt")
+        with open(f"mazes/{mzb_name}", 'ab') as f:
+            f.write(b"\0")
+        with self.assertRaises(ValueError):
+            Maze.load_maze_from_file(mzb_name)
+
+        with self.assertRaises(ValueError):
+            Maze.convert_to_mzb("task3/maze3.txt", mzb_name)
+        self.assertFalse(os.path.exists(f"mazes/{mzb_name}.tmp"))
@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+from typing import List
+from unittest import TestCase
+
+from config import Tiles
+from ed_utils.decorators import number, visibility
+from hollows import MysticalHollow, SpookyHollow
+from maze import CompactGrid, Maze, MazeCell, Position, VisitStamps
+from random_gen import RandomGen
+from tests.maze_files import write_rows
+
+
+class TestMazeLoading(TestCase):
+
+    @number("3.10")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_load_builds_grid(self) -> None:
+        maze: Maze = Maze.load_maze_from_file("sample.txt")
+        self.assertEqual((maze.rows, maze.cols), (5, 4))
+        self.assertEqual(maze.start_position, Position(1, 1))
+        self.assertEqual(maze.end_positions, [Position(3, 3), Position(4, 0)])
+        self.assertIs(maze.grid[1][1].position, maze.start_position)
+        self.assertEqual(maze.grid[1][1].tile, Tiles.START_POSITION.value)
+        self.assertEqual(maze.grid[0][0].tile, Tiles.WALL.value)
+        self.assertEqual(maze.grid[1][2].tile, " ", "Empty tiles should be stored as a space")
+        self.assertIsInstance(maze.grid[0][1].tile, SpookyHollow)
+        self.assertIsInstance(maze.grid[2][3].tile, MysticalHollow)
+        for i, row in enumerate(maze.grid):
+            for j, cell in enumerate(row):
+                self.assertEqual(cell.position, Position(i, j))
+                self.assertFalse(cell.visited)
+
+    @number("3.11")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_load_shares_mystical_hollow(self) -> None:
+        maze: Maze = Maze.load_maze_from_file("task3/treasures/maze2.txt")
+        mystical: MysticalHollow = maze.grid[1][2].tile
+        for col in range(2, 8):
+            self.assertIs(maze.grid[1][col].tile, mystical)
+
+    @number("3.12")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_load_errors(self) -> None:
+        cases: List[tuple[List[str], str]] = [
+            (["#P#", "#E"], "Uneven columns"),
+            (["#P", "#S"], "Missing start or end position"),
+            (["PP", "ES"], "Multiple start positions"),
+            (["PE", ".."], "No treasures found"),
+            (["PE", "Sx"], "Invalid tile(s) found"),
+        ]
+        for rows, message in cases:
+            maze_name: str = write_rows(self, rows)
+            with self.assertRaises(ValueError) as validated:
+                Maze.validate_maze_file(maze_name)
+            with self.assertRaises(ValueError) as loaded:
+                Maze.load_maze_from_file(maze_name)
+            self.assertIn(message, str(validated.exception))
+            self.assertEqual(str(validated.exception), str(loaded.exception))
+
+    @number("3.13")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_compact_grid_matches_list_grid(self) -> None:
+        for maze_name in ["sample.txt", "sample2.txt", "task3/maze4.txt", "task3/treasures/maze2.txt"]:
+            RandomGen.set_seed(1008)
+            maze: Maze = Maze.load_maze_from_file(maze_name)
+            RandomGen.set_seed(1008)
+            compact: Maze = Maze.load_maze_from_file(maze_name, compact=True)
+            self.assertIsInstance(compact.grid, CompactGrid)
+            self.assertEqual(str(compact), str(maze))
+            self.assertEqual(compact.start_position, maze.start_position)
+            self.assertEqual(compact.end_positions, maze.end_positions)
+            for row, compact_row in zip(maze.grid, compact.grid):
+                for cell, compact_cell in zip(row, compact_row):
+                    self.assertEqual(compact_cell.position, cell.position)
+                    self.assertEqual(type(compact_cell.tile), type(cell.tile))
+                    if isinstance(cell.tile, str):
+                        self.assertEqual(compact_cell.tile, cell.tile)
+                    else:
+                        self.assertEqual(len(compact_cell.tile), len(cell.tile))
+
+    @number("3.14")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_compact_grid_views_write_through(self) -> None:
+        maze: Maze = Maze.load_maze_from_file("sample.txt", compact=True)
+        maze.grid[3][1].visited = True
+        self.assertTrue(maze.grid[3][1].visited)
+        self.assertFalse(maze.grid[3][2].visited)
+        maze.clear_visited()
+        self.assertFalse(maze.grid[3][1].visited)
+
+        hollow: SpookyHollow = maze.grid[0][1].tile
+        maze.grid[1][2].tile = hollow
+        self.assertIs(maze.grid[1][2].tile, hollow)
+        maze.grid[1][2].tile = Tiles.WALL.value
+        self.assertEqual(maze.grid[1][2].tile, Tiles.WALL.value)
+        self.assertNotIn(1 * maze.cols + 2, maze.grid.hollows)
+        with self.assertRaises(IndexError):
+            maze.grid[maze.rows]
+
+    @number("3.15")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_clear_visited_by_generation(self) -> None:
+        maze: Maze = Maze.load_maze_from_file("task3/maze1.txt")
+        maze.find_way_out()
+        self.assertTrue(maze.grid[maze.start_position.row][maze.start_position.col].visited)
+        stamps: bytes = maze.visits.stamps.tobytes()
+        maze.clear_visited()
+        self.assertEqual(maze.visits.stamps.tobytes(), stamps, "Clearing should not touch the stamps")
+        for row in maze.grid:
+            for cell in row:
+                self.assertFalse(cell.visited)
+                self.assertIs(cell.visits, maze.visits)
+
+        maze.grid[1][1].visited = True
+        self.assertTrue(maze.grid[1][1].visited)
+        self.assertTrue(maze.visits.is_visited(maze.cols + 1), "The cell's flag should be at its flat index")
+        maze.grid[1][1].visited = False
+        self.assertFalse(maze.grid[1][1].visited)
+        # Repeated searches from one maze give the same answer
+        self.assertEqual(maze.find_way_out(), maze.find_way_out())
+
+    @number("3.16")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_visit_stamps_wrap_around(self) -> None:
+        visits: VisitStamps = VisitStamps(3)
+        visits.generation = VisitStamps.MAX_GENERATION
+        visits.set_visited(1, True)
+        self.assertTrue(visits.is_visited(1))
+        visits.clear_visited()
+        self.assertEqual(visits.generation, 1)
+        self.assertEqual(list(visits.stamps), [0, 0, 0])
+        self.assertFalse(visits.is_visited(1))
+
+        cell: MazeCell = MazeCell(Tiles.EMPTY.value, Position(0, 0), visited=True)
+        self.assertTrue(cell.visited)
+        self.assertEqual(cell, MazeCell(Tiles.EMPTY.value, Position(0, 0), True))
+        self.assertNotEqual(cell, MazeCell(Tiles.EMPTY.value, Position(0, 0)))
+        cell = MazeCell(Tiles.EMPTY.value, Position(4, 5), visited=True)
+        self.assertTrue(cell.visited)
+        cell.visited = False
+        self.assertFalse(cell.visited)
+
+    @number("3.17")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_positions_are_hashable_and_shared(self) -> None:
+        self.assertEqual(Position(2, 3), Position(2, 3))
+        self.assertNotEqual(Position(2, 3), Position(3, 2))
+        self.assertNotEqual(Position(2, 3), (2, 3))
+        self.assertEqual(str(Position(2, 3)), "(2, 3)")
+        self.assertEqual(len({Position(2, 3), Position(2, 3), Position(3, 2)}), 2)
+        self.assertEqual({Position(2, 3): 1}[Position(2, 3)], 1)
+        self.assertFalse(hasattr(Position(2, 3), "__dict__"))
+        self.assertEqual(Position(2, 3).pack(7), 17)
+        self.assertEqual(Position.unpack(17, 7), Position(2, 3))
+
+        for compact in (False, True):
+            maze: Maze = Maze.load_maze_from_file("task3/maze1.txt", compact=compact)
+            self.assertIs(maze.position_at(17), maze.position_at(17))
+            self.assertEqual(maze.position_at(17), Position.unpack(17, maze.cols))
+            # Every search hands back the same position objects for the same cells
+            first: List[Position] = maze.find_way_out()
+            second: List[Position] = maze.find_way_out()
+            self.assertTrue(all(a is b for a, b in zip(first[1:], second[1:])))
+            maze.clear_visited()
+            self.assertIs(maze.get_available_positions(first[1])[0], maze.get_available_positions(first[1])[0])
+
+        # A list backed grid hands out the positions its cells were built with
+        for maze in (Maze.load_maze_from_file("task3/maze1.txt"), Maze(Position(1, 0), [Position(1, 300)], [Position(0, 2)], [], 3, 301)):
+            for row in maze.grid:
+                for cell in row:
+                    self.assertIs(maze.position_at(cell.position.pack(maze.cols)), cell.position)
+            self.assertTrue(all(step is maze.grid[step.row][step.col].position for step in maze.find_way_out()[1:]))
+
+    @number("3.18")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_cells_tag_hollows(self) -> None:
+        for compact in (False, True):
+            maze: Maze = Maze.load_maze_from_file("sample.txt", compact=compact)
+            hollow: SpookyHollow = maze.grid[0][1].tile
+            self.assertIs(maze.grid[0][1].hollow, hollow)
+            self.assertIsNone(maze.grid[1][2].hollow)
+            maze.grid[1][2].tile = hollow
+            self.assertIs(maze.grid[1][2].hollow, hollow)
+            maze.grid[1][2].tile = Tiles.WALL.value
+            self.assertIsNone(maze.grid[1][2].hollow)
+
+        cell: MazeCell = MazeCell(Tiles.EMPTY.value, Position(0, 0))
+        self.assertFalse(hasattr(cell, "__dict__"))
+        self.assertIsNone(cell.hollow)
+        cell.tile = MysticalHollow()
+        self.assertIsInstance(cell.hollow, MysticalHollow)
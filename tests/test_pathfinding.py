@@ -0,0 +1,600 @@
+from __future__ import annotations
+
+from typing import List
+from unittest import TestCase, skipUnless
+
+import pathfinding
+from benchmarks.generators import open_room, perfect_maze, serpentine
+from config import Tiles
+from hollows import Hollow
+from ed_utils.decorators import number, visibility
+from maze import Maze, Position
+from pathfinding import (HAVE_NUMPY, AdjacencyIndex, ComponentIndex, GridLayout, LazyLayout, MinPriorityQueue, SearchResult,
+                         SearchStrategy, exit_distance_field, jump_point_search)
+from random_gen import RandomGen
+from tests.maze_files import load_rows
+from treasure import Treasure
+
+SOLVABLE_MAZES: List[str] = ["sample.txt", "sample2.txt", "task3/maze1.txt", "task3/maze2.txt", "task3/maze4.txt",
+                             "task3/treasures/maze1.txt", "task3/treasures/maze2.txt"]
+
+
+def maze_from_rows(rows: List[str]) -> Maze:
+    """
+    Builds a maze straight from its rows without any hollows, so layouts that
+    would fail `validate_maze_file` can still be searched.
+    """
+    start: Position | None = None
+    end_positions: List[Position] = []
+    walls: List[Position] = []
+    for i, row in enumerate(rows):
+        for j, tile in enumerate(row):
+            if tile == Tiles.START_POSITION.value:
+                start = Position(i, j)
+            elif tile == Tiles.EXIT.value:
+                end_positions.append(Position(i, j))
+            elif tile == Tiles.WALL.value:
+                walls.append(Position(i, j))
+    return Maze(start, end_positions, walls, [], len(rows), len(rows[0]))
+
+
+class TestPathfinding(TestCase):
+
+    def assert_valid_path(self, maze: Maze, path: List[Position]) -> None:
+        self.assertEqual(path[0], maze.start_position)
+        self.assertIn(path[-1], maze.end_positions)
+        for step in path:
+            self.assertTrue(maze.is_valid_position(step), f"{step} is not a valid position")
+        for step, next_step in zip(path, path[1:]):
+            self.assertEqual(abs(step.row - next_step.row) + abs(step.col - next_step.col), 1,
+                             f"Invalid move from {step} to {next_step}")
+
+    @number("3.20")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_bidirectional_matches_bfs(self) -> None:
+        for maze_name in SOLVABLE_MAZES:
+            for compact in (False, True):
+                maze: Maze = Maze.load_maze_from_file(maze_name, compact=compact)
+                expected: List[Position] = maze.find_way_out()
+                path: List[Position] = maze.find_way_out(SearchStrategy.BIDIRECTIONAL_BFS)
+                self.assert_valid_path(maze, path)
+                self.assertEqual(len(path), len(expected), f"Expected a shortest path in {maze_name}")
+
+    @number("3.21")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_bidirectional_many_exits(self) -> None:
+        maze: Maze = maze_from_rows([
+            "#E#E#####",
+            "#.#.....E",
+            "#P#.###.#",
+            "#.....#.#",
+            "#######E#",
+        ])
+        path: List[Position] = maze.find_way_out(SearchStrategy.BIDIRECTIONAL_BFS)
+        self.assert_valid_path(maze, path)
+        self.assertEqual(path, [Position(2, 1), Position(1, 1), Position(0, 1)])
+
+    @number("3.22")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_bidirectional_no_exit(self) -> None:
+        maze: Maze = Maze.load_maze_from_file("task3/no_valid_exit.txt")
+        self.assertIsNone(maze.find_way_out(SearchStrategy.BIDIRECTIONAL_BFS))
+        # The exit is walled in, so the search gives up before reaching the start area
+        self.assertFalse(maze.grid[3][3].visited)
+        self.assertTrue(maze.grid[1][8].visited)
+
+    @number("3.23")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_a_star_shortest_path(self) -> None:
+        for maze_name in SOLVABLE_MAZES:
+            maze: Maze = Maze.load_maze_from_file(maze_name)
+            expected: List[Position] = maze.find_way_out()
+            path: List[Position] = maze.find_way_out(SearchStrategy.A_STAR)
+            self.assert_valid_path(maze, path)
+            self.assertEqual(len(path), len(expected), f"Expected a shortest path in {maze_name}")
+        maze = Maze.load_maze_from_file("task3/no_valid_exit.txt")
+        self.assertIsNone(maze.find_way_out(SearchStrategy.A_STAR))
+
+    @number("3.24")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_a_star_expands_fewer_cells(self) -> None:
+        maze: Maze = maze_from_rows(["#" * 40] + ["#P" + "." * 37 + "#"] + ["#" + "." * 38 + "#"] * 20
+                                    + ["#" + "." * 37 + "E#", "#" * 40])
+        bfs_path: List[Position] = maze.find_way_out()
+        bfs_expanded: int = maze.nodes_expanded
+        a_star_path: List[Position] = maze.find_way_out(SearchStrategy.A_STAR)
+        self.assertEqual(len(a_star_path), len(bfs_path))
+        # In an open room A* only expands the cells along its path
+        self.assertEqual(maze.nodes_expanded, len(a_star_path))
+        self.assertLess(maze.nodes_expanded, bfs_expanded)
+
+    @number("3.25")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_min_priority_queue(self) -> None:
+        queue: MinPriorityQueue[str] = MinPriorityQueue(1)
+        for priority, item in [(5, "e"), (1, "a"), (3, "c"), (2, "b"), (4, "d"), (1, "z")]:
+            queue.push(priority, item)
+        self.assertEqual(len(queue), 6)
+        popped: List[tuple[int, str]] = [queue.pop() for _ in range(6)]
+        self.assertEqual(popped, [(1, "z"), (1, "a"), (2, "b"), (3, "c"), (4, "d"), (5, "e")])
+
+        # Growing keeps every entry, pushes and pops can be mixed
+        numbers: MinPriorityQueue[int] = MinPriorityQueue(1)
+        for k in range(200):
+            numbers.push(k * 37 % 101, k)
+            if k % 3 == 0:
+                numbers.pop()
+        priorities: List[int] = [numbers.pop()[0] for _ in range(len(numbers))]
+        self.assertEqual(len(priorities), 133)
+        self.assertEqual(priorities, sorted(priorities))
+
+    @number("3.26")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_adjacency_index_matches_grid(self) -> None:
+        for maze_name in SOLVABLE_MAZES:
+            maze: Maze = Maze.load_maze_from_file(maze_name)
+            expected: List[List[List[Position]]] = [[maze.get_available_positions(Position(i, j)) for j in range(maze.cols)]
+                                                    for i in range(maze.rows)]
+            maze.build_adjacency_index()
+            for i in range(maze.rows):
+                for j in range(maze.cols):
+                    if maze.is_valid_position(Position(i, j)):
+                        self.assertEqual(maze.get_available_positions(Position(i, j)), expected[i][j])
+
+        layout: GridLayout = GridLayout(bytearray([1, 1, 0, 1, 1, 1]), 3)
+        index: AdjacencyIndex = AdjacencyIndex(layout.open_cells, 3)
+        for cell in [0, 1, 3, 4, 5]:
+            self.assertEqual(list(index.neighbours(cell)), list(layout.neighbours(cell)))
+        self.assertEqual(list(index.neighbours(2)), [], "Walls should have no neighbours in the index")
+
+    @number("3.27")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_adjacency_index_follows_wall_changes(self) -> None:
+        maze: Maze = maze_from_rows([
+            "#####",
+            "#P..E",
+            "#.#.#",
+            "#...#",
+            "#####",
+        ])
+        maze.build_adjacency_index()
+        self.assertEqual(len(maze.find_way_out(SearchStrategy.BIDIRECTIONAL_BFS)), 4)
+        version: int = maze.layout_version
+        maze.set_tile(Position(1, 2), Tiles.WALL.value)
+        self.assertGreater(maze.layout_version, version)
+        path: List[Position] = maze.find_way_out(SearchStrategy.BIDIRECTIONAL_BFS)
+        self.assert_valid_path(maze, path)
+        self.assertEqual(len(path), 8)
+        for row in maze.grid:
+            for cell in row:
+                cell.visited = False
+        self.assertEqual(maze.get_available_positions(Position(1, 1)), [Position(2, 1)])
+
+        maze.set_tile(Position(1, 4), Tiles.WALL.value)
+        self.assertEqual(maze.end_positions, [])
+        self.assertIsNone(maze.find_way_out(SearchStrategy.A_STAR))
+
+    @number("3.28")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_dfs_finds_a_way_out(self) -> None:
+        for maze_name in SOLVABLE_MAZES:
+            maze: Maze = Maze.load_maze_from_file(maze_name)
+            path: List[Position] = maze.find_way_out(SearchStrategy.DFS)
+            self.assert_valid_path(maze, path)
+            self.assertEqual(len(set(map(str, path))), len(path), "The path should not revisit a cell")
+        maze = Maze.load_maze_from_file("task3/visit_all.txt")
+        self.assertIsNone(maze.find_way_out(SearchStrategy.DFS))
+        for row in maze.grid:
+            for cell in row:
+                if cell.tile == " ":
+                    self.assertTrue(cell.visited, f"Expected {cell.position} to be visited")
+
+    @number("3.29")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_dfs_long_corridor(self) -> None:
+        # About 100k cells with a single 50k step corridor, far beyond the recursion limit
+        maze: Maze = maze_from_rows(serpentine(317, 317))
+        path: List[Position] = maze.find_way_out(SearchStrategy.DFS)
+        self.assert_valid_path(maze, path)
+        self.assertGreater(len(path), 49000)
+        self.assertEqual(maze.nodes_expanded, len(path))
+
+    @number("3.32")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_distance_field_matches_bfs(self) -> None:
+        for maze_name in SOLVABLE_MAZES:
+            maze: Maze = Maze.load_maze_from_file(maze_name)
+            for i in range(maze.rows):
+                for j in range(maze.cols):
+                    if not maze.is_valid_position(Position(i, j)):
+                        self.assertIsNone(maze.distance_to_exit(Position(i, j)))
+                        continue
+                    maze.start_position = Position(i, j)
+                    expected: List[Position] | None = maze.find_way_out()
+                    path: List[Position] | None = maze.find_way_out(SearchStrategy.DISTANCE_FIELD)
+                    if expected is None:
+                        self.assertIsNone(path)
+                        self.assertIsNone(maze.distance_to_exit(Position(i, j)))
+                        continue
+                    self.assert_valid_path(maze, path)
+                    self.assertEqual(len(path), len(expected))
+                    self.assertEqual(maze.distance_to_exit(Position(i, j)), len(path) - 1)
+                    self.assertEqual(maze.nodes_expanded, len(path))
+
+    @number("3.33")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_distance_field_follows_wall_changes(self) -> None:
+        maze: Maze = maze_from_rows([
+            "#####",
+            "#P..E",
+            "#.#.#",
+            "#...#",
+            "#####",
+        ])
+        self.assertEqual(maze.distance_to_exit(maze.start_position), 3)
+        distances = maze.exit_distances()
+        self.assertIs(maze.exit_distances(), distances, "The distance field should be cached")
+        maze.set_tile(Position(1, 2), Tiles.WALL.value)
+        self.assertEqual(maze.distance_to_exit(maze.start_position), 7)
+        self.assertEqual(len(maze.find_way_out(SearchStrategy.DISTANCE_FIELD)), 8)
+        maze.set_tile(Position(1, 4), Tiles.WALL.value)
+        self.assertIsNone(maze.distance_to_exit(maze.start_position))
+        self.assertIsNone(maze.find_way_out(SearchStrategy.DISTANCE_FIELD))
+
+    @number("3.34")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_wall_changes_repair_distances(self) -> None:
+        for k, rows in enumerate([perfect_maze(21, 31, exits=3), open_room(21, 31, exits=3, wall_chance=0.2)]):
+            for compact in (False, True):
+                maze: Maze = maze_from_rows(rows)
+                if compact:
+                    maze = load_rows(self, rows, compact=True)
+                maze.exit_distances()
+                RandomGen.set_seed(34)
+                for _ in range(150):
+                    position: Position = Position(RandomGen.randint(0, maze.rows - 1), RandomGen.randint(0, maze.cols - 1))
+                    if position == maze.start_position:
+                        continue
+                    tile: str = maze.grid[position.row][position.col].tile
+                    if tile == Tiles.WALL.value:
+                        path: List[Position] | None = maze.clear_wall(position, Tiles.EXIT.value if RandomGen.random_chance(0.1) else " ")
+                    else:
+                        path = maze.set_wall(position)
+                    expected = exit_distance_field(GridLayout(bytearray(cell.tile != Tiles.WALL.value for row in maze.grid for cell in row), maze.cols),
+                                                   [end.row * maze.cols + end.col for end in maze.end_positions])
+                    self.assertEqual(list(maze.exit_distances()), list(expected))
+                    shortest: List[Position] | None = maze.find_way_out()
+                    if shortest is None:
+                        self.assertIsNone(path)
+                    else:
+                        self.assert_valid_path(maze, path)
+                        self.assertEqual(len(path), len(shortest))
+
+    @number("3.35")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_wall_changes_keep_layout(self) -> None:
+        maze: Maze = maze_from_rows([
+            "#####",
+            "#P..E",
+            "#.#.#",
+            "#...#",
+            "#####",
+        ])
+        self.assertEqual(len(maze.find_way_out(SearchStrategy.DISTANCE_FIELD)), 4)
+        distances = maze.exit_distances()
+        self.assertEqual(len(maze.set_wall(Position(1, 2))), 8)
+        self.assertIs(maze.exit_distances(), distances, "The distances should be repaired in place")
+        self.assertEqual(maze.distance_to_exit(Position(1, 3)), 1)
+        self.assertIsNone(maze.set_wall(Position(3, 2)))
+        self.assertIsNone(maze.distance_to_exit(Position(3, 1)))
+        self.assertEqual(len(maze.clear_wall(Position(1, 2))), 4)
+        path: List[Position] = maze.clear_wall(Position(2, 2), Tiles.EXIT.value)
+        self.assertEqual((len(path), path[-1]), (3, Position(2, 2)))
+        self.assertIn(Position(2, 2), maze.end_positions)
+        self.assertIs(maze.exit_distances(), distances)
+        for position in (Position(1, 2), Position(2, 2), Position(1, 1)):
+            with self.assertRaises(ValueError):
+                maze.clear_wall(position)
+        self.assertEqual(maze.grid[1][2].tile, " ")
+        self.assertIn(Position(2, 2), maze.end_positions)
+        self.assertIs(maze.exit_distances(), distances, "A rejected change should leave the distances alone")
+
+    @number("3.36")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_reachable_cells(self) -> None:
+        maze: Maze = Maze.load_maze_from_file("task3/no_valid_exit.txt")
+        self.assertEqual(maze.reachable_exits(), [])
+        maze = Maze.load_maze_from_file("sample.txt")
+        self.assertEqual(maze.reachable_exits(), [Position(3, 3)], "The exit at (4, 0) is walled in")
+        self.assertEqual(maze.reachable_hollows(), [Position(0, 1), Position(2, 3)])
+
+        maze = maze_from_rows(serpentine(41, 61))
+        maze.set_tile(Position(3, 59), Tiles.WALL.value)
+        for use_numpy in [False, True] if HAVE_NUMPY else [False]:
+            reached: bytearray = maze.reachable_cells(use_numpy=use_numpy)
+            self.assertEqual(maze.reachable_exits(use_numpy=use_numpy), [])
+            self.assertEqual(sum(reached), 59 + 1, "Only the first corridor and its gap should be reachable")
+            reached = maze.reachable_cells(maze.end_positions[0], use_numpy=use_numpy)
+            self.assertFalse(reached[maze.start_position.row * maze.cols + maze.start_position.col])
+
+    @number("3.37")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @skipUnless(HAVE_NUMPY, "NumPy is not installed")
+    def test_reachable_cells_numpy_matches_python(self) -> None:
+        for rows in [perfect_maze(41, 61, exits=3), open_room(41, 61, exits=3, wall_chance=0.4), serpentine(41, 61)]:
+            maze: Maze = maze_from_rows(rows)
+            for i in range(0, maze.rows, 7):
+                for j in range(0, maze.cols, 5):
+                    self.assertEqual(maze.reachable_cells(Position(i, j), use_numpy=True),
+                                     maze.reachable_cells(Position(i, j), use_numpy=False))
+
+    @number("3.38")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_unsolvable_maze_short_circuits(self) -> None:
+        maze: Maze = Maze.load_maze_from_file("task3/no_valid_exit.txt")
+        self.assertFalse(maze.can_exit())
+        self.assertTrue(maze.can_exit(Position(1, 8)))
+        for strategy in SearchStrategy:
+            self.assertIsNone(maze.find_way_out(strategy, use_components=True))
+            self.assertEqual(maze.nodes_expanded, 0)
+            self.assertFalse(any(cell.visited for row in maze.grid for cell in row))
+        # Without the check the search still visits everything it can reach
+        self.assertIsNone(maze.find_way_out())
+        self.assertTrue(maze.grid[maze.start_position.row][maze.start_position.col].visited)
+
+        maze = maze_from_rows([
+            "#####",
+            "#P#.E",
+            "#.#.#",
+            "#...#",
+            "#####",
+        ])
+        self.assertTrue(maze.can_exit())
+        maze.set_tile(Position(3, 2), Tiles.WALL.value)
+        self.assertFalse(maze.can_exit())
+        self.assertEqual(maze.reachable_exits(), [])
+        self.assertIsNone(maze.find_way_out(SearchStrategy.A_STAR, use_components=True))
+        maze.set_tile(Position(3, 2), " ")
+        self.assertEqual(len(maze.find_way_out(use_components=True)), 8)
+
+    @number("3.39")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_component_index(self) -> None:
+        for rows in [perfect_maze(21, 31, exits=3), open_room(21, 31, exits=3, wall_chance=0.45), serpentine(21, 31)]:
+            maze: Maze = maze_from_rows(rows)
+            layout: GridLayout = maze._search_layout()
+            modes: List[bool] = [False, True] if HAVE_NUMPY else [False]
+            for use_numpy in modes:
+                components: ComponentIndex = ComponentIndex(layout, use_numpy)
+                for index in range(len(layout)):
+                    reached: bytearray = maze.reachable_cells(Position(index // maze.cols, index % maze.cols), use_numpy=False)
+                    if not layout.is_open(index):
+                        self.assertEqual(components.component(index), -1)
+                        continue
+                    # Every component is labelled by its smallest cell
+                    self.assertEqual(components.component(index), reached.find(1))
+
+    @number("3.43")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_jump_point_shortest_path(self) -> None:
+        for maze_name in SOLVABLE_MAZES:
+            for compact in (False, True):
+                maze: Maze = Maze.load_maze_from_file(maze_name, compact=compact)
+                expected: List[Position] = maze.find_way_out()
+                path: List[Position] = maze.find_way_out(SearchStrategy.JUMP_POINT)
+                self.assert_valid_path(maze, path)
+                self.assertEqual(len(path), len(expected), f"Expected a shortest path in {maze_name}")
+        for wall_chance in (0, 0.1, 0.3):
+            for seed in range(5):
+                maze = maze_from_rows(open_room(15, 23, exits=2, wall_chance=wall_chance, seed=seed))
+                expected = maze.find_way_out()
+                path = maze.find_way_out(SearchStrategy.JUMP_POINT)
+                self.assertEqual(path is None, expected is None)
+                if path is not None:
+                    self.assert_valid_path(maze, path)
+                    self.assertEqual(len(path), len(expected), f"Expected a shortest path with seed {seed}")
+        maze = maze_from_rows(perfect_maze(21, 31, exits=3))
+        maze.build_adjacency_index()
+        path = maze.find_way_out(SearchStrategy.JUMP_POINT)
+        self.assert_valid_path(maze, path)
+        self.assertEqual(len(path), len(maze.find_way_out()))
+        maze = Maze.load_maze_from_file("task3/no_valid_exit.txt")
+        self.assertIsNone(maze.find_way_out(SearchStrategy.JUMP_POINT))
+
+    @number("3.44")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_jump_point_skips_straight_runs(self) -> None:
+        maze: Maze = maze_from_rows(["#" * 40] + ["#P" + "." * 37 + "#"] + ["#" + "." * 38 + "#"] * 20
+                                    + ["#" + "." * 37 + "E#", "#" * 40])
+        a_star_path: List[Position] = maze.find_way_out(SearchStrategy.A_STAR)
+        path: List[Position] = maze.find_way_out(SearchStrategy.JUMP_POINT)
+        self.assert_valid_path(maze, path)
+        self.assertEqual(len(path), len(a_star_path))
+        # The start, the corner of the L and the exit, the runs between them are filled back in
+        self.assertEqual(maze.nodes_expanded, 3)
+        self.assertTrue(maze.grid[22][38].visited)
+        self.assertFalse(maze.grid[11][20].visited)
+
+        # Finding the marked stops along a row gives the same jump points as stepping along it cell by cell
+        for wall_chance in (0, 0.1, 0.3):
+            for seed in range(5):
+                rows: List[str] = open_room(17, 25, exits=3, wall_chance=wall_chance, seed=seed)
+                tiles: str = "".join(rows)
+                layout: GridLayout = GridLayout(bytearray(tile != Tiles.WALL.value for tile in tiles), 25)
+                stepped: LazyLayout = LazyLayout(len(layout), 25, layout.is_open)
+                exits: List[int] = [index for index, tile in enumerate(tiles) if tile == Tiles.EXIT.value]
+                start: int = tiles.index(Tiles.START_POSITION.value)
+                found: SearchResult = jump_point_search(layout, start, exits)
+                expected_result: SearchResult = jump_point_search(stepped, start, exits)
+                self.assertEqual((found.path, found.expanded), (expected_result.path, expected_result.expanded))
+
+    @number("3.45")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_hierarchical_finds_a_way_out(self) -> None:
+        for maze_name in SOLVABLE_MAZES:
+            maze: Maze = Maze.load_maze_from_file(maze_name)
+            expected: List[Position] = maze.find_way_out()
+            path: List[Position] = maze.find_way_out(SearchStrategy.HIERARCHICAL)
+            self.assert_valid_path(maze, path)
+            self.assertEqual(len(path), len(expected), f"Expected a shortest path in {maze_name}")
+        for rows in [perfect_maze(41, 41, exits=3), open_room(41, 57, exits=3), open_room(41, 57, exits=3, wall_chance=0.3), serpentine(21, 31)]:
+            maze = maze_from_rows(rows)
+            for cluster_size in (3, 8):
+                maze.invalidate_layout()
+                maze.cluster_graph(cluster_size)
+                expected = maze.find_way_out()
+                path = maze.find_way_out(SearchStrategy.HIERARCHICAL)
+                self.assertEqual(path is None, expected is None)
+                if path is not None:
+                    self.assert_valid_path(maze, path)
+                    self.assertGreaterEqual(len(path), len(expected))
+        maze = Maze.load_maze_from_file("task3/no_valid_exit.txt")
+        self.assertIsNone(maze.find_way_out(SearchStrategy.HIERARCHICAL))
+
+    @number("3.46")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_hierarchical_graph_is_cached(self) -> None:
+        maze: Maze = maze_from_rows(perfect_maze(41, 41, exits=2))
+        clusters = maze.cluster_graph(8)
+        first: List[Position] = maze.find_way_out(SearchStrategy.HIERARCHICAL)
+        built: int = len(clusters._edges)
+        self.assertGreater(built, 0)
+        # Only the clusters the search went through are filled in
+        self.assertLess(len(clusters._nodes), 25)
+        self.assertEqual(maze.find_way_out(SearchStrategy.HIERARCHICAL), first)
+        self.assertIs(maze.cluster_graph(), clusters)
+        self.assertEqual(len(clusters._edges), built)
+
+        # Moving the start reuses the graph, changing the walls rebuilds it
+        maze.start_position = first[len(first) // 2]
+        self.assert_valid_path(maze, maze.find_way_out(SearchStrategy.HIERARCHICAL))
+        self.assertIs(maze.cluster_graph(), clusters)
+        maze.set_tile(first[-2], Tiles.WALL.value)
+        self.assertIsNot(maze.cluster_graph(), clusters)
+        path: List[Position] | None = maze.find_way_out(SearchStrategy.HIERARCHICAL)
+        expected: List[Position] | None = maze.find_way_out()
+        self.assertEqual(path is None, expected is None)
+
+    @number("3.47")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_ways_out_ranked_by_length(self) -> None:
+        maze: Maze = maze_from_rows([
+            "#E#E#####",
+            "#.#.....E",
+            "#P#.###.#",
+            "#.....#.#",
+            "#######E#",
+        ])
+        paths: List[List[Position]] = maze.find_ways_out()
+        self.assertEqual([path[-1] for path in paths], [Position(0, 1), Position(0, 3), Position(1, 8), Position(4, 7)])
+        self.assertEqual([len(path) for path in paths], [3, 7, 11, 13])
+        for path in paths:
+            self.assert_valid_path(maze, path)
+            maze.end_positions, end_positions = [path[-1]], maze.end_positions
+            self.assertEqual(len(path), len(maze.find_way_out(SearchStrategy.A_STAR)))
+            maze.end_positions = end_positions
+        all_expanded: int = maze.nodes_expanded
+        self.assertEqual(maze.find_ways_out(k=2), paths[:2])
+        self.assertLess(maze.nodes_expanded, all_expanded)
+
+        maze = Maze.load_maze_from_file("task3/no_valid_exit.txt")
+        self.assertEqual(maze.find_ways_out(), [])
+
+    @number("3.48")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_ways_out_ranked_by_treasure(self) -> None:
+        maze: Maze = load_rows(self, [
+            "##########",
+            "#P......E#",
+            "#.########",
+            "#.S.....E#",
+            "##########",
+        ])
+        hollow = maze.grid[3][2].tile
+        treasures: int = len(hollow)
+        by_length: List[List[Position]] = maze.find_ways_out()
+        self.assertEqual([path[-1] for path in by_length], [Position(1, 8), Position(3, 8)])
+        by_value: List[List[Position]] = maze.find_ways_out(backpack_capacity=1000)
+        self.assertEqual(by_value, by_length[::-1])
+        self.assertEqual(maze.find_ways_out(k=1, backpack_capacity=1000), by_value[:1])
+        # Nothing fits, so both paths are worth nothing and the shorter one comes first
+        self.assertEqual(maze.find_ways_out(backpack_capacity=0), by_length)
+        self.assertEqual(len(hollow), treasures, "Ranking should not take any treasures")
+
+    @number("3.49")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_ways_out_ranked_by_mystical_treasure(self) -> None:
+        maze: Maze = load_rows(self, [
+            "##########",
+            "#P......E#",
+            "#.########",
+            "#.M.M.S.E#",
+            "##########",
+        ])
+        mystical: Hollow = maze.grid[3][2].hollow
+        self.assertIs(maze.grid[3][4].hollow, mystical, "Mystical hollows are shared")
+        treasures: int = len(mystical)
+        by_value: List[List[Position]] = maze.find_ways_out(backpack_capacity=150)
+        self.assertEqual([path[-1] for path in by_value], [Position(3, 8), Position(1, 8)])
+        self.assertEqual(len(mystical), treasures, "Ranking should not take any treasures")
+
+        planned: int = maze._treasure_value(by_value[0], 150, {})
+        taken: List[Treasure] = maze.take_treasures([maze.grid[position.row][position.col] for position in by_value[0]], 150)
+        self.assertEqual(sum(treasure.value for treasure in taken), planned)
+
+    @number("3.53")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_direct_tile_edits_reach_the_caches(self) -> None:
+        rows: List[str] = [
+            "#####",
+            "#P..E",
+            "#.#.#",
+            "#S..#",
+            "#####",
+        ]
+        for maze in (maze_from_rows(rows), load_rows(self, rows, compact=True)):
+            maze.build_adjacency_index()
+            self.assertEqual(len(maze.find_way_out(SearchStrategy.DISTANCE_FIELD)), 4)
+            maze.grid[1][2].tile = Tiles.WALL.value
+            for strategy in (SearchStrategy.BIDIRECTIONAL_BFS, SearchStrategy.DISTANCE_FIELD):
+                maze.clear_visited()
+                path: List[Position] = maze.find_way_out(strategy)
+                self.assert_valid_path(maze, path)
+                self.assertNotIn(Position(1, 2), path)
+                self.assertEqual(len(path), 8)
+            maze.grid[1][4].tile = Tiles.WALL.value
+            self.assertEqual(maze.end_positions, [])
+            self.assertIsNone(maze.find_way_out(SearchStrategy.DISTANCE_FIELD))
+
+    @number("3.55")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_bfs_rebuilds_the_adjacency_index(self) -> None:
+        maze: Maze = maze_from_rows([
+            "#####",
+            "#P..E",
+            "#.#.#",
+            "#...#",
+            "#####",
+        ])
+        maze.build_adjacency_index()
+        self.assertEqual(len(maze.find_way_out(SearchStrategy.BFS)), 4)
+        self.assertIsInstance(maze._layout, AdjacencyIndex)
+        maze.set_tile(Position(1, 2), Tiles.WALL.value)
+        self.assertIsNone(maze._layout, "A wall edit should drop the index")
+        maze.clear_visited()
+        path: List[Position] = maze.find_way_out(SearchStrategy.BFS)
+        self.assert_valid_path(maze, path)
+        self.assertEqual(len(path), 8)
+        self.assertIsInstance(maze._layout, AdjacencyIndex, "BFS should be back on the index")
+
+    @number("3.56")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_forcing_numpy_without_it(self) -> None:
+        self.addCleanup(setattr, pathfinding, "HAVE_NUMPY", pathfinding.HAVE_NUMPY)
+        pathfinding.HAVE_NUMPY = False
+        maze: Maze = maze_from_rows(serpentine(11, 15))
+        self.assertEqual(maze.reachable_cells(), maze.reachable_cells(use_numpy=False), "The python version should be picked")
+        with self.assertRaises(ImportError):
+            maze.reachable_cells(use_numpy=True)
+        with self.assertRaises(ImportError):
+            ComponentIndex(maze._search_layout(), use_numpy=True)
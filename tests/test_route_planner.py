@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+from itertools import permutations
+from typing import List
+from unittest import TestCase
+
+from benchmarks.generators import open_room
+from ed_utils.decorators import number, visibility
+from hollows import Hollow
+from maze import Maze, MazeCell, Position
+from pathfinding import SearchStrategy
+from random_gen import RandomGen
+from route_planner import Route, TreasureRoutePlanner
+from tests.maze_files import load_rows
+from treasure import Treasure
+
+
+class TestRoutePlanner(TestCase):
+
+    def assert_planned(self, maze: Maze, backpack_capacity: int) -> List[Position]:
+        """
+        Plans a route, checks it is a way out and that take_treasures collects what it was planned for.
+        """
+        hollows: List[tuple[Position, int]] = [(position, len(maze.grid[position.row][position.col].hollow))
+                                               for position in maze.reachable_hollows()]
+        route: List[Position] = maze.plan_treasure_route(backpack_capacity)
+        self.assertEqual(route[0], maze.start_position)
+        self.assertIn(route[-1], maze.end_positions)
+        for step, next_step in zip(route, route[1:]):
+            self.assertTrue(maze.is_valid_position(next_step))
+            self.assertEqual(abs(step.row - next_step.row) + abs(step.col - next_step.col), 1)
+        self.assertEqual([(position, len(maze.grid[position.row][position.col].hollow)) for position, _ in hollows], hollows,
+                         "Planning should not take any treasures")
+
+        shortest: List[Position] = maze.find_way_out(SearchStrategy.DISTANCE_FIELD)
+        planned: int = maze._treasure_value(route, backpack_capacity, {})
+        self.assertGreaterEqual(planned, maze._treasure_value(shortest, backpack_capacity, {}))
+        cells: List[MazeCell] = [maze.grid[position.row][position.col] for position in route]
+        treasures: List[Treasure] = maze.take_treasures(cells, backpack_capacity) or []
+        self.assertEqual(sum(treasure.value for treasure in treasures), planned)
+        self.assertLessEqual(sum(treasure.weight for treasure in treasures), backpack_capacity)
+        return route
+
+    @number("3.60")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_route_detours_for_treasure(self) -> None:
+        rows: List[str] = [
+            "##########",
+            "#P......E#",
+            "#.########",
+            "#.S......#",
+            "##########",
+        ]
+        maze: Maze = load_rows(self, rows)
+        self.assertEqual(len(maze.plan_treasure_route(0)), 8, "With nothing to carry the shortest way out is best")
+        route: List[Position] = self.assert_planned(maze, 1000)
+        self.assertIn(Position(3, 2), route)
+        self.assertEqual(len(route), 14)
+
+        maze = Maze.load_maze_from_file("task3/no_valid_exit.txt")
+        self.assertIsNone(maze.plan_treasure_route(100))
+
+    @number("3.61")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_route_matches_take_treasures(self) -> None:
+        for maze_name in ["sample.txt", "sample2.txt", "task3/maze1.txt", "task3/maze4.txt",
+                          "task3/treasures/maze1.txt", "task3/treasures/maze2.txt"]:
+            for backpack_capacity in (5, 20, 60, 200):
+                RandomGen.set_seed(backpack_capacity)
+                self.assert_planned(Maze.load_maze_from_file(maze_name), backpack_capacity)
+
+    @number("3.62")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_route_with_many_hollows(self) -> None:
+        maze: Maze = load_rows(self, open_room(15, 21, exits=2, hollows=12, wall_chance=0.2))
+        self.assertGreater(len(maze.reachable_hollows()), 8, "Enough hollows for the beam search")
+        for backpack_capacity in (20, 100):
+            self.assert_planned(maze, backpack_capacity)
+
+    @number("3.63")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_planning_keeps_equal_ratio_order(self) -> None:
+        # Every treasure has ratio 2, so only the mystical hollow's tie break decides which comes out first
+        def treasure_gen(_): return [Treasure(10, 5), Treasure(20, 10), Treasure(6, 3), Treasure(30, 15)]
+        self.addCleanup(setattr, Hollow, "gen_treasures", Hollow.__dict__["gen_treasures"])
+        Hollow.gen_treasures = treasure_gen
+        rows: List[str] = [
+            "#########",
+            "#P.M.M.E#",
+            "#########",
+        ]
+        for backpack_capacity in (12, 13, 30):
+            maze: Maze = load_rows(self, rows)
+            mystical: Hollow = maze.grid[1][3].hollow
+            order: List[Treasure] = mystical.treasure_order()
+            route: List[Position] = maze.plan_treasure_route(backpack_capacity)
+            self.assertEqual(mystical.treasure_order(), order, "Planning should not reorder equal ratios")
+            planned: int = maze._treasure_value(route, backpack_capacity, {})
+            cells: List[MazeCell] = [maze.grid[position.row][position.col] for position in route]
+            taken: List[Treasure] = maze.take_treasures(cells, backpack_capacity)
+            self.assertEqual(sum(treasure.value for treasure in taken), planned)
+
+            # The same maze left unplanned hands out the same treasures along the route
+            unplanned: Maze = load_rows(self, rows)
+            cells = [unplanned.grid[position.row][position.col] for position in route]
+            self.assertEqual(unplanned.take_treasures(cells, backpack_capacity), taken)
+
+    @number("3.64")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_route_is_the_best_order(self) -> None:
+        # In each of these the best route is worth less than another route through the same hollows
+        # in a different order until it reaches a later hollow, so keeping one route per set and last hollow loses it
+        for seed in (0, 4, 56):
+            for backpack_capacity in (30, 80):
+                RandomGen.set_seed(seed)
+                maze: Maze = load_rows(self, open_room(9, 11, exits=2, hollows=5, wall_chance=0.2, seed=seed))
+                hollows: dict[int, Hollow] = {maze._index_of(position): maze.grid[position.row][position.col].hollow
+                                              for position in maze.reachable_hollows()}
+                planner: TreasureRoutePlanner = TreasureRoutePlanner(maze._search_layout(), maze._index_of(maze.start_position),
+                                                                     maze.exit_distances(), hollows)
+                best: int = 0
+                for count in range(len(planner.stops) + 1):
+                    for order in permutations(planner.stops, count):
+                        route: Route = Route(0, 1, backpack_capacity, 0, (planner.start,), frozenset())
+                        for stop in order:
+                            route = planner._walk(route, planner._leg(route.nodes[-1], stop), 0, stop)
+                        route = planner._walk(route, planner._leg(route.nodes[-1], -1), 0, -1)
+                        best = max(best, route.value)
+                planned: List[Position] = maze.plan_treasure_route(backpack_capacity)
+                self.assertEqual(maze._treasure_value(planned, backpack_capacity, {}), best,
+                                 f"seed {seed} capacity {backpack_capacity} missed the best order")
+                self.assert_planned(maze, backpack_capacity)
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
-from typing import List
+from fractions import Fraction
+from typing import Callable, List
 from unittest import TestCase
 
 from ed_utils.decorators import number, visibility
 from hollows import Hollow, MysticalHollow, SpookyHollow
-from treasure import Treasure
+from random_gen import RandomGen
+from treasure import Treasure, generate_treasure_arrays, treasures_from_arrays
 
 
 class TestTask2(TestCase):
@@ -91,3 +93,163 @@ class TestTask2(TestCase):
         for _ in range(10):
             self.assertIsNone(mystical_hollow.get_optimal_treasure(1), "Expected None as the only treasures are heavier than provided backpack capacity")
             self.assertIsNone(mystical_hollow.get_optimal_treasure(0), "Expected None as the only treasures are heavier than provided backpack capacity")
+
+    @number("2.5")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_optimal_treasure_with_two_children(self) -> None:
+        # Ratios 1 to 7, the light treasure with ratio 4 ends up at the root of the balanced tree
+        light: List[Treasure] = [Treasure(5 * ratio, 5) for ratio in range(1, 5)]
+        heavy: List[Treasure] = [Treasure(50 * ratio, 50) for ratio in range(5, 8)]
+        def treasure_gen(_): return light + heavy
+        Hollow.gen_treasures = treasure_gen
+
+        for hollow in [SpookyHollow(), MysticalHollow()]:
+            self.assertIs(hollow.get_optimal_treasure(10), light[-1], f"{type(hollow).__name__}: Expected the best treasure that fits")
+            self.assertEqual(len(hollow), 6)
+            self.assertIs(hollow.get_optimal_treasure(50), heavy[-1], f"{type(hollow).__name__}: Only the taken treasure should be removed")
+            self.assertIs(hollow.get_optimal_treasure(50), heavy[1])
+
+    @number("2.6")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_spooky_matches_scan(self) -> None:
+        RandomGen.set_seed(21)
+        # Few distinct weights and ratios so there are plenty of ties
+        treasures: List[Treasure] = [Treasure(RandomGen.randint(1, 40), RandomGen.randint(1, 20)) for _ in range(200)]
+        def treasure_gen(_): return treasures
+        Hollow.gen_treasures = treasure_gen
+
+        spooky_hollow: SpookyHollow = SpookyHollow()
+        remaining: List[Treasure] = list(treasures)
+        while remaining:
+            backpack_capacity: int = RandomGen.randint(0, 25)
+            fitting: List[Treasure] = [treasure for treasure in remaining if treasure.weight <= backpack_capacity]
+            treasure: Treasure | None = spooky_hollow.get_optimal_treasure(backpack_capacity)
+            if not fitting:
+                self.assertIsNone(treasure, f"Nothing weighs at most {backpack_capacity}")
+                continue
+            best: float = max(fitting_treasure.value / fitting_treasure.weight for fitting_treasure in fitting)
+            self.assertEqual(treasure.value / treasure.weight, best, f"Expected the best ratio for capacity {backpack_capacity}")
+            self.assertEqual(treasure.weight, min(fitting_treasure.weight for fitting_treasure in fitting
+                                                  if fitting_treasure.value / fitting_treasure.weight == best),
+                             "Ties should go to the lighter treasure")
+            remaining.remove(treasure)
+            self.assertEqual(len(spooky_hollow), len(remaining))
+
+    @number("2.7")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_lazy_mystical_matches_eager(self) -> None:
+        RandomGen.set_seed(22)
+        treasures: List[Treasure] = [Treasure(RandomGen.randint(1, 60), RandomGen.randint(1, 30)) for _ in range(150)]
+        def treasure_gen(_): return treasures
+        Hollow.gen_treasures = treasure_gen
+
+        lazy_hollow: MysticalHollow = MysticalHollow(lazy=True)
+        eager_hollow: MysticalHollow = MysticalHollow()
+        self.assertFalse(eager_hollow.lazy, "Lazy deletion should be opt in")
+        # Runs of small capacities set treasures aside, the larger ones in between release them
+        capacities: List[int] = [RandomGen.randint(0, 8) for _ in range(60)] + [RandomGen.randint(0, 35) for _ in range(60)]
+        for backpack_capacity in capacities:
+            expected: Treasure | None = eager_hollow.get_optimal_treasure(backpack_capacity)
+            self.assertIs(lazy_hollow.get_optimal_treasure(backpack_capacity), expected,
+                          f"Lazy hollow handed out a different treasure for capacity {backpack_capacity}")
+            self.assertEqual(len(lazy_hollow), len(eager_hollow), "Treasures set aside still belong to the hollow")
+        self.assertGreater(len(lazy_hollow), 0)
+        for _ in range(len(eager_hollow)):
+            self.assertIs(lazy_hollow.get_optimal_treasure(100), eager_hollow.get_optimal_treasure(100))
+        self.assertEqual(len(lazy_hollow), 0)
+
+    @number("2.8")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_peek_matches_get_optimal(self) -> None:
+        RandomGen.set_seed(23)
+        treasures: List[Treasure] = [Treasure(RandomGen.randint(1, 50), RandomGen.randint(1, 25)) for _ in range(120)]
+        def treasure_gen(_): return treasures
+        Hollow.gen_treasures = treasure_gen
+
+        def used_lazy_hollow() -> MysticalHollow:
+            hollow: MysticalHollow = MysticalHollow(lazy=True)
+            # Leaves some treasures set aside so the peek has to look past the heap
+            for backpack_capacity in [3, 2, 0, 1]:
+                hollow.get_optimal_treasure(backpack_capacity)
+            return hollow
+
+        hollow_types: List[Callable[[], Hollow]] = [SpookyHollow, MysticalHollow, lambda: MysticalHollow(lazy=True), used_lazy_hollow]
+        for capacities in [[0, 1, 1, 4, 10, 10, 26], [5], list(range(30))]:
+            for make_hollow in hollow_types:
+                hollow: Hollow = make_hollow()
+                count: int = len(hollow)
+                peeked: List[Treasure | None] = hollow.peek_optimal_treasures(capacities)
+                self.assertEqual(len(hollow), count, f"{type(hollow).__name__}: Peeking should not remove treasures")
+                for backpack_capacity, treasure in zip(capacities, peeked):
+                    self.assertIs(treasure, make_hollow().get_optimal_treasure(backpack_capacity),
+                                  f"{type(hollow).__name__}: Wrong treasure for capacity {backpack_capacity}")
+
+        with self.assertRaises(ValueError):
+            SpookyHollow().peek_optimal_treasures([3, 1])
+
+    @number("2.9")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_knapsack_best_value(self) -> None:
+        RandomGen.set_seed(24)
+        treasures: List[Treasure] = [Treasure(RandomGen.randint(1, 100), RandomGen.randint(1, 40)) for _ in range(10)]
+        def treasure_gen(_): return treasures
+        Hollow.gen_treasures = treasure_gen
+
+        def brute_force(available: List[Treasure], backpack_capacity: int) -> int:
+            best: int = 0
+            for subset in range(1 << len(available)):
+                chosen: List[Treasure] = [treasure for i, treasure in enumerate(available) if subset >> i & 1]
+                if sum(treasure.weight for treasure in chosen) <= backpack_capacity:
+                    best = max(best, sum(treasure.value for treasure in chosen))
+            return best
+
+        for hollow in [SpookyHollow(knapsack=True), MysticalHollow(knapsack=True), MysticalHollow(lazy=True)]:
+            name: str = type(hollow).__name__
+            self.assertEqual(hollow.knapsack is not None, hollow.precompute_knapsack)
+            available: List[Treasure] = list(treasures)
+            for backpack_capacity in range(0, 101, 7):
+                self.assertEqual(hollow.best_value(backpack_capacity), brute_force(available, backpack_capacity),
+                                 f"{name}: Wrong best value for capacity {backpack_capacity}")
+                chosen: List[Treasure] = hollow.best_treasures(backpack_capacity)
+                self.assertLessEqual(sum(treasure.weight for treasure in chosen), backpack_capacity)
+                self.assertEqual(sum(treasure.value for treasure in chosen), hollow.best_value(backpack_capacity))
+            self.assertEqual(len(hollow), len(treasures), f"{name}: Looking up the best value should not take treasures")
+
+            # Taking a treasure makes the table rebuild from what is left
+            available.remove(hollow.get_optimal_treasure(30))
+            self.assertEqual(hollow.best_value(60), brute_force(available, 60), f"{name}: Table not rebuilt")
+
+        with self.assertRaises(ValueError):
+            SpookyHollow().best_value(-1)
+        with self.assertRaises(ValueError):
+            SpookyHollow().best_value(sum(treasure.weight for treasure in treasures) - 1)
+        self.assertEqual(SpookyHollow().best_value(10 ** 6), sum(treasure.value for treasure in treasures))
+
+    @number("2.10")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_bulk_treasure_generation(self) -> None:
+        weights, values = generate_treasure_arrays(5000, seed=25)
+        self.assertEqual((weights.typecode, values.typecode), ('i', 'i'))
+        self.assertEqual(len(weights), 5000)
+        self.assertEqual(len(set(weights)), len(weights), "Weights should be unique")
+        self.assertEqual(len(set(values)), len(values), "Values should be unique")
+        self.assertEqual(len({Fraction(value, weight) for weight, value in zip(weights, values)}), len(weights),
+                         "Ratios should be unique")
+        self.assertTrue(all(1 <= weight <= 5000 for weight in weights) and all(1 <= value <= 10000 for value in values))
+        self.assertEqual(generate_treasure_arrays(5000, seed=25), (weights, values), "The same seed should give the same treasures")
+
+        # A tight value range forces values with a ratio already taken to be skipped
+        weights, values = generate_treasure_arrays(50, max_weight=50, max_value=60, seed=25)
+        self.assertEqual(len({Fraction(value, weight) for weight, value in zip(weights, values)}), 50)
+        treasures: List[Treasure] = treasures_from_arrays(weights, values)
+        self.assertEqual((treasures[3].weight, treasures[3].value), (weights[3], values[3]))
+        with self.assertRaises(ValueError):
+            generate_treasure_arrays(101, max_weight=100)
+
+        # At the limit every weight and every value has to be used, so no value can be thrown away
+        for seed in range(5):
+            weights, values = generate_treasure_arrays(60, max_weight=60, max_value=60, seed=seed)
+            self.assertEqual(sorted(weights), list(range(1, 61)))
+            self.assertEqual(sorted(values), list(range(1, 61)))
+            self.assertEqual(len({Fraction(value, weight) for weight, value in zip(weights, values)}), 60,
+                             f"Ratios should be unique for seed {seed}")
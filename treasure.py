@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+from array import array
+from math import gcd
+from typing import Iterator, List
+
 from config import TreasureConfig
 from random_gen import RandomGen
-from typing import List
 
 
 class Treasure:
@@ -65,3 +68,144 @@ def generate_treasures() -> List[Treasure]:
             treasure_count += 1
 
     return hollow_treasures
+
+
+def random_permutation(lo: int, hi: int) -> Iterator[int]:
+    """
+    Yields the integers lo to hi in a random order, drawn one at a time.
+    This is a Fisher-Yates shuffle that only remembers the positions it has swapped,
+    so taking k numbers costs O(k) time and memory however wide the range is.
+
+    Complexity:
+        Best Case Complexity: O(1) per number drawn
+        Worst Case Complexity: O(1) per number drawn
+    """
+    size: int = hi - lo + 1
+    swapped: dict[int, int] = {}
+    for i in range(size):
+        j: int = RandomGen.randint(i, size - 1)
+        picked: int = swapped.get(j, j)
+        swapped[j] = swapped.pop(i, i)
+        yield lo + picked
+
+
+def generate_treasure_arrays(count: int, max_weight: int | None = None, max_value: int | None = None,
+                             seed: int | None = None) -> tuple[array, array]:
+    """
+    Generates count treasures in bulk, for stress tests that need far more than a hollow holds.
+    Like generate_treasures, the weights, values and ratios are all unique, but the weights and
+    values are drawn from random permutations rather than retried until they are unused. Ratios
+    are compared exactly as reduced (value, weight) fractions. A value whose ratio is already
+    taken is put aside and tried again with the next weights before any new value is drawn.
+    When no value left goes with a weight, an earlier treasure can give up its value for it and
+    take one that was put aside instead, see `_swap_in`, otherwise the weight is skipped.
+
+    Args:
+        count(int): How many treasures to generate.
+        max_weight(int | None): Weights are drawn from 1 to max_weight, by default
+            TreasureConfig.MAX_TREASURE_WEIGHT or count if that is larger.
+        max_value(int | None): Values are drawn from 1 to max_value, by default
+            TreasureConfig.MAX_TREASURE_VALUE or twice count if that is larger, to leave room for skipped values.
+        seed(int | None): Seeds RandomGen first when given, otherwise its current state is used.
+
+    Returns:
+        tuple[array, array]: The weights and the values, treasure i weighs weights[i] and is worth values[i].
+
+    Raises:
+        ValueError: If the ranges are too small to give count unique weights, values and ratios,
+            or every weight has been tried before count treasures were found.
+
+    Complexity:
+        Best Case Complexity: O(count * log(V)) where V is max_value, one gcd per treasure.
+        Worst Case Complexity: O(W * count * S * log(V)) where W is max_weight and S the number of values
+        put aside, when every weight needs `_swap_in`.
+    """
+    max_weight = max(TreasureConfig.MAX_TREASURE_WEIGHT.value, count) if max_weight is None else max_weight
+    max_value = max(TreasureConfig.MAX_TREASURE_VALUE.value, 2 * count) if max_value is None else max_value
+    if count > max_weight or count > max_value:
+        raise ValueError(f"Cannot draw {count} unique weights from 1 to {max_weight} and values from 1 to {max_value}")
+    if seed is not None:
+        RandomGen.set_seed(seed)
+
+    weights: array = array('i')
+    values: array = array('i')
+    ratios: set[tuple[int, int]] = set()
+    # Values drawn but not used yet, because their ratio was taken for the weight they were drawn for
+    put_aside: List[int] = []
+    value_order: Iterator[int] = random_permutation(1, max_value)
+    for weight in random_permutation(1, max_weight):
+        if len(weights) == count:
+            break
+        value: int | None = None
+        for k, candidate in enumerate(put_aside):
+            if _reduced_ratio(candidate, weight) not in ratios:
+                value = put_aside.pop(k)
+                break
+        if value is None:
+            for candidate in value_order:
+                if _reduced_ratio(candidate, weight) not in ratios:
+                    value = candidate
+                    break
+                put_aside.append(candidate)
+        if value is None:
+            value = _swap_in(weight, weights, values, ratios, put_aside)
+        if value is None:
+            continue
+        ratios.add(_reduced_ratio(value, weight))
+        weights.append(weight)
+        values.append(value)
+    if len(weights) < count:
+        raise ValueError(f"Ran out of values with unique ratios after {len(weights)} treasures")
+    return weights, values
+
+
+def _swap_in(weight: int, weights: array, values: array, ratios: set[tuple[int, int]], put_aside: List[int]) -> int | None:
+    """
+    Frees a value for weight when none of the values left goes with it. Treasure i gives weight its value
+    and takes one of the values put aside instead, as long as both new ratios are unused.
+
+    Returns:
+        int | None: The value freed for weight, whose ratio is left for the caller to add. None if no
+        treasure can swap.
+
+    Complexity:
+        Best Case Complexity: O(log(V)) when the first treasure can swap with the first value put aside.
+        Worst Case Complexity: O(N * S * log(V)) where N is the number of treasures so far and S the
+        number of values put aside.
+    """
+    for i in range(len(weights)):
+        given: tuple[int, int] = _reduced_ratio(values[i], weight)
+        if given in ratios:
+            continue
+        for k, candidate in enumerate(put_aside):
+            taken: tuple[int, int] = _reduced_ratio(candidate, weights[i])
+            if taken != given and taken not in ratios:
+                value: int = values[i]
+                ratios.remove(_reduced_ratio(value, weights[i]))
+                ratios.add(taken)
+                values[i] = put_aside.pop(k)
+                return value
+    return None
+
+
+def _reduced_ratio(value: int, weight: int) -> tuple[int, int]:
+    """
+    value / weight as a fraction in lowest terms, so equal ratios compare equal without float rounding.
+
+    Complexity:
+        Best Case Complexity: O(1)
+        Worst Case Complexity: O(log(min(value, weight))), Euclid's algorithm.
+    """
+    divisor: int = gcd(value, weight)
+    return value // divisor, weight // divisor
+
+
+def treasures_from_arrays(weights: array, values: array) -> List[Treasure]:
+    """
+    The treasures described by the parallel arrays from generate_treasure_arrays.
+
+    Complexity:
+        Best Case Complexity: O(N)
+        Worst Case Complexity: O(N) where N is the number of treasures.
+    """
+    return [Treasure(value, weight) for weight, value in zip(weights, values)]